@@ -0,0 +1,53 @@
+"""
+File:     fixtures.py
+
+Description:
+    This module provides the fixed inputs of the benchmarks: robot lines and
+    child utterances of typical lengths, and a synthetic recording (silence,
+    speech-like noise bursts, silence) that is generated from a fixed seed,
+    so every run measures the same work.
+"""
+
+import numpy as np
+
+ROBOT_LINES_EN = [
+    "Yes, it is something you can find in a classroom.",
+    "No, you cannot eat it, but you can use it to write your name on a piece of paper.",
+    "I will give you a hint! It is long and thin, and it helps you draw straight lines "
+    "in your notebook when you are doing your homework at school.",
+]
+ROBOT_LINES_NL = [
+    "Hallo! Wat leuk dat je meedoet aan het experiment. We gaan straks samen een paar korte spelletjes doen.",
+]
+CHILD_UTTERANCES = [
+    "is it a pencil",
+    "is het iets wat je in de klas gebruikt",
+    "can you write with it",
+    "ik weet het niet, is it a ruler?",
+    "Is it something that is blue and you can put books in it?",
+]
+# Positions the stubbed LLM returns for the stress word analysis
+STUB_LLM_STRESS_RESPONSE = "1, 6, 12"
+
+SAMPLE_RATE = 44100
+CHANNELS = 1
+AUDIO_SEED = 1234
+# (seconds, amplitude) segments of the synthetic recording
+AUDIO_SEGMENTS = [(1.0, 30), (0.8, 6000), (0.3, 30), (1.2, 6000), (1.5, 30)]
+
+
+def make_recording(sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS) -> np.ndarray:
+    """
+    Generates the synthetic recording as interleaved int16 samples.
+
+    Returns:
+        np.ndarray: About 4.8 seconds of audio with quiet lead-in and tail.
+    """
+    rng = np.random.default_rng(AUDIO_SEED)
+    segments = []
+
+    for seconds, amplitude in AUDIO_SEGMENTS:
+        frames = int(seconds * sample_rate)
+        segments.append(rng.normal(0, amplitude, frames * channels))
+
+    return np.clip(np.concatenate(segments), -32768, 32767).astype(np.int16)
@@ -0,0 +1,277 @@
+"""
+File:     run_benchmarks.py
+
+Description:
+    This module benchmarks the CPU-bound code that runs on every turn:
+    gesture planning, stress word tagging (with the LLM stubbed), the
+    English lexicon, silence trimming and loading the pre/post-test images.
+    Each benchmark times a fixed fixture (see fixtures.py) and reports the
+    median time per call. Results can be stored as the baseline
+    (benchmarks/baseline.json) and later runs compared against it; the
+    comparison fails if a benchmark got slower than the tolerance allows,
+    or if the baseline has no entry for it. Without a recorded baseline the
+    comparison is skipped.
+
+        python -m benchmarks.run_benchmarks                  # print results
+        python -m benchmarks.run_benchmarks --save-baseline  # store baseline
+        python -m benchmarks.run_benchmarks --compare [--tolerance 0.25]
+
+    Timings depend on the machine, so the baseline should be recorded on the
+    laptop that runs the experiment.
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+from typing import Any, Callable, Dict, List, Tuple
+from unittest.mock import patch
+from benchmarks.fixtures import (
+    CHANNELS, CHILD_UTTERANCES, ROBOT_LINES_EN, ROBOT_LINES_NL, SAMPLE_RATE, STUB_LLM_STRESS_RESPONSE, make_recording
+)
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+IMAGES_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "images")
+DEFAULT_TOLERANCE = 0.25  # A benchmark regresses if its median is more than 25% above the baseline
+REPEAT = 7
+
+
+def bench_get_gesture_frames() -> Callable[[], Any]:
+    from src.robot_movements.movement_generator import MovementGenerator
+
+    lines = [(text, "en") for text in ROBOT_LINES_EN] + [(text, "nl") for text in ROBOT_LINES_NL]
+
+    def run():
+        # get_gesture_frames appends to the generator's frames, so every call needs a new generator
+        for text, language in lines:
+            MovementGenerator(text, language).get_gesture_frames()
+
+    return run
+
+
+def bench_complete_frames() -> Callable[[], Any]:
+    from src.robot_movements.movement_generator import MovementGenerator
+
+    generators = []
+    for text in ROBOT_LINES_EN:
+        generator = MovementGenerator(text, "en")
+        generator.get_gesture_frames()
+        generators.append(generator)
+
+    def run():
+        for generator in generators:
+            generator.complete_frames()
+
+    return run
+
+
+def bench_pos_tag_stress_words() -> Callable[[], Any]:
+    from src.robot_movements.stress_word_analyzer import StressWordAnalyzer
+
+    analyzers = [StressWordAnalyzer(text, "en") for text in ROBOT_LINES_EN]
+    analyzers += [StressWordAnalyzer(text, "nl") for text in ROBOT_LINES_NL]
+
+    def run():
+        for analyzer in analyzers:
+            analyzer.get_pos_tag_stress_words()
+
+    return run
+
+
+def bench_language_assistant_init() -> Callable[[], Any]:
+    from src.language_feedback import lexicon
+    from src.language_feedback.language_assistant import LanguageAssistant
+
+    LanguageAssistant(None)  # Compiles the lexicon once, if needed; the benchmark measures loading it
+
+    def run():
+        lexicon.clear_lexicons()
+        LanguageAssistant(None)
+
+    return run
+
+
+def bench_calculate_language_usage() -> Callable[[], Any]:
+    from src.language_feedback.language_assistant import LanguageAssistant
+
+    assistant = LanguageAssistant(None)
+
+    def run():
+        for utterance in CHILD_UTTERANCES:
+            assistant.calculate_language_usage(utterance)
+
+    return run
+
+
+def bench_trim_silence() -> Callable[[], Any]:
+    from src.speech_processing.speech_to_text import SpeechToText
+
+    processor = SpeechToText(sample_rate=SAMPLE_RATE, channels=CHANNELS)
+    recording = make_recording()
+
+    def run():
+        processor.trim_silence(recording)
+
+    return run
+
+
+def bench_load_test_images() -> Callable[[], Any]:
+    from prepost_test import load_image
+
+    paths = sorted(glob.glob(os.path.join(IMAGES_FOLDER, "words", "*.*")))[:4]
+
+    def run():
+        # One trial shows four images
+        for path in paths:
+            load_image(path).load()
+
+    return run
+
+
+BENCHMARKS: Dict[str, Callable[[], Callable[[], Any]]] = {
+    "movement_generator.get_gesture_frames": bench_get_gesture_frames,
+    "movement_generator.complete_frames": bench_complete_frames,
+    "stress_word_analyzer.get_pos_tag_stress_words": bench_pos_tag_stress_words,
+    "language_assistant.init": bench_language_assistant_init,
+    "language_assistant.calculate_language_usage": bench_calculate_language_usage,
+    "speech_to_text.trim_silence": bench_trim_silence,
+    "prepost_test.load_images": bench_load_test_images,
+}
+
+
+def time_benchmark(run: Callable[[], Any], repeat: int = REPEAT) -> Dict[str, float]:
+    """
+    Times a benchmark.
+
+    Args:
+        run (Callable[[], Any]): The code to time.
+        repeat (int): How many timed repeats to run.
+
+    Returns:
+        Dict[str, float]: The median and minimum time per call in
+        milliseconds, and the number of calls per repeat.
+    """
+    run()  # Warm-up, e.g. lazily loaded models
+    timer = timeit.Timer(run)
+    number, _ = timer.autorange()  # Enough calls per repeat to take at least 0.2 seconds
+    per_call_ms = [total / number * 1000 for total in timer.repeat(repeat=repeat, number=number)]
+
+    return {
+        "median_ms": round(statistics.median(per_call_ms), 4),
+        "min_ms": round(min(per_call_ms), 4),
+        "number": number,
+    }
+
+
+def run_benchmarks(names: List[str]) -> Dict[str, Dict[str, float]]:
+    results = {}
+
+    # The stress word analysis asks the LLM for positions; a fixed answer keeps the benchmark offline
+    with patch("src.robot_movements.stress_word_analyzer.generate_message_using_llm", return_value=STUB_LLM_STRESS_RESPONSE):
+        for name in names:
+            random.seed(0)  # Beat gestures are chosen at random
+            results[name] = time_benchmark(BENCHMARKS[name]())
+            print(f"{name:<48} {results[name]['median_ms']:>10.3f} ms")
+
+    return results
+
+
+def load_baseline(path: str = BASELINE_FILE) -> Dict[str, Any]:
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            return json.load(f)
+    return {"machine": None, "recorded_at": None, "results": {}}
+
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: str = BASELINE_FILE) -> None:
+    baseline = load_baseline(path)
+    baseline["machine"] = {
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "python": platform.python_version(),
+    }
+    baseline["recorded_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    baseline["results"].update(results)
+
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=4)
+        f.write("\n")
+
+
+def compare_to_baseline(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE
+) -> Tuple[List[str], List[str]]:
+    """
+    Compares results to the baseline.
+
+    Args:
+        results (Dict[str, Dict[str, float]]): The results of this run.
+        baseline (Dict[str, Any]): The stored baseline.
+        tolerance (float): The allowed slowdown as a fraction of the
+            baseline median. Defaults to DEFAULT_TOLERANCE.
+
+    Returns:
+        Tuple[List[str], List[str]]: The names of the benchmarks that
+        regressed and of those without a baseline.
+    """
+    regressions = []
+    missing = []
+
+    for name, result in results.items():
+        baseline_result = baseline["results"].get(name)
+        if baseline_result is None:
+            print(f"{name:<48} no baseline")
+            missing.append(name)
+            continue
+
+        change = result["median_ms"] / baseline_result["median_ms"] - 1
+        regressed = change > tolerance
+        print(f"{name:<48} {baseline_result['median_ms']:>10.3f} -> {result['median_ms']:>10.3f} ms "
+              f"({change:+.1%}){'  REGRESSION' if regressed else ''}")
+        if regressed:
+            regressions.append(name)
+
+    return regressions, missing
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the per-turn hot paths.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the baseline.")
+    parser.add_argument("--compare", action="store_true", help="Fail if a benchmark is slower than the baseline allows.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed slowdown as a fraction of the baseline (default {DEFAULT_TOLERANCE}).")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Run only these benchmarks.")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.only or list(BENCHMARKS))
+
+    if args.save_baseline:
+        save_baseline(results)
+        print(f"Baseline saved to {BASELINE_FILE}.")
+
+    if args.compare:
+        print()
+        if not os.path.exists(BASELINE_FILE):
+            print(f"No baseline recorded at {BASELINE_FILE}, so there is nothing to compare against. "
+                  "Record one with --save-baseline on the experiment laptop.")
+            return
+
+        regressions, missing = compare_to_baseline(results, load_baseline(), args.tolerance)
+        if missing:
+            print(f"No baseline for {len(missing)} benchmark(s): {', '.join(missing)}. "
+                  "Record them with --save-baseline on the machine the baseline was measured on.")
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        if missing or regressions:
+            sys.exit(1)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,17 @@ from autobahn.twisted.component import Component, run
 import nltk
 import random
 from prepost_test import PrePostTest
+from src import nlp_resources
+from src.robot_scripts import (
+    ANOTHER_ROUND, END_MESSAGE, GAME_EXPLANATION, INTRO_CONTROL, INTRO_EXPERIMENT, TEST_EXPLANATION,
+    WAIT_BEFORE_GAME, WAIT_BEFORE_POST_TEST
+)
 from src.taboo_game.taboo_game import TabooGame
-from src.robot_movements.say_animated import say_animated
+from src.robot_movements.say_animated import get_gesture_cache, say_animated
+from src.robot_session import RobotSessionProxy
+from src.speech_processing.stt_backends import create_backend
+from src.tracing import summarize_trace, tracer
+from src.utils import get_llm_cache
 
 try:
     nltk.data.find('corpora/stopwords')
@@ -25,6 +34,14 @@ PARTICIPANT_NUM = "01"         # string (01, 02, 03, ..., 19, 20, 21)
 # Numbers for experiment condition: 01-11
 # Numbers for control condition: 12-22
 PARTICIPANT_NAME = "Alice Johnson"  # string, full name
+FUSED_TURNS = True  # Interpret and answer each utterance with a single LLM request
+STT_BACKEND = "cloud"  # "cloud", "local_whisper" (offline) or "stub"
+STT_OPTIONS = {}  # e.g. {"model_size": "small"} for local_whisper
+
+# Created at start-up so a local model loads in the background while the robot connects
+stt_backend = create_backend(STT_BACKEND, **STT_OPTIONS)
+stt_backend.preload()
+nlp_resources.preload()
 
 def load_participants():
     if os.path.exists(PARTICIPANT_FILE):
@@ -91,11 +108,18 @@ def main(session, details) -> Generator[None, None, None]:
         print(f"Invalid GAME_VERSION '{GAME_VERSION}'. Must be one of {VALID_GAME_VERSIONS}.")
         exit(1)
 
-    yield session.call("rie.dialogue.config.native_voice", use_native_voice=False)
-    yield session.call("rom.optional.behavior.play", name="BlocklyStand")
+    # Latency spans of every round and turn are appended to data/traces/<participant>.jsonl
+    trace_path = tracer.start_trace_file(PARTICIPANT_NUM)
+
+    # Tracks the robot's state so redundant calls are not sent to the router
+    session = RobotSessionProxy(session)
+    yield session.call_concurrently([
+        ("rie.dialogue.config.native_voice", {"use_native_voice": False}),
+        ("rom.optional.behavior.play", {"name": "BlocklyStand"}),
+    ])
 
     prepost = PrePostTest(session, words_file="words.json", images_folder="images")
-    game = TabooGame(session, GAME_VERSION)
+    game = TabooGame(session, GAME_VERSION, fused_turns=FUSED_TURNS, stt_backend=stt_backend)
 
     # Select and store 5 target words
     selected_words = prepost.select_words(5)
@@ -106,30 +130,13 @@ def main(session, details) -> Generator[None, None, None]:
 
     # Introductory message
     if GAME_VERSION == "experiment":
-        prompt = (
-            "Hallo! Wat leuk dat je meedoet aan het experiment. "
-            "We gaan straks samen een paar korte spelletjes doen. "
-            "Ik zal een woord in gedachten nemen en jij zal mij vragen "
-            "gaan stellen om te raden welk woord ik in gedachten heb. "
-            "Je mag Nederlands spreken, maar probeer zo veel Engels te spreken. "
-            "Ik zal je helpen om in het Engels te spreken."
-        )
+        prompt = INTRO_EXPERIMENT
     else:
-        prompt = (
-            "Hallo! Wat leuk dat je meedoet aan het experiment. "
-            "We gaan straks samen een paar korte spelletjes doen. "
-            "Ik zal een woord in gedachten nemen en jij zal mij vragen "
-            "gaan stellen om te raden welk woord ik in gedachten heb. "
-            "Probeer zo veel mogelijk Engels te spreken, "
-            "want ik versta geen Nederlands."
-        )
+        prompt = INTRO_CONTROL
     yield say_animated(session, prompt, language="nl")
 
     # Pre-test explanation
-    prompt = (
-        "Ik zal nu telkens een woord per ronde opnoemen in het Engels en jij "
-        "zal het bijbehorende plaatje aan moeten klikken. Er zijn 5 rondes."
-    )
+    prompt = TEST_EXPLANATION
     yield say_animated(session, prompt, language="nl")
 
     prompt = (
@@ -151,10 +158,7 @@ def main(session, details) -> Generator[None, None, None]:
     _ = input().strip().lower()
 
     # Explanation about 30 sec waiting time
-    prompt = (
-        "We zullen nu een halve minuut wachten voordat we verdergaan met het "
-        "experiment. Ik zal elke tien seconden naar je zwaaien."
-    )
+    prompt = WAIT_BEFORE_GAME
     yield say_animated(session, prompt, language="nl")
 
     # Repeat BlocklyWaveRightArm every 10 seconds for 30 sec
@@ -163,13 +167,10 @@ def main(session, details) -> Generator[None, None, None]:
         yield wait(10)
 
     # Game explanation
-    prompt = (
-        "We zullen nu het spel spelen waarin jij het woord moet raden dat ik "
-        "in gedachten heb. Er zijn vijf rondes."
-    )
+    prompt = GAME_EXPLANATION
     yield say_animated(session, prompt, language="nl")
 
-    prompt = ("Let's play another round!")
+    prompt = ANOTHER_ROUND
     random.shuffle(selected_word_list)
     game_results = []
 
@@ -191,10 +192,7 @@ def main(session, details) -> Generator[None, None, None]:
     save_game_data(game_results, PARTICIPANT_NUM)
 
     # Explanation about 30 sec waiting time
-    prompt = (
-        "We zullen nu een halve minuut wachten voordat we verdergaan met de laatste "
-        "test. Ik zal elke tien seconden naar je zwaaien."
-    )
+    prompt = WAIT_BEFORE_POST_TEST
     yield say_animated(session, prompt, language="nl")
 
     # Repeat BlocklyWaveRightArm every 10 seconds for 30 sec
@@ -203,10 +201,7 @@ def main(session, details) -> Generator[None, None, None]:
         yield wait(10)
 
     # Post-test explanation
-    prompt = (
-        "Ik zal nu telkens een woord per ronde opnoemen in het Engels en jij "
-        "zal het bijbehorende plaatje aan moeten klikken. Er zijn 5 rondes."
-    )
+    prompt = TEST_EXPLANATION
     yield say_animated(session, prompt, language="nl")
 
     prompt = (
@@ -228,11 +223,7 @@ def main(session, details) -> Generator[None, None, None]:
     _ = input().strip().lower()
 
     # End message and explanation about evaluation form
-    prompt = (
-        "Het experiment is nu afgelopen. Bedankt voor je deelname! Je hebt "
-        "het geweldig gedaan! Je zult nu een kort formulier moeten invullen "
-        "om mij en het spel te beoordelen."
-    )
+    prompt = END_MESSAGE
     yield say_animated(session, prompt, language="nl")
 
     prompt = (
@@ -243,6 +234,12 @@ def main(session, details) -> Generator[None, None, None]:
     print(prompt)
     _ = input().strip().lower()
 
+    print("LLM cache statistics:", get_llm_cache().get_stats())
+    print("Gesture cache statistics:", get_gesture_cache().get_stats())
+    print("Robot call round-trip times:", json.dumps(session.get_rtt_histogram(), indent=4))
+    print("Local intent fast path:", game.game_helper.intent_classifier.get_report())
+    tracer.close()
+    print("Latency per stage (s):", json.dumps(summarize_trace(trace_path), indent=4))
     print("==================END OF EXPERIMENT==================")
     session.leave()
 
@@ -6,6 +6,13 @@ import tkinter as tk
 from PIL import Image, ImageTk
 from twisted.internet.defer import inlineCallbacks, Deferred
 
+IMAGE_SIZE = (300, 300)
+
+
+def load_image(path, size=IMAGE_SIZE):
+    # Decoding and resizing is the slow part of showing a trial, so it is kept separate from Tk
+    return Image.open(path).resize(size)
+
 
 class PrePostTestUI:
     def __init__(self, master, images_folder):
@@ -40,7 +47,7 @@ class PrePostTestUI:
             for folder in ["words", "fillers"]:
                 path = os.path.join(self.images_folder, folder, img_file)
                 if os.path.exists(path):
-                    pil_img = Image.open(path).resize((300, 300))
+                    pil_img = load_image(path)
                     tk_img = ImageTk.PhotoImage(pil_img)
                     btn = tk.Button(self.images_frame, image=tk_img,
                                     command=lambda f=img_file: on_click(f))
@@ -1,5 +1,18 @@
-from .taboo_game import TabooGame
-from .speech_processing import SpeechRecognitionSession
-from .language_feedback import LanguageAssistant
-from .robot_movements import say_animated
-from .utils import generate_message_using_llm
+# The exports are imported on first use, so scripts that only need a
+# standalone module (e.g. the noise estimator in works_with_kids.py) do not
+# load the robot, LLM and OpenAI client stack
+import importlib
+
+_EXPORTS = {
+    "TabooGame": ".taboo_game",
+    "SpeechRecognitionSession": ".speech_processing",
+    "LanguageAssistant": ".language_feedback",
+    "say_animated": ".robot_movements",
+    "generate_message_using_llm": ".utils",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,233 @@
+"""
+File:     cache.py
+
+Description:
+    This module provides a small two-tier key-value cache: an in-memory LRU
+    tier in front of an optional on-disk SQLite tier that survives restarts.
+    Entries expire after a configurable time-to-live and both tiers are
+    bounded in size, evicting the least recently used entries first. Values
+    must be JSON serializable.
+
+    The caches used by the game are created on first use with get_cache, so
+    importing a module does not open any database; tests can point them at a
+    temporary folder with set_cache_folder.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from src.paths import CACHE_FOLDER
+
+
+class PersistentLRUCache:
+    """
+    A thread-safe cache with an in-memory LRU tier and an optional SQLite
+    tier on disk. Lookups check memory first, then disk, and promote disk
+    hits back into memory. Hits and misses are counted per tier.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        max_memory_entries: int = 1024,
+        max_disk_entries: int = 20000,
+        ttl_seconds: float | None = 7 * 24 * 60 * 60
+    ):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self.connection = self.open_disk_tier(path) if path else None
+
+    def open_disk_tier(self, path: str) -> sqlite3.Connection:
+        """
+        Opens (and creates if needed) the SQLite database backing the disk
+        tier.
+
+        Args:
+            path (str): Path to the SQLite database file.
+
+        Returns:
+            sqlite3.Connection: An open connection that may be shared between
+            threads (access is serialized by the cache lock).
+        """
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        connection.commit()
+        return connection
+
+    def is_expired(self, created: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Looks up a key in memory first and on disk second.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[Any]: The cached value, or None on a miss or when the
+            entry has expired.
+        """
+        now = time.time()
+
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                value, created = entry
+                if not self.is_expired(created, now):
+                    self.memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return value
+                del self.memory[key]
+
+            if self.connection is not None:
+                row = self.connection.execute(
+                    "SELECT value, created FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created = json.loads(row[0]), row[1]
+                    if not self.is_expired(created, now):
+                        self.connection.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+                        self.connection.commit()
+                        self.store_in_memory(key, value, created)
+                        self.stats["disk_hits"] += 1
+                        return value
+                    self.connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self.connection.commit()
+
+            self.stats["misses"] += 1
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Stores a value in both tiers, evicting the least recently used entries
+        when a tier is full.
+
+        Args:
+            key (str): The cache key.
+            value (Any): A JSON serializable value.
+        """
+        now = time.time()
+
+        with self.lock:
+            self.store_in_memory(key, value, now)
+            self.stats["writes"] += 1
+
+            if self.connection is not None:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value), now, now)
+                )
+                self.evict_from_disk(now)
+                self.connection.commit()
+
+    def store_in_memory(self, key: str, value: Any, created: float) -> None:
+        self.memory[key] = (value, created)
+        self.memory.move_to_end(key)
+
+        while len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def evict_from_disk(self, now: float) -> None:
+        """
+        Removes expired entries and trims the disk tier to its maximum size,
+        dropping the least recently accessed entries first.
+        """
+        if self.ttl_seconds is not None:
+            self.connection.execute("DELETE FROM entries WHERE created < ?", (now - self.ttl_seconds,))
+
+        count = self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            self.connection.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY accessed ASC LIMIT ?)",
+                (overflow,)
+            )
+            self.stats["evictions"] += overflow
+
+    def close(self) -> None:
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def clear(self) -> None:
+        with self.lock:
+            self.memory.clear()
+            if self.connection is not None:
+                self.connection.execute("DELETE FROM entries")
+                self.connection.commit()
+
+    def get_stats(self) -> Dict[str, int | float]:
+        """
+        Returns the hit/miss counters together with the overall hit rate.
+
+        Returns:
+            Dict[str, int | float]: Counters per tier and the hit rate
+            (between 0 and 1).
+        """
+        with self.lock:
+            stats = dict(self.stats)
+
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        stats["memory_entries"] = len(self.memory)
+        return stats
+
+
+_cache_folder: str | None = CACHE_FOLDER
+_caches: Dict[str, PersistentLRUCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name: str, **options) -> PersistentLRUCache:
+    """
+    Returns the process-wide cache with the given name, creating it on first
+    use. Its disk tier is stored as <name>.sqlite in the cache folder.
+
+    Args:
+        name (str): The name of the cache, e.g. 'llm_responses'.
+        **options: Size and TTL options for PersistentLRUCache, used when the
+            cache is created.
+
+    Returns:
+        PersistentLRUCache: The cache.
+    """
+    with _caches_lock:
+        if name not in _caches:
+            path = os.path.join(_cache_folder, f"{name}.sqlite") if _cache_folder is not None else None
+            _caches[name] = PersistentLRUCache(path=path, **options)
+        return _caches[name]
+
+
+def set_cache_folder(folder: str | None) -> None:
+    """
+    Moves the disk tier of all caches to another folder (None keeps them in
+    memory only). Caches created so far are closed and recreated on their
+    next use.
+    """
+    global _cache_folder
+
+    with _caches_lock:
+        for cache in _caches.values():
+            cache.close()
+        _caches.clear()
+        _cache_folder = folder
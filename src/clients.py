@@ -0,0 +1,183 @@
+"""
+File:     clients.py
+
+Description:
+    This module provides the shared HTTP client layer for OpenAI and
+    Sightengine. The clients are created once per process and keep their
+    connections alive between requests. Blocking requests can be issued
+    from the Twisted reactor with deferred_call, which runs them in the
+    reactor's thread pool, limits the number of concurrent requests per
+    endpoint and returns a Deferred that supports timeouts and
+    cancellation. The HTTP requests made inside a deferred call are bounded
+    by the time left before the call times out (see get_request_timeout), so
+    a timed-out call also ends its worker thread.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from typing import Any, Callable, Dict
+import httpx
+import openai
+import requests
+from requests.adapters import HTTPAdapter
+from twisted.internet import reactor
+from twisted.internet.defer import Deferred, DeferredSemaphore
+from twisted.internet.threads import deferToThread
+from src.tracing import run_in_context
+
+API_KEY = os.getenv("OPENAI_API_KEY")
+if not API_KEY:
+    raise ValueError("OPENAI_API_KEY is not set. Please set it in your environment variables.")
+
+# The upstream URLs can be pointed at a stand-in, e.g. src/simulator/mock_upstream.py
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None  # None uses the OpenAI API
+SIGHTENGINE_URL = os.getenv("SIGHTENGINE_URL") or "https://api.sightengine.com/1.0/text/check.json"
+
+OPENAI_REQUEST_TIMEOUT = 30  # Seconds per HTTP request
+MAX_POOLED_CONNECTIONS = 8
+
+# Maximum number of requests in flight per endpoint, and the time (in
+# seconds) after which a deferred request is cancelled. Sightengine checks
+# have no endpoint of their own: they run inside the "openai" call of the
+# generation they moderate, so they share its slot and its deadline
+ENDPOINT_CONCURRENCY = {"openai": 4, "transcription": 2}
+ENDPOINT_TIMEOUTS = {"openai": 90, "transcription": 60}
+
+_lock = threading.Lock()
+_openai_client = None
+_http_session = None
+_semaphores = {}
+# time.monotonic() deadline of the deferred call running in this context, if any
+_request_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar("request_deadline", default=None)
+
+
+def get_openai_client() -> openai.OpenAI:
+    """
+    Returns the process-wide OpenAI client, creating it on first use. The
+    underlying httpx client pools keep-alive connections to the API.
+
+    Returns:
+        openai.OpenAI: The shared client.
+    """
+    global _openai_client
+
+    with _lock:
+        if _openai_client is None:
+            http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=MAX_POOLED_CONNECTIONS,
+                    max_keepalive_connections=MAX_POOLED_CONNECTIONS
+                ),
+                timeout=OPENAI_REQUEST_TIMEOUT
+            )
+            _openai_client = openai.OpenAI(
+                api_key=API_KEY, base_url=OPENAI_BASE_URL, http_client=http_client, timeout=OPENAI_REQUEST_TIMEOUT
+            )
+
+    return _openai_client
+
+
+def get_http_session() -> requests.Session:
+    """
+    Returns the process-wide requests session used for Sightengine, creating
+    it on first use. The session keeps connections alive between requests.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _http_session
+
+    with _lock:
+        if _http_session is None:
+            _http_session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=MAX_POOLED_CONNECTIONS)
+            _http_session.mount("https://", adapter)
+            _http_session.mount("http://", adapter)
+
+    return _http_session
+
+
+def get_request_timeout(default: float) -> float:
+    """
+    Returns the timeout for an HTTP request: the default, capped by the time
+    left before the deferred call it runs in times out.
+
+    Args:
+        default (float): The timeout in seconds outside a deferred call.
+
+    Returns:
+        float: The timeout in seconds.
+
+    Raises:
+        TimeoutError: If the deferred call has already timed out.
+    """
+    deadline = _request_deadline.get()
+    if deadline is None:
+        return default
+
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("The deferred call timed out before the request was made.")
+    return min(default, remaining)
+
+
+def get_semaphore(endpoint: str) -> DeferredSemaphore:
+    if endpoint not in ENDPOINT_CONCURRENCY:
+        raise ValueError(f"Unknown endpoint: {endpoint}. Must be one of {list(ENDPOINT_CONCURRENCY)}.")
+
+    if endpoint not in _semaphores:
+        _semaphores[endpoint] = DeferredSemaphore(ENDPOINT_CONCURRENCY[endpoint])
+
+    return _semaphores[endpoint]
+
+
+def deferred_call(endpoint: str, function: Callable[..., Any], *args, timeout: float | None = None, **kwargs) -> Deferred:
+    """
+    Runs a blocking request function in the reactor's thread pool without
+    stalling the event loop. At most ENDPOINT_CONCURRENCY[endpoint] calls
+    for the same endpoint run at the same time; further calls wait for a
+    free slot.
+
+    Must be called from the reactor thread.
+
+    Args:
+        endpoint (str): The endpoint the function talks to ('openai' or
+            'transcription'). Functions that also check the response with
+            Sightengine use the 'openai' endpoint.
+        function (Callable[..., Any]): The blocking function to run.
+        *args: Positional arguments for the function.
+        timeout (float | None): Seconds after which the Deferred is
+            cancelled with a TimeoutError. The HTTP requests of the function
+            are given at most the time that is left (get_request_timeout).
+            Defaults to ENDPOINT_TIMEOUTS[endpoint].
+        **kwargs: Keyword arguments for the function.
+
+    Returns:
+        Deferred: Fires with the function's return value. Cancelling it
+        stops waiting for the result; the worker thread ends once its
+        current request hits the deadline.
+    """
+    semaphore = get_semaphore(endpoint)
+    timeout = timeout if timeout is not None else ENDPOINT_TIMEOUTS[endpoint]
+    deadline = time.monotonic() + timeout
+
+    def call_with_deadline(*call_args, **call_kwargs) -> Any:
+        _request_deadline.set(deadline)
+        return function(*call_args, **call_kwargs)
+
+    # Bind the function to the caller's context, so its tracing spans nest under the caller's span
+    d = semaphore.run(deferToThread, run_in_context(call_with_deadline), *args, **kwargs)
+    d.addTimeout(timeout, reactor)
+    return d
+
+
+def get_concurrency_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Returns the number of free slots and waiting calls per endpoint.
+    """
+    return {
+        endpoint: {"free_slots": semaphore.tokens, "waiting": len(semaphore.waiting)}
+        for endpoint, semaphore in _semaphores.items()
+    }
@@ -15,8 +15,12 @@ from typing import List
 import os
 import re
 import string
+import numpy as np
+from src.language_feedback.lexicon import Lexicon, get_lexicon
 from src.utils import generate_message_using_llm
 
+PUNCTUATION_EDGES = re.compile(f'^[{re.escape(string.punctuation)}]+|[{re.escape(string.punctuation)}]+$')
+
 
 class LanguageAssistant:
     """
@@ -32,33 +36,31 @@ class LanguageAssistant:
                 os.path.join(base_path, "english_word_lists/words_alpha.txt"),
                 os.path.join(base_path, "english_word_lists/words.txt"),
             ]
+            # words.txt is optional; not every checkout ships it
+            missing_files = [file for file in english_word_files if not os.path.exists(file)]
+            if missing_files:
+                print(f"WARNING: English word list(s) not found: {', '.join(missing_files)}. The lexicon is "
+                      "incomplete, so the English usage of the child may be underestimated.")
+            english_word_files = [file for file in english_word_files if file not in missing_files]
 
         self.english_words = self.load_words(english_word_files)
 
-    def load_words(self, word_files: List[str]) -> set:
+    def load_words(self, word_files: List[str]) -> Lexicon:
         """
-        Loads words from multiple text files into a set.
+        Loads the lexicon of the given word files. It is compiled once and
+        shared by the whole process, so creating a LanguageAssistant is cheap.
 
         Args:
             word_files (List[str]): A list of file paths (strings) from which
             words will be loaded.
 
         Returns:
-            set: A set of words from all the files. Duplicates are
-            automatically removed since a set is used.
+            Lexicon: The words from all the files; supports `word in lexicon`.
 
         Raises:
             FileNotFoundError: If any of the specified files cannot be found.
         """
-        words = set()
-        for file in word_files:
-            try:
-                with open(file, encoding="utf-8") as f:
-                    words.update(f.read().splitlines())
-            except FileNotFoundError:
-                print(f"Error: File {file} not found.")
-                raise
-        return words
+        return get_lexicon(word_files)
 
     def calculate_language_usage(self, text: str) -> float:
         """
@@ -70,9 +72,35 @@ class LanguageAssistant:
         Returns:
             float: Percentage of words in English.
         """
-        words_in_text = [re.sub(f'^[{string.punctuation}]+|[{string.punctuation}]+$', '', word) for word in text.lower().split()]
-        english_count = sum(1 for word in words_in_text if word in self.english_words)
-        return (english_count / len(words_in_text)) * 100 if words_in_text else 0
+        return self.calculate_language_usage_batch([text])[0]
+
+    def calculate_language_usage_batch(self, texts: List[str]) -> List[float]:
+        """
+        Calculates the percentage of English words for several texts, looking
+        up all their words in one pass.
+
+        Args:
+            texts (List[str]): User input texts.
+
+        Returns:
+            List[float]: Percentage of words in English, per text.
+        """
+        words = []
+        text_indices = []
+        for text_index, text in enumerate(texts):
+            words_in_text = [PUNCTUATION_EDGES.sub('', word) for word in text.lower().split()]
+            words.extend(words_in_text)
+            text_indices.extend([text_index] * len(words_in_text))
+
+        is_english = self.english_words.contains_many(words)
+        text_indices = np.asarray(text_indices, dtype=np.int64)
+        word_counts = np.bincount(text_indices, minlength=len(texts))
+        english_counts = np.bincount(text_indices, weights=is_english, minlength=len(texts))
+
+        return [
+            (english_count / word_count) * 100 if word_count else 0
+            for english_count, word_count in zip(english_counts.tolist(), word_counts.tolist())
+        ]
 
     def get_example_phrase(self, user_input: str) -> str:
         """
@@ -0,0 +1,150 @@
+"""
+File:     lexicon.py
+
+Description:
+    This module provides a compact, process-wide English lexicon. The word
+    lists are compiled once into a sorted array of 64-bit word hashes, saved
+    as a .npy file and memory-mapped on later runs, so loading takes
+    milliseconds and the pages are shared instead of building a Python set
+    of ~370k strings every turn. Lookups hash the words and binary-search
+    the array, for a whole batch of words at once.
+"""
+
+import hashlib
+import os
+import threading
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+from src.paths import CACHE_FOLDER
+
+LEXICON_CACHE_FOLDER = CACHE_FOLDER
+
+
+def hash_word(word: str) -> int:
+    """
+    Hashes a word to a stable 64-bit integer (stable across processes, unlike
+    Python's hash).
+    """
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def hash_words(words: Iterable[str]) -> np.ndarray:
+    return np.fromiter((hash_word(word) for word in words), dtype=np.uint64)
+
+
+class Lexicon:
+    """
+    A set of words stored as a sorted array of word hashes.
+    """
+
+    def __init__(self, hashes: np.ndarray):
+        self.hashes = hashes
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def __contains__(self, word: str) -> bool:
+        return bool(self.contains_many([word])[0])
+
+    def contains_many(self, words: List[str]) -> np.ndarray:
+        """
+        Looks up a batch of words in one vectorized binary search.
+
+        Args:
+            words (List[str]): The words to look up.
+
+        Returns:
+            np.ndarray: A boolean array, True where the word is in the lexicon.
+        """
+        if not words or len(self.hashes) == 0:
+            return np.zeros(len(words), dtype=bool)
+
+        queries = hash_words(words)
+        positions = np.minimum(np.searchsorted(self.hashes, queries), len(self.hashes) - 1)
+        return self.hashes[positions] == queries
+
+    @staticmethod
+    def compile(word_files: List[str], output_path: str) -> None:
+        """
+        Compiles word lists (one word per line) into a sorted hash array.
+
+        Raises:
+            FileNotFoundError: If any of the word files cannot be found.
+        """
+        hashes = []
+        for file in word_files:
+            try:
+                with open(file, encoding="utf-8") as f:
+                    hashes.append(hash_words(f.read().splitlines()))
+            except FileNotFoundError:
+                print(f"Error: File {file} not found.")
+                raise
+
+        compiled = np.unique(np.concatenate(hashes)) if hashes else np.empty(0, dtype=np.uint64)
+
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        temporary_path = f"{output_path}.{os.getpid()}.tmp.npy"
+        np.save(temporary_path, compiled)
+        os.replace(temporary_path, output_path)  # Atomic, so a concurrent reader never sees half a file
+
+    @classmethod
+    def load(cls, path: str) -> "Lexicon":
+        return cls(np.load(path, mmap_mode="r"))
+
+
+def compiled_lexicon_path(word_files: List[str]) -> str:
+    """
+    Returns the path of the compiled lexicon for a set of word files. The
+    name includes a fingerprint of the files, so editing a word list
+    compiles a new lexicon.
+    """
+    fingerprint = hashlib.blake2b(digest_size=8)
+    for file in word_files:
+        stat = os.stat(file)
+        fingerprint.update(f"{os.path.abspath(file)}:{stat.st_size}:{stat.st_mtime_ns};".encode("utf-8"))
+    return os.path.join(LEXICON_CACHE_FOLDER, f"english_lexicon_{fingerprint.hexdigest()}.npy")
+
+
+_lexicons: Dict[Tuple[str, ...], Lexicon] = {}
+_lexicons_lock = threading.Lock()
+
+
+def get_lexicon(word_files: List[str]) -> Lexicon:
+    """
+    Returns the process-wide lexicon for a set of word files, compiling it on
+    first use and memory-mapping the compiled file afterwards.
+
+    Args:
+        word_files (List[str]): The word lists (one word per line).
+
+    Returns:
+        Lexicon: The lexicon.
+
+    Raises:
+        FileNotFoundError: If any of the word files cannot be found.
+    """
+    key = tuple(word_files)
+
+    with _lexicons_lock:
+        if key not in _lexicons:
+            for file in word_files:
+                if not os.path.exists(file):
+                    print(f"Error: File {file} not found.")
+                    raise FileNotFoundError(file)
+
+            path = compiled_lexicon_path(word_files)
+            if not os.path.exists(path):
+                print("Compiling the English lexicon...")
+                Lexicon.compile(word_files, path)
+            _lexicons[key] = Lexicon.load(path)
+
+        return _lexicons[key]
+
+
+def clear_lexicons() -> None:
+    """
+    Forgets the loaded lexicons, so the next get_lexicon call loads them from
+    disk again. The compiled files are kept.
+    """
+    with _lexicons_lock:
+        _lexicons.clear()
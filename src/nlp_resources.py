@@ -0,0 +1,137 @@
+"""
+File:     nlp_resources.py
+
+Description:
+    This module is a process-wide registry for the NLP resources used by the
+    gesture planning: the spaCy models, the English and Dutch stopwords and
+    the word tokenizer. Each resource is loaded once, lazily and
+    thread-safely, and the spaCy models are loaded without the pipes that
+    part-of-speech tagging does not need. A spaCy pipeline is not safe to
+    run from several threads at once (gestures are planned on the reactor
+    thread and in worker threads), so each model is used under its own lock.
+"""
+
+import threading
+from typing import Dict, FrozenSet, List, Tuple
+from nltk.corpus import stopwords
+from nltk.tokenize import RegexpTokenizer
+import spacy
+from spacy.language import Language
+from spacy.tokens import Doc
+
+WORD_PATTERN = r"\b\w+(?:'\w+)?\b"
+SPACY_MODELS = {"en": "en_core_web_sm", "nl": "nl_core_news_sm"}
+# Part-of-speech tags only need tok2vec, the tagger/morphologizer and the attribute ruler
+UNUSED_SPACY_PIPES = ["parser", "ner", "lemmatizer", "senter"]
+
+_lock = threading.Lock()
+_spacy_models: Dict[str, Language] = {}
+_spacy_locks: Dict[str, threading.Lock] = {}  # Serializes inference per model
+_stop_words = None
+_word_tokenizer = RegexpTokenizer(WORD_PATTERN)
+
+
+def get_word_tokenizer() -> RegexpTokenizer:
+    return _word_tokenizer
+
+
+def tokenize_words(text: str) -> List[str]:
+    """
+    Splits a text into lowercase words, keeping contractions such as "i'm"
+    together.
+    """
+    return _word_tokenizer.tokenize(text.lower())
+
+
+def get_stop_words() -> FrozenSet[str]:
+    """
+    Returns the English and Dutch stopwords, loaded once.
+    """
+    global _stop_words
+
+    if _stop_words is None:
+        with _lock:
+            if _stop_words is None:
+                _stop_words = frozenset(stopwords.words('english')) | frozenset(stopwords.words('dutch'))
+
+    return _stop_words
+
+
+def get_spacy_model(language: str = "en") -> Language:
+    """
+    Returns the spaCy model for a language, loading it on first use.
+
+    Args:
+        language (str): 'en' or 'nl'. Other languages use the English model.
+
+    Returns:
+        Language: The spaCy pipeline.
+    """
+    model_name = SPACY_MODELS.get(language, SPACY_MODELS["en"])
+
+    if model_name not in _spacy_models:
+        with _lock:
+            if model_name not in _spacy_models:
+                _spacy_locks[model_name] = threading.Lock()
+                _spacy_models[model_name] = spacy.load(model_name, exclude=UNUSED_SPACY_PIPES)
+
+    return _spacy_models[model_name]
+
+
+def run_spacy(text: str, language: str = "en") -> Doc:
+    """
+    Runs the spaCy model of a language over a text, one call per model at a
+    time.
+
+    Args:
+        text (str): The text to process.
+        language (str): 'en' or 'nl'. Other languages use the English model.
+
+    Returns:
+        Doc: The processed spaCy document.
+    """
+    nlp = get_spacy_model(language)
+    with _spacy_locks[SPACY_MODELS.get(language, SPACY_MODELS["en"])]:
+        return nlp(text)
+
+
+def tag_words(text: str, language: str = "en") -> List[Tuple[str, str]]:
+    """
+    Tags every word of tokenize_words(text) with a part-of-speech tag, running
+    spaCy once over the whole text. Words are aligned to spaCy tokens by
+    character offset: each word gets the token it starts in (for "i'm", the
+    token "i").
+
+    Args:
+        text (str): The text to tag.
+        language (str): 'en' or 'nl'. Defaults to 'en'.
+
+    Returns:
+        List[Tuple[str, str]]: For each word, the text of its spaCy token and
+        the token's part-of-speech tag.
+    """
+    doc = run_spacy(text, language)
+    token_index_by_char = {}
+    for token in doc:
+        for char_index in range(token.idx, token.idx + len(token.text)):
+            token_index_by_char[char_index] = token.i
+
+    tagged_words = []
+    for start, _ in _word_tokenizer.span_tokenize(text):
+        token = doc[token_index_by_char.get(start, 0)] if len(doc) else None
+        tagged_words.append((token.text, token.pos_) if token is not None else ("", ""))
+
+    return tagged_words
+
+
+def preload(languages: Tuple[str, ...] = ("en", "nl")) -> None:
+    """
+    Loads the stopwords and spaCy models in a background thread, so the first
+    utterance does not wait for them.
+    """
+    def load():
+        get_stop_words()
+        for language in languages:
+            get_spacy_model(language)
+
+    threading.Thread(target=load, name="nlp-preload", daemon=True).start()
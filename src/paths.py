@@ -0,0 +1,16 @@
+"""
+File:     paths.py
+
+Description:
+    This module provides the locations of the project's files. Paths are
+    resolved from the project root instead of the working directory, so the
+    caches, traces and profiles end up in the same place whether the game
+    is started from the project folder or from anywhere else.
+"""
+
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+DATA_FOLDER = os.path.join(PROJECT_ROOT, "data")
+CACHE_FOLDER = os.path.join(DATA_FOLDER, "cache")
+WORDS_FILE = os.path.join(PROJECT_ROOT, "words.json")
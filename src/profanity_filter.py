@@ -0,0 +1,166 @@
+"""
+File:     profanity_filter.py
+
+Description:
+    This module provides the local stage of the profanity screening. It
+    matches text against an English/Dutch offensive-term lexicon with an
+    Aho-Corasick automaton, which finds all terms in a single pass over the
+    text, and clears closed-vocabulary classifier outputs (such as 'yes' or
+    'correct') without any matching. Only free-form text that the local
+    stage cannot clear has to be sent to the Sightengine API.
+"""
+
+import os
+import re
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+LEXICON_FOLDER = os.path.join(os.path.dirname(os.path.realpath(__file__)), "profanity_lexicon")
+LEXICON_FILES = ["en.txt", "nl.txt"]
+
+# Outputs of the classifier prompts, which can never contain profanity
+CLOSED_VOCABULARY = {"yes", "no", "correct", "incorrect", "question", "guess"}
+POSITION_LIST_PATTERN = re.compile(r"^[\d\s,.\[\]]*$")  # Stress word positions, e.g. "1, 4, 9"
+
+
+class AhoCorasickMatcher:
+    """
+    A multi-pattern matcher that is built once from a list of terms and then
+    finds all occurrences of all terms in a text in a single pass. Matches
+    are only reported on whole words.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for pattern in patterns:
+            self.add_pattern(pattern)
+        self.build_failure_links()
+
+    def add_pattern(self, pattern: str) -> None:
+        state = 0
+        for char in pattern:
+            if char not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][char] = len(self.goto) - 1
+            state = self.goto[state][char]
+        self.output[state].append(pattern)
+
+    def build_failure_links(self) -> None:
+        """
+        Computes the failure links breadth-first, so every state knows the
+        longest proper suffix that is also a prefix of some pattern.
+        """
+        queue = deque(self.goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Finds all whole-word occurrences of the patterns in the text.
+
+        Args:
+            text (str): The text to search (should be lowercase).
+
+        Returns:
+            List[Tuple[int, int, str]]: (start, end, pattern) per match.
+        """
+        matches = []
+        state = 0
+
+        for index, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+
+            for pattern in self.output[state]:
+                start = index - len(pattern) + 1
+                end = index + 1
+                before = text[start - 1] if start > 0 else " "
+                after = text[end] if end < len(text) else " "
+                if not before.isalnum() and not after.isalnum():
+                    matches.append((start, end, pattern))
+
+        return matches
+
+
+def load_lexicon(file_names: List[str] = LEXICON_FILES) -> List[str]:
+    """
+    Loads the offensive terms from the lexicon files, skipping comments and
+    empty lines.
+    """
+    terms = set()
+    for file_name in file_names:
+        with open(os.path.join(LEXICON_FOLDER, file_name), encoding="utf-8") as f:
+            for line in f:
+                term = line.strip().lower()
+                if term and not term.startswith("#"):
+                    terms.add(term)
+    return sorted(terms)
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_matcher() -> AhoCorasickMatcher:
+    """
+    Returns the process-wide matcher, building the automaton on first use.
+    """
+    global _matcher
+
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = AhoCorasickMatcher(load_lexicon())
+
+    return _matcher
+
+
+def is_closed_vocabulary(text: str) -> bool:
+    normalized = text.strip().strip(".!'\"").lower()
+    return normalized in CLOSED_VOCABULARY or bool(POSITION_LIST_PATTERN.match(normalized))
+
+
+def screen_locally(text: str) -> Optional[Dict]:
+    """
+    Screens a text without any network call.
+
+    Args:
+        text (str): The text to screen.
+
+    Returns:
+        Optional[Dict]: An empty dictionary if the text is cleared (closed
+        vocabulary), a Sightengine-style response with the matches if
+        offensive terms were found, or None if the text still has to be
+        checked remotely.
+    """
+    if is_closed_vocabulary(text):
+        return {}
+
+    matches = get_matcher().find_all(text.lower())
+    if matches:
+        return {
+            "status": "success",
+            "source": "local",
+            "profanity": {
+                "matches": [
+                    {"type": "inappropriate", "match": text[start:end], "start": start, "end": end - 1}
+                    for start, end, _ in matches
+                ]
+            }
+        }
+
+    return None
@@ -1,4 +1,4 @@
-from .say_animated import say_animated
+from .say_animated import say_animated, say_animated_streamed, plan_gestures
 from .movement_generator import MovementGenerator
 from .gesture_library import DELTA_T, BEAT_GESTURES, DEFAULT_JOINT_VALUES, hello_iconic, i_iconic, you_iconic
 from .stress_word_analyzer import StressWordAnalyzer
@@ -13,6 +13,7 @@ Description:
 
 from typing import List, Dict
 
+GESTURE_LIBRARY_VERSION = 1  # Increase when gestures or planning rules change, so cached gesture plans are recomputed
 DELTA_T = 500  # Base movement duration in milliseconds: to quickly change movement pace for all movements, so they stay proportional to e.o.
 
 # Head goes up and down with both arms going up a bit beyond normal stand and then a bit lower than normal stand. Lower arms go a little in and out.
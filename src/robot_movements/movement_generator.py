@@ -14,9 +14,10 @@ Description:
 
 import random
 from typing import Dict, List
-from nltk.tokenize import RegexpTokenizer
 from src.robot_movements.gesture_library import DELTA_T, BEAT_GESTURES, DEFAULT_JOINT_VALUES, hello_iconic, i_iconic, you_iconic
 from src.robot_movements.stress_word_analyzer import StressWordAnalyzer
+from src.nlp_resources import tokenize_words
+from src.tracing import traced
 
 SPEECH_RATE_ENGLISH = 0.340211161387632  # Estimated seconds per word
 SPEECH_RATE_DUTCH = 0.31088476361070403  # Estimated seconds per word - 0.4, as it aligns better
@@ -29,13 +30,13 @@ class MovementGenerator:
     spaced and formatted into frames.
     """
 
-    def __init__(self, text: str, language: str = "en"):
+    def __init__(self, text: str, language: str = "en", emphasized_positions: List[int] | None = None):
         self.text = text
         self.language = language
         self.delta_t = DELTA_T
         self.speech_rate = SPEECH_RATE_ENGLISH if language == "en" else SPEECH_RATE_DUTCH
-        self.stress_word_analyzer = StressWordAnalyzer(text, language=self.language)
-        self.words = RegexpTokenizer(r"\b\w+(?:'\w+)?\b").tokenize(text.lower())
+        self.stress_word_analyzer = StressWordAnalyzer(text, language=self.language, emphasized_positions=emphasized_positions)
+        self.words = tokenize_words(text)
         self.beat_gestures = []
         self.iconic_gestures = []
         self.frames = []
@@ -93,6 +94,7 @@ class MovementGenerator:
 
         return self.iconic_gestures
 
+    @traced("gestures.get_frames")
     def get_gesture_frames(self) -> List[Dict]:
         """
         Generates the sequence of frames representing gestures for the provided
@@ -137,6 +139,7 @@ class MovementGenerator:
 
         return self.frames
 
+    @traced("gestures.complete_frames")
     def complete_frames(self) -> List[Dict]:
         """
         Completes the frames by ensuring that each frame has the default joint
@@ -0,0 +1,59 @@
+"""
+File:     prewarm_gestures.py
+
+Description:
+    This module plans and caches the gestures of all fixed robot lines
+    (src/robot_scripts.py) ahead of a session, so that these lines start
+    immediately during the experiment. Run it after changing the scripts or
+    the gesture library:
+
+        python -m src.robot_movements.prewarm_gestures [--force]
+"""
+
+import argparse
+import time
+from typing import List, Tuple
+from src.robot_movements.say_animated import compute_gesture_frames, get_gesture_cache, make_gesture_cache_key
+from src.robot_scripts import STATIC_SCRIPTS
+
+
+def prewarm_gesture_cache(scripts: List[Tuple[str, str]] = STATIC_SCRIPTS, force: bool = False) -> int:
+    """
+    Plans the gestures of the given lines and stores them in the gesture
+    cache.
+
+    Args:
+        scripts (List[Tuple[str, str]]): The (text, language) pairs to plan.
+            Defaults to all static robot lines.
+        force (bool): Whether to replan lines that are already cached.
+            Defaults to False.
+
+    Returns:
+        int: The number of lines that were planned.
+    """
+    gesture_cache = get_gesture_cache()
+    planned = 0
+
+    for text, language in scripts:
+        cache_key = make_gesture_cache_key(text, language)
+        if not force and gesture_cache.get(cache_key) is not None:
+            continue
+        gesture_cache.set(cache_key, compute_gesture_frames(text, language))
+        planned += 1
+
+    return planned
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Plan and cache the gestures of the fixed robot lines.")
+    parser.add_argument("--force", action="store_true", help="Replan lines that are already cached.")
+    args = parser.parse_args()
+
+    start = time.time()
+    planned = prewarm_gesture_cache(force=args.force)
+    print(f"Planned {planned} of {len(STATIC_SCRIPTS)} lines in {time.time() - start:.1f} s.")
+    print("Gesture cache statistics:", get_gesture_cache().get_stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -10,47 +10,226 @@ Description:
     predefined gesture generators and performs movement synchronously with the
     speech output. The sequence ensures that the gestures are appropriately
     timed with the spoken text, providing a more natural animation.
+    The say_animated_streamed function speaks a streamed response sentence by
+    sentence, planning the gestures of the next sentence while the current
+    one is being spoken. Gesture plans of the fixed robot lines are cached in
+    memory and on disk, as they are repeated across turns, rounds and
+    participants.
 """
 
-from typing import Generator
-from twisted.internet.defer import DeferredList, inlineCallbacks
-from autobahn.twisted.util import sleep
+import hashlib
+import json
+from typing import Dict, Generator, Iterable, List
+from twisted.internet import reactor
+from twisted.internet.defer import DeferredList, DeferredQueue, gatherResults, inlineCallbacks
+from twisted.internet.threads import deferToThread
 from alpha_mini_rug import perform_movement
+from src.cache import PersistentLRUCache, get_cache
+from src.robot_movements.gesture_library import GESTURE_LIBRARY_VERSION
 from src.robot_movements.movement_generator import MovementGenerator
+from src.robot_movements.stress_word_analyzer import parse_emphasis_markers
+from src.robot_scripts import STATIC_SCRIPTS
+from src.tracing import REPLY_START_EVENT, run_in_context, traced, tracer
+
+STAND_RESET_DELAY = 0.5  # Seconds after a gesture sequence before returning to the stand, unless the robot speaks again
+
+GESTURE_CACHE_NAME = "gesture_plans"
+GESTURE_CACHE_OPTIONS = {
+    "max_memory_entries": 256,
+    "max_disk_entries": 5000,
+    "ttl_seconds": None,  # Plans only go stale when the gesture library changes, which changes the key
+}
+# Only lines that are spoken again are cached; generated sentences rarely repeat
+# and would evict the fixed lines from the cache
+CACHEABLE_LINES = frozenset(STATIC_SCRIPTS)
+
+
+def get_gesture_cache() -> PersistentLRUCache:
+    return get_cache(GESTURE_CACHE_NAME, **GESTURE_CACHE_OPTIONS)
+
+
+def make_gesture_cache_key(text: str, language: str) -> str:
+    """
+    Builds a cache key from the text, the language and the gesture library
+    version.
+    """
+    payload = json.dumps([text, language, GESTURE_LIBRARY_VERSION], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def compute_gesture_frames(text: str, language: str = "en") -> List[Dict]:
+    """
+    Plans the complete gesture frames for a text, without the cache. Words
+    marked as *word* by the LLM are used as the emphasized words, which
+    skips the stress word analysis (and its LLM call).
+
+    Args:
+        text (str): The text to be spoken, possibly with emphasis markers.
+        language (str): The language of the speech (default is English).
+
+    Returns:
+        List[Dict]: The completed frames, or an empty list if the text gets
+        no gestures.
+    """
+    clean_text, emphasized_positions = parse_emphasis_markers(text)
+    gesture_generator = MovementGenerator(clean_text, language, emphasized_positions)
+
+    if not gesture_generator.get_gesture_frames():
+        return []
+    return gesture_generator.complete_frames()
+
+
+@traced("gestures.plan")
+def plan_gestures(text: str, language: str = "en", use_cache: bool = True) -> List[Dict]:
+    """
+    Plans the complete gesture frames for a text. Plans of the fixed robot
+    lines (CACHEABLE_LINES) are cached, so a repeated line skips the stress
+    word analysis; other text is always planned anew.
+
+    Args:
+        text (str): The text to be spoken, possibly with emphasis markers.
+        language (str): The language of the speech (default is English).
+        use_cache (bool): Whether to look up and store the plan of a fixed
+            line in the gesture cache. Defaults to True.
+
+    Returns:
+        List[Dict]: The completed frames, or an empty list if the text gets
+        no gestures.
+    """
+    if not use_cache or (text, language) not in CACHEABLE_LINES:
+        return compute_gesture_frames(text, language)
+
+    cache_key = make_gesture_cache_key(text, language)
+    cached_frames = get_gesture_cache().get(cache_key)
+    if cached_frames is not None:
+        return cached_frames
+
+    frames = compute_gesture_frames(text, language)
+    get_gesture_cache().set(cache_key, frames)
+    return frames
+
+
+_pending_stand_resets = {}
+
+
+def schedule_stand_reset(session) -> None:
+    """
+    Returns the robot to the BlocklyStand posture shortly after a gesture
+    sequence, without making the caller wait for it. If the robot starts
+    another utterance first, the reset is cancelled (see
+    cancel_stand_reset).
+    """
+    def reset() -> None:
+        _pending_stand_resets.pop(id(session), None)
+        session.call("rom.optional.behavior.play", name="BlocklyStand").addErrback(
+            lambda failure: print("Resetting to the stand failed:", failure.getErrorMessage())
+        )
+
+    cancel_stand_reset(session)
+    _pending_stand_resets[id(session)] = reactor.callLater(STAND_RESET_DELAY, reset)
+
+
+def cancel_stand_reset(session) -> None:
+    pending_reset = _pending_stand_resets.pop(id(session), None)
+    if pending_reset is not None and pending_reset.active():
+        pending_reset.cancel()
 
 
 @inlineCallbacks
-def say_animated(session, text: str, language: str = "en") -> Generator[None, None, None]:
+def say_animated(session, text: str, language: str = "en", frames: List[Dict] | None = None) -> Generator[None, None, None]:
     """
     Simulates an animated speech and gesture sequence for the robot. The robot
     will speak the text and perform gestures simultaneously.
 
     Args:
         session: The session object for interacting with the robot.
-        text (str): The text to be spoken and acted out by the robot.
+        text (str): The text to be spoken and acted out by the robot. Emphasis
+            markers (*word*) are not spoken, but guide the gestures.
         language (str): The language of the speech (default is English).
+        frames (List[Dict] | None): Gesture frames planned in advance with
+            plan_gestures. If None, the frames are planned here.
 
     Returns:
         Generator[None, None, None]: A coroutine generator which, when
-        yielded, performs the speech and gesture sequence.
+        yielded, performs the speech and gesture sequence. It fires as soon
+        as both the speech and the movements are done.
     """
     if language not in ["en", "nl"]:
         raise ValueError(f"Unsupported language: {language}. Only 'en' (English) and 'nl' (Dutch) are supported.")
 
-    yield session.call("rie.dialogue.config.language", lang=language)
+    spoken_text, _ = parse_emphasis_markers(text)
+    if not spoken_text.strip():
+        return
 
-    gesture_generator = MovementGenerator(text, language)
-    frames = gesture_generator.get_gesture_frames()
+    with tracer.span("say_animated", language=language, words=len(spoken_text.split())):
+        cancel_stand_reset(session)
+        language_set = session.call("rie.dialogue.config.language", lang=language)
 
-    if not frames:
-        yield session.call("rie.dialogue.say", text=text)
-        yield sleep(2)
-        return
+        if frames is None:
+            # Stress word analysis may call the LLM, so planning runs off the reactor thread,
+            # at the same time as the language is set on the robot
+            _, frames = yield gatherResults(
+                [language_set, deferToThread(run_in_context(plan_gestures), text, language)], consumeErrors=True
+            )
+        else:
+            yield language_set
+
+        tracer.event(REPLY_START_EVENT)
+
+        with tracer.span("robot.say", gestures=bool(frames)):
+            if not frames:
+                yield session.call("rie.dialogue.say", text=spoken_text)
+                return
+
+            speech = session.call("rie.dialogue.say", text=spoken_text)
+            movements = perform_movement(session, frames, mode="linear", sync=False, force=False)
+
+            yield DeferredList([speech, movements])
+        schedule_stand_reset(session)
+
+
+@inlineCallbacks
+def say_animated_streamed(session, sentences: Iterable[str], language: str = "en") -> Generator[None, None, str]:
+    """
+    Speaks a streamed response sentence by sentence. A worker thread pulls
+    the sentences from the (blocking) stream and plans their gestures, while
+    the robot speaks the sentences that are already done. The time until the
+    robot starts speaking is therefore the time needed for the first
+    sentence, not for the full response.
+
+    Args:
+        session: The session object for interacting with the robot.
+        sentences (Iterable[str]): The sentences to speak, e.g. from
+            stream_message_using_llm.
+        language (str): The language of the speech (default is English).
+
+    Returns:
+        Generator[None, None, str]: A coroutine generator which, when
+        yielded, returns the full spoken text.
+    """
+    queue = DeferredQueue()
+    done = object()
+
+    def produce() -> None:
+        for sentence in sentences:
+            frames = plan_gestures(sentence, language)
+            reactor.callFromThread(queue.put, (sentence, frames))
+
+    def finish(result) -> None:
+        if result is not None:  # A Failure from the worker thread
+            print("Error while streaming the response:", result.getErrorMessage())
+        queue.put(done)
+
+    deferToThread(run_in_context(produce)).addBoth(finish)
+
+    spoken = []
+    while True:
+        item = yield queue.get()
+        if item is done:
+            break
 
-    frames = gesture_generator.complete_frames()
-    speech = session.call("rie.dialogue.say", text=text)
-    movements = perform_movement(session, frames, mode="linear", sync=False, force=False)
+        sentence, frames = item
+        yield say_animated(session, sentence, language, frames=frames)
+        spoken.append(parse_emphasis_markers(sentence)[0])
 
-    yield DeferredList([speech, movements])
-    yield session.call("rom.optional.behavior.play", name="BlocklyStand")
-    yield sleep(2)
+    return " ".join(spoken)
@@ -10,12 +10,54 @@ Description:
     (beat) gestures.
 """
 
-from typing import List, Tuple
-from nltk.corpus import stopwords
-from nltk.tokenize import RegexpTokenizer
-import spacy
+import re
+from typing import List, Optional, Tuple
+from src.nlp_resources import get_stop_words, get_word_tokenizer, tag_words, tokenize_words
 from src.utils import generate_message_using_llm
 
+EMPHASIS_MARKER = re.compile(r"\*+([^*]+?)\*+|\*")
+
+
+def parse_emphasis_markers(text: str) -> Tuple[str, Optional[List[int]]]:
+    """
+    Removes the *word* emphasis markers that generate_message_using_llm adds
+    with emphasis=True, and finds the positions of the marked words.
+
+    Args:
+        text (str): The text, possibly with emphasis markers.
+
+    Returns:
+        Tuple[str, Optional[List[int]]]: The text without markers, and the
+        positions (word indices, as in tokenize_words) of the marked words,
+        or None if the text has no markers.
+    """
+    clean_parts = []
+    marked_spans = []
+    clean_length = 0
+    last_end = 0
+
+    for match in EMPHASIS_MARKER.finditer(text):
+        clean_parts.append(text[last_end:match.start()])
+        clean_length += match.start() - last_end
+        if match.group(1) is not None:
+            clean_parts.append(match.group(1))
+            marked_spans.append((clean_length, clean_length + len(match.group(1))))
+            clean_length += len(match.group(1))
+        last_end = match.end()
+
+    if not clean_parts:
+        return text, None
+
+    clean_parts.append(text[last_end:])
+    clean_text = "".join(clean_parts)
+
+    positions = []
+    for index, (word_start, _) in enumerate(get_word_tokenizer().span_tokenize(clean_text)):
+        if any(start <= word_start < end for start, end in marked_spans):
+            positions.append(index)
+
+    return clean_text, positions if marked_spans else None
+
 
 class StressWordAnalyzer:
     """
@@ -24,13 +66,13 @@ class StressWordAnalyzer:
     It ensures spacing rules are followed and prioritizes iconic gestures.
     """
 
-    def __init__(self, text: str, language: str = "en"):
+    def __init__(self, text: str, language: str = "en", emphasized_positions: List[int] | None = None):
         self.text = text
         self.language = language
-        self.words = RegexpTokenizer(r"\b\w+(?:'\w+)?\b").tokenize(text.lower())
-        self.stop_words_en = set(stopwords.words('english'))
-        self.stop_words_nl = set(stopwords.words('dutch'))
-        self.stop_words = self.stop_words_en.union(self.stop_words_nl)
+        # Positions marked by the LLM in the generated text itself; if given, no separate LLM request is made
+        self.emphasized_positions = emphasized_positions
+        self.words = tokenize_words(text)
+        self.stop_words = get_stop_words()  # English and Dutch, shared by the whole process
 
     def get_llm_stress_words(self) -> List[Tuple[int, str]]:
         """
@@ -41,6 +83,9 @@ class StressWordAnalyzer:
             List[Tuple[int, str]]: A list of tuples, each containing the index
             of the word in the text and the corresponding word.
         """
+        if self.emphasized_positions is not None:
+            return [(index, self.words[index]) for index in sorted(set(self.emphasized_positions)) if 0 <= index < len(self.words)]
+
         prompt = (
             f"Identify the MOST IMPORTANT words that should be emphasized with a small arm or head movement in this text: {self.text}. "
             f"Select at most 1 word per 9 words. Focus on words that carry key meaning or emotion. "
@@ -48,7 +93,7 @@ class StressWordAnalyzer:
             f"Return only a comma-separated list of their positions in the text starting from 0."
         )
         response = generate_message_using_llm(prompt)
-        response = RegexpTokenizer(r"\b\w+(?:'\w+)?\b").tokenize(response.lower().split('\n')[0])
+        response = tokenize_words(response.split('\n')[0])
         # Cleaning up the response: removing unwanted characters like punctuation and filtering out emojis
         # And if LLM's response includes additional lines (e.g., "1, 2\n hi, i'm"), it is handled here
 
@@ -71,27 +116,20 @@ class StressWordAnalyzer:
     def get_pos_tag_stress_words(self) -> List[Tuple[int, str]]:
         """
         Identifies important stress words in the text based on part-of-speech
-        (POS) tagging. It processes each word in the text, tags it with its
-        POS tag, and checks if it is a noun, verb, adjective, or adverb.
-        If the word is not a stop word, it is considered a stress word.
+        (POS) tagging. It tags the whole text at once, and checks for each
+        word if it is a noun, verb, adjective, or adverb. If the word is not a
+        stop word, it is considered a stress word.
 
         Returns:
             List[Tuple[int, str]]: A list of tuples containing the index and
             the corresponding stress word.
         """
-        if self.language == "nl":
-            nlp_model = spacy.load("nl_core_news_sm")
-        else:
-            nlp_model = spacy.load("en_core_web_sm")
-
         stress_words = []
 
-        for index, word in enumerate(self.words):
-            doc = nlp_model(word)
-            token = doc[0]  # This model causes inaccuracies for contractions, but our previous approach was not suitable for Dutch text
-
-            if token.pos_ in ('NOUN', 'VERB', 'ADJ', 'ADV') and token.text.lower() not in self.stop_words:
-                stress_words.append((index, token.text))
+        # Tagging words in context is faster (one pass) and more accurate than tagging them one by one
+        for index, (token_text, pos) in enumerate(tag_words(self.text, self.language)):
+            if pos in ('NOUN', 'VERB', 'ADJ', 'ADV') and token_text.lower() not in self.stop_words:
+                stress_words.append((index, token_text.lower()))
 
         return stress_words
 
@@ -0,0 +1,85 @@
+"""
+File:     robot_scripts.py
+
+Description:
+    This module collects the fixed lines the robot speaks during the
+    experiment and the game. Keeping them in one place lets their gesture
+    plans be computed ahead of time (see
+    src/robot_movements/prewarm_gestures.py), so these lines start
+    immediately when they are said.
+"""
+
+from typing import List, Tuple
+
+# === Experiment (main.py) ===
+INTRO_EXPERIMENT = (
+    "Hallo! Wat leuk dat je meedoet aan het experiment. "
+    "We gaan straks samen een paar korte spelletjes doen. "
+    "Ik zal een woord in gedachten nemen en jij zal mij vragen "
+    "gaan stellen om te raden welk woord ik in gedachten heb. "
+    "Je mag Nederlands spreken, maar probeer zo veel Engels te spreken. "
+    "Ik zal je helpen om in het Engels te spreken."
+)
+INTRO_CONTROL = (
+    "Hallo! Wat leuk dat je meedoet aan het experiment. "
+    "We gaan straks samen een paar korte spelletjes doen. "
+    "Ik zal een woord in gedachten nemen en jij zal mij vragen "
+    "gaan stellen om te raden welk woord ik in gedachten heb. "
+    "Probeer zo veel mogelijk Engels te spreken, "
+    "want ik versta geen Nederlands."
+)
+TEST_EXPLANATION = (
+    "Ik zal nu telkens een woord per ronde opnoemen in het Engels en jij "
+    "zal het bijbehorende plaatje aan moeten klikken. Er zijn 5 rondes."
+)
+WAIT_BEFORE_GAME = (
+    "We zullen nu een halve minuut wachten voordat we verdergaan met het "
+    "experiment. Ik zal elke tien seconden naar je zwaaien."
+)
+GAME_EXPLANATION = (
+    "We zullen nu het spel spelen waarin jij het woord moet raden dat ik "
+    "in gedachten heb. Er zijn vijf rondes."
+)
+ANOTHER_ROUND = "Let's play another round!"
+WAIT_BEFORE_POST_TEST = (
+    "We zullen nu een halve minuut wachten voordat we verdergaan met de laatste "
+    "test. Ik zal elke tien seconden naar je zwaaien."
+)
+END_MESSAGE = (
+    "Het experiment is nu afgelopen. Bedankt voor je deelname! Je hebt "
+    "het geweldig gedaan! Je zult nu een kort formulier moeten invullen "
+    "om mij en het spel te beoordelen."
+)
+
+# === Taboo game ===
+ROUND_START = "I have thought of a word. Try to guess it."
+ASK_AGAIN = "Ask me a question or guess the word."
+HINT_OFFER = "Would you like a hint?"
+HINT_OFFER_REPEAT = "Would you like a hint? Respond with only 'yes' or 'no'."
+HINT_INTRO = "I will give you a hint!"
+GUESS_WITH_HINT = "Try to guess the word using the hint I gave you."
+CORRECT_GUESS = "You got it! Well done!"
+WRONG_GUESS = "Not quite! Keep guessing."
+REVEAL_OFFER = "Do you want me to tell you the secret word?"
+REVEAL_OFFER_REPEAT = "Do you want me to tell you the secret word? Say 'yes' or 'no'."
+
+STATIC_SCRIPTS: List[Tuple[str, str]] = [
+    (INTRO_EXPERIMENT, "nl"),
+    (INTRO_CONTROL, "nl"),
+    (TEST_EXPLANATION, "nl"),
+    (WAIT_BEFORE_GAME, "nl"),
+    (GAME_EXPLANATION, "nl"),
+    (ANOTHER_ROUND, "en"),
+    (WAIT_BEFORE_POST_TEST, "nl"),
+    (END_MESSAGE, "nl"),
+    (ROUND_START, "en"),
+    (ASK_AGAIN, "en"),
+    (HINT_OFFER, "en"),
+    (HINT_OFFER_REPEAT, "en"),
+    (HINT_INTRO, "en"),
+    (GUESS_WITH_HINT, "en"),
+    (CORRECT_GUESS, "en"),
+    (WRONG_GUESS, "en"),
+    (REVEAL_OFFER, "en"),
+    (REVEAL_OFFER_REPEAT, "en"),
+]
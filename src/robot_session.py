@@ -0,0 +1,166 @@
+"""
+File:     robot_session.py
+
+Description:
+    This module provides RobotSessionProxy, a wrapper around the Autobahn
+    session that keeps track of what is known about the robot (speech
+    language, native voice setting and posture). Calls that would not change
+    that state are answered locally instead of making a round trip to the
+    router, independent calls can be sent concurrently, and the round-trip
+    time of every WAMP procedure is recorded in a histogram. Everything
+    else is passed through to the wrapped session.
+"""
+
+import time
+from typing import Any, Dict, List, Tuple
+from twisted.internet.defer import Deferred, gatherResults
+
+# Procedures that set a piece of robot state, and how to read the new value from the call
+STATE_PROCEDURES = {
+    "rie.dialogue.config.language": ("language", lambda kwargs: kwargs.get("lang")),
+    "rie.dialogue.config.native_voice": ("native_voice", lambda kwargs: kwargs.get("use_native_voice")),
+}
+POSTURE_BEHAVIORS = {"BlocklyStand": "stand"}  # Behaviors that leave the robot in a known posture
+POSTURE_NEUTRAL_PREFIXES = ("rie.dialogue.", "rie.vision.", "rom.sensor.")  # Calls that do not move the robot
+RTT_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class RobotSessionProxy:
+    """
+    Wraps a WAMP session and drops calls that would not change the known
+    robot state. It can be used wherever the session is used.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.state = {}
+        self.last_state_calls = {}  # State key -> Deferred of the call that set it
+        self.dropped_calls = {}
+        self.rtt_stats = {}
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes the proxy does not have itself, e.g. leave or subscribe
+        return getattr(self.session, name)
+
+    def get_state_change(self, procedure: str, kwargs: Dict[str, Any]) -> Tuple[str | None, Any]:
+        """
+        Determines which piece of robot state a call sets, if any.
+
+        Args:
+            procedure (str): The WAMP procedure.
+            kwargs (Dict[str, Any]): The keyword arguments of the call.
+
+        Returns:
+            Tuple[str | None, Any]: The state key and its new value; the key
+            is None for calls that do not set tracked state.
+        """
+        if procedure in STATE_PROCEDURES:
+            state_key, read_value = STATE_PROCEDURES[procedure]
+            return state_key, read_value(kwargs)
+
+        if procedure == "rom.optional.behavior.play":
+            return "posture", POSTURE_BEHAVIORS.get(kwargs.get("name"))
+
+        if procedure.startswith(POSTURE_NEUTRAL_PREFIXES):
+            return None, None
+
+        return "posture", None  # Anything else may move the robot, which leaves the posture unknown
+
+    def call(self, procedure: str, *args, **kwargs) -> Deferred:
+        """
+        Calls a WAMP procedure, unless it would set robot state to the value
+        it already has. A dropped call fires once the call that set the
+        state has finished, so the order of effects is kept.
+
+        Args:
+            procedure (str): The WAMP procedure.
+            *args: Positional arguments of the call.
+            **kwargs: Keyword arguments of the call.
+
+        Returns:
+            Deferred: Fires with the result of the call (None if dropped).
+        """
+        state_key, value = self.get_state_change(procedure, kwargs)
+
+        if state_key is not None and value is not None and self.state.get(state_key) == value:
+            self.dropped_calls[procedure] = self.dropped_calls.get(procedure, 0) + 1
+            return self.when_done(self.last_state_calls[state_key])
+
+        start = time.monotonic()
+        call = self.session.call(procedure, *args, **kwargs)
+        call.addBoth(self.record_rtt, procedure, start)
+
+        if state_key is not None:
+            # Assume the call succeeds, so calls sent before it finishes are dropped too
+            self.state[state_key] = value
+            self.last_state_calls[state_key] = call
+            call.addErrback(self.forget_state, state_key, call)
+
+        return call
+
+    def call_concurrently(self, calls: List[Tuple[str, Dict[str, Any]]]) -> Deferred:
+        """
+        Sends independent calls at the same time instead of one after
+        another.
+
+        Args:
+            calls (List[Tuple[str, Dict[str, Any]]]): (procedure, keyword
+                arguments) pairs.
+
+        Returns:
+            Deferred: Fires with the list of results once all calls are done.
+        """
+        return gatherResults([self.call(procedure, **kwargs) for procedure, kwargs in calls], consumeErrors=True)
+
+    def when_done(self, call: Deferred) -> Deferred:
+        """
+        Returns a new Deferred that fires (with None) when the given call has
+        finished, without touching the call's own result.
+        """
+        done = Deferred()
+
+        def notify(result):
+            done.callback(None)
+            return result
+
+        call.addBoth(notify)
+        return done
+
+    def forget_state(self, failure, state_key: str, call: Deferred):
+        # A failed call leaves the state unknown, so the next call is sent again
+        if self.last_state_calls.get(state_key) is call:
+            self.state.pop(state_key, None)
+        return failure
+
+    def record_rtt(self, result, procedure: str, start: float):
+        rtt_ms = (time.monotonic() - start) * 1000
+        stats = self.rtt_stats.setdefault(
+            procedure, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "buckets": [0] * (len(RTT_BUCKETS_MS) + 1)}
+        )
+        stats["count"] += 1
+        stats["total_ms"] += rtt_ms
+        stats["max_ms"] = max(stats["max_ms"], rtt_ms)
+        bucket = next((i for i, bound in enumerate(RTT_BUCKETS_MS) if rtt_ms <= bound), len(RTT_BUCKETS_MS))
+        stats["buckets"][bucket] += 1
+        return result
+
+    def get_rtt_histogram(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the round-trip time statistics per procedure: the number of
+        calls, the mean and maximum in milliseconds, the number of dropped
+        calls and a histogram keyed by bucket upper bound ('<=10ms', ...).
+        """
+        labels = [f"<={bound}ms" for bound in RTT_BUCKETS_MS] + [f">{RTT_BUCKETS_MS[-1]}ms"]
+        report = {}
+
+        for procedure in sorted(set(self.rtt_stats) | set(self.dropped_calls)):
+            stats = self.rtt_stats.get(procedure, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "buckets": [0] * len(labels)})
+            report[procedure] = {
+                "count": stats["count"],
+                "dropped": self.dropped_calls.get(procedure, 0),
+                "mean_ms": round(stats["total_ms"] / stats["count"], 1) if stats["count"] else 0.0,
+                "max_ms": round(stats["max_ms"], 1),
+                "histogram": {label: count for label, count in zip(labels, stats["buckets"]) if count},
+            }
+
+        return report
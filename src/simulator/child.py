@@ -0,0 +1,205 @@
+"""
+File:     child.py
+
+Description:
+    This module provides a scripted child for hardware-free runs of the
+    game. SimulatedChild decides what to say based on what the robot said
+    last: it asks questions, makes wrong guesses and finally guesses the
+    secret word, answers hint and reveal offers, and repeats example
+    sentences. SimulatedMicrophone feeds the child's utterances to
+    SpeechToText as audio (recorded or synthesized from the word count), so
+    recording, endpointing and trimming run as they do with a real
+    microphone, and SimulatedChildBackend returns the matching transcript.
+"""
+
+import random
+import re
+import time
+from typing import Dict
+import numpy as np
+from src.robot_scripts import HINT_OFFER, HINT_OFFER_REPEAT, REVEAL_OFFER, REVEAL_OFFER_REPEAT
+from src.speech_processing.stt_backends import TranscriptionBackend
+
+DEFAULT_QUESTIONS = [
+    "Is it something you can find in a classroom?",
+    "Can you eat it?",
+    "Is it bigger than a book?",
+    "Do you use it to write?",
+    "Is it made of plastic?",
+    "Is het iets wat je in je tas stopt?",
+]
+DEFAULT_WRONG_GUESSES = ["Is it a chair?", "Is it a book?", "Is it a pencil?", "Is it a table?"]
+YES_NO_QUESTIONS = {HINT_OFFER, HINT_OFFER_REPEAT, REVEAL_OFFER, REVEAL_OFFER_REPEAT}
+QUOTED_SENTENCE = re.compile(r"'(.+)'")
+
+SPEECH_AMPLITUDE = 6000
+NOISE_AMPLITUDE = 20
+SECONDS_PER_WORD = 0.35
+RESPONSE_DELAY = 0.6  # Seconds before the child starts talking
+
+
+class SimulatedChild:
+    """
+    A scripted child that plays the guessing game.
+
+    Args:
+        session: The simulated robot session, used to read what the robot
+            said last.
+        questions_per_guess (int): Questions asked before each guess.
+            Defaults to 2.
+        wrong_guesses (int): Wrong guesses before the correct one. Defaults
+            to 1.
+        silence_probability (float): Chance that the child says nothing.
+            Defaults to 0.
+        recordings (Dict[str, np.ndarray] | None): Recorded audio (int16) per
+            transcript. Transcripts without a recording get synthesized
+            audio.
+        seed (int): Seed for the random choices. Defaults to 0.
+    """
+
+    def __init__(self,
+                 session,
+                 questions_per_guess: int = 2,
+                 wrong_guesses: int = 1,
+                 silence_probability: float = 0.0,
+                 recordings: Dict[str, np.ndarray] | None = None,
+                 seed: int = 0):
+        self.session = session
+        self.questions_per_guess = questions_per_guess
+        self.wrong_guesses = wrong_guesses
+        self.silence_probability = silence_probability
+        self.recordings = recordings or {}
+        self.random = random.Random(seed)
+        self.rng = np.random.default_rng(seed)
+        self.secret_word = None
+        self.current_transcript = ""
+        self.utterances = 0
+
+    def start_round(self, secret_word: str) -> None:
+        self.secret_word = secret_word
+        self.questions = self.random.sample(DEFAULT_QUESTIONS, len(DEFAULT_QUESTIONS))
+        self.guesses = self.random.sample(DEFAULT_WRONG_GUESSES, min(self.wrong_guesses, len(DEFAULT_WRONG_GUESSES)))
+        self.questions_since_guess = 0
+
+    def next_utterance(self) -> str:
+        """
+        Decides what the child says next, based on the robot's last line.
+
+        Returns:
+            str: The transcript of the utterance ('' for silence).
+        """
+        self.utterances += 1
+        robot_line = self.session.last_spoken()
+
+        if self.random.random() < self.silence_probability:
+            return ""
+
+        if "try saying" in robot_line.lower():
+            match = QUOTED_SENTENCE.search(robot_line)
+            return match.group(1) if match else "I don't know."
+
+        if robot_line in YES_NO_QUESTIONS:
+            return self.random.choice(["Yes.", "Yes please.", "No."])
+
+        if self.questions_since_guess < self.questions_per_guess and self.questions:
+            self.questions_since_guess += 1
+            return self.questions.pop()
+
+        self.questions_since_guess = 0
+        if self.guesses:
+            return self.guesses.pop()
+        return f"Is it a {self.secret_word}?"
+
+    def get_audio(self, transcript: str, sample_rate: int, channels: int) -> np.ndarray:
+        """
+        Returns the audio of an utterance: the recording if there is one,
+        otherwise a pause followed by speech-like noise that lasts as long as
+        the words.
+
+        Returns:
+            np.ndarray: Interleaved int16 samples.
+        """
+        if transcript in self.recordings:
+            return self.recordings[transcript]
+
+        delay = self.rng.normal(0, NOISE_AMPLITUDE, int(RESPONSE_DELAY * sample_rate) * channels)
+        speech_frames = int(len(transcript.split()) * SECONDS_PER_WORD * sample_rate)
+        speech = self.rng.normal(0, SPEECH_AMPLITUDE, speech_frames * channels)
+        return np.clip(np.concatenate([delay, speech]), -32768, 32767).astype(np.int16)
+
+    def begin_utterance(self, sample_rate: int, channels: int) -> np.ndarray:
+        self.current_transcript = self.next_utterance()
+        print("Simulated child:", self.current_transcript or "(silence)")
+        return self.get_audio(self.current_transcript, sample_rate, channels)
+
+
+class SimulatedMicrophone:
+    """
+    Stands in for the AudioEngine of SpeechToText. Every recording plays
+    the child's next utterance, followed by room noise.
+
+    Args:
+        child (SimulatedChild): The child whose utterances are played.
+        sample_rate (int): The sample rate of the audio.
+        channels (int): The number of channels.
+        chunk_size (int): Frames per chunk.
+        time_scale (float): 1.0 delivers audio in real time, 0 as fast as
+            possible. Defaults to 1.0.
+    """
+
+    def __init__(self, child: SimulatedChild, sample_rate: int, channels: int, chunk_size: int, time_scale: float = 1.0):
+        self.child = child
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.chunk_size = chunk_size
+        self.time_scale = time_scale
+        self.audio = None
+        self.position = 0
+        self.rng = np.random.default_rng(0)
+
+    def resolve_device(self) -> Dict[str, int | str]:
+        return {"index": 0, "name": "Simulated microphone", "input_channels": self.channels}
+
+    def resume(self) -> None:
+        if self.audio is None:
+            self.audio = self.child.begin_utterance(self.sample_rate, self.channels)
+            self.position = 0
+
+    def pause(self) -> None:
+        self.audio = None
+
+    def read_chunk(self) -> bytes:
+        samples = self.chunk_size * self.channels
+        chunk = self.audio[self.position:self.position + samples] if self.audio is not None else np.empty(0, dtype=np.int16)
+        self.position += samples
+
+        if len(chunk) < samples:
+            noise = self.rng.normal(0, NOISE_AMPLITUDE, samples - len(chunk)).astype(np.int16)
+            chunk = np.concatenate([chunk, noise])
+
+        if self.time_scale > 0:
+            time.sleep(self.chunk_size / self.sample_rate * self.time_scale)
+        return chunk.tobytes()
+
+    def reset(self) -> None:
+        self.audio = None
+
+    def close(self) -> None:
+        self.audio = None
+
+
+class SimulatedChildBackend(TranscriptionBackend):
+    """
+    Transcribes a recording as what the simulated child said.
+    """
+
+    name = "simulated_child"
+
+    def __init__(self, child: SimulatedChild):
+        super().__init__()
+        self.child = child
+        self.ready.set()
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> str:
+        return self.child.current_transcript
+
@@ -0,0 +1,399 @@
+"""
+File:     mock_upstream.py
+
+Description:
+    This module provides a local stand-in for the upstream services: the
+    OpenAI chat completions (including streaming) and audio transcription
+    endpoints, and the Sightengine text check. Responses are scripted with
+    rules that match the prompt, latencies are drawn from configurable
+    distributions, and rate limits (429), timeouts and profanity matches
+    can be injected, so the game loop can be measured under slow or failing
+    upstreams without live accounts. Start it and point the clients at it:
+
+        python -m src.simulator.mock_upstream --port 8765 [--config mock.json]
+
+        OPENAI_API_KEY=mock \
+        OPENAI_BASE_URL=http://127.0.0.1:8765/v1 \
+        SIGHTENGINE_URL=http://127.0.0.1:8765/1.0/text/check.json \
+        python -m src.simulator.run_simulation --time-scale 0
+
+    The config file is JSON with one section per endpoint ('chat',
+    'transcription', 'sightengine') that overrides DEFAULT_CONFIG, e.g.:
+
+        {"chat": {"latency": {"distribution": "lognormal", "median": 1.2, "sigma": 0.6},
+                  "rate_limit_rate": 0.1},
+         "sightengine": {"profanity_words": ["stupid"]}}
+
+    GET /stats returns the number of requests and injected faults per
+    endpoint.
+"""
+
+import argparse
+import copy
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import cycle
+from typing import Any, Dict, List
+from urllib.parse import parse_qs
+
+DEFAULT_PORT = 8765
+
+# Rules are tried in order; the first whose pattern matches the last user message answers it, and
+# a rule with several responses cycles through them
+DEFAULT_CHAT_RULES = [
+    {"pattern": r"Respond with only a JSON object", "responses": [
+        '{"intent": "question", "hint_requested": false, "correct_guess": false, '
+        '"answer": "No, it is not something you can *eat*.", "answer_polarity": "no"}',
+        '{"intent": "guess", "hint_requested": false, "correct_guess": true, "answer": "", "answer_polarity": "yes"}',
+    ]},
+    {"pattern": r"Respond with only 'yes' or 'no'", "responses": ["yes", "no"]},
+    {"pattern": r"Respond with only 'question' or 'guess'", "responses": ["question", "question", "guess"]},
+    {"pattern": r"Respond with only 'correct' or 'incorrect'", "responses": ["incorrect", "correct"]},
+    {"pattern": r"comma-separated list of their positions", "responses": ["1, 4"]},
+    {"pattern": r"", "responses": ["That is a *good* question! It is something you use at school every day."]},
+]
+
+DEFAULT_CONFIG: Dict[str, Dict[str, Any]] = {
+    "chat": {
+        "rules": DEFAULT_CHAT_RULES,
+        "latency": {"distribution": "lognormal", "median": 0.8, "sigma": 0.4},
+        "stream_chunk_delay": {"distribution": "fixed", "value": 0.03},
+        "rate_limit_rate": 0.0,
+        "timeout_rate": 0.0,
+        "timeout_seconds": 120.0,
+    },
+    "transcription": {
+        "transcripts": ["Is it something you can find in a classroom?", "Is it a pencil?"],
+        "latency": {"distribution": "lognormal", "median": 0.9, "sigma": 0.3},
+        "rate_limit_rate": 0.0,
+        "timeout_rate": 0.0,
+        "timeout_seconds": 120.0,
+    },
+    "sightengine": {
+        "latency": {"distribution": "normal", "mean": 0.25, "std": 0.05},
+        "profanity_words": [],  # Always reported as matches when they occur in the text
+        "profanity_rate": 0.0,  # Chance that the first word of a clean text is reported as a match
+        "rate_limit_rate": 0.0,
+        "timeout_rate": 0.0,
+        "timeout_seconds": 30.0,
+    },
+}
+RESPONSE_FORMAT_TEXT = re.compile(rb'name="response_format"\r\n\r\ntext\r\n')
+
+
+def sample_latency(spec: Dict[str, Any], rng: random.Random) -> float:
+    """
+    Draws a latency in seconds from a distribution spec: 'fixed' (value),
+    'uniform' (low, high), 'normal' (mean, std) or 'lognormal' (median,
+    sigma). Negative draws are clipped to 0.
+
+    Raises:
+        ValueError: If the distribution is unknown.
+    """
+    distribution = spec.get("distribution", "fixed")
+
+    if distribution == "fixed":
+        latency = spec.get("value", 0.0)
+    elif distribution == "uniform":
+        latency = rng.uniform(spec["low"], spec["high"])
+    elif distribution == "normal":
+        latency = rng.gauss(spec["mean"], spec["std"])
+    elif distribution == "lognormal":
+        latency = spec["median"] * rng.lognormvariate(0, spec["sigma"])
+    else:
+        raise ValueError(f"Unknown latency distribution: {distribution}")
+
+    return max(0.0, latency)
+
+
+def scale_latency(spec: Dict[str, Any], scale: float) -> None:
+    """
+    Multiplies the durations of a latency spec in place. The shape of a
+    lognormal distribution (sigma) is left as is.
+    """
+    for key in ("value", "low", "high", "mean", "std", "median"):
+        if key in spec:
+            spec[key] *= scale
+
+
+def load_config(path: str | None = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Returns DEFAULT_CONFIG with the sections of the given JSON file merged
+    over it (per key, so a file can change only the latency of one
+    endpoint).
+    """
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    if path is not None:
+        with open(path, "r") as f:
+            for endpoint, options in json.load(f).items():
+                if endpoint not in config:
+                    raise ValueError(f"Unknown endpoint: {endpoint}. Must be one of {list(config)}.")
+                config[endpoint].update(options)
+    return config
+
+
+class MockUpstream:
+    """
+    The scripted behavior of the mock server, shared by all request threads.
+    """
+
+    def __init__(self, config: Dict[str, Dict[str, Any]], seed: int = 0):
+        self.config = config
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.rules = [
+            (re.compile(rule["pattern"]), cycle(rule["responses"])) for rule in config["chat"]["rules"]
+        ]
+        self.transcripts = cycle(config["transcription"]["transcripts"])
+        self.stats = {endpoint: {"requests": 0, "rate_limited": 0, "timed_out": 0} for endpoint in config}
+        self.stats["sightengine"]["profanity_injected"] = 0
+
+    def random(self) -> float:
+        with self.lock:
+            return self.rng.random()
+
+    def latency(self, endpoint: str, key: str = "latency") -> float:
+        with self.lock:
+            return sample_latency(self.config[endpoint][key], self.rng)
+
+    def choose_fault(self, endpoint: str) -> str | None:
+        """
+        Counts a request and decides whether to inject a fault.
+
+        Returns:
+            str | None: 'rate_limited', 'timed_out' or None.
+        """
+        options = self.config[endpoint]
+        draw = self.random()
+
+        with self.lock:
+            self.stats[endpoint]["requests"] += 1
+            if draw < options["rate_limit_rate"]:
+                fault = "rate_limited"
+            elif draw < options["rate_limit_rate"] + options["timeout_rate"]:
+                fault = "timed_out"
+            else:
+                return None
+            self.stats[endpoint][fault] += 1
+            return fault
+
+    def chat_response(self, messages: List[Dict[str, Any]]) -> str:
+        prompt = next((m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), "")
+        with self.lock:
+            for pattern, responses in self.rules:
+                if pattern.search(prompt):
+                    return next(responses)
+        return ""
+
+    def transcript(self) -> str:
+        with self.lock:
+            return next(self.transcripts)
+
+    def profanity_matches(self, text: str) -> List[Dict[str, Any]]:
+        options = self.config["sightengine"]
+        matches = []
+
+        for word in options["profanity_words"]:
+            for match in re.finditer(rf"\b{re.escape(word)}\b", text, re.IGNORECASE):
+                matches.append({"type": "inappropriate", "intensity": "high", "match": match.group(0),
+                                "start": match.start(), "end": match.end()})
+
+        first_word = re.search(r"\w+", text)
+        if not matches and first_word and self.random() < options["profanity_rate"]:
+            matches.append({"type": "insult", "intensity": "medium", "match": first_word.group(0),
+                            "start": first_word.start(), "end": first_word.end()})
+
+        if matches:
+            with self.lock:
+                self.stats["sightengine"]["profanity_injected"] += 1
+        return matches
+
+
+class MockUpstreamHandler(BaseHTTPRequestHandler):
+    server_version = "MockUpstream/1.0"
+
+    @property
+    def upstream(self) -> MockUpstream:
+        return self.server.upstream
+
+    def log_message(self, format: str, *args) -> None:
+        pass  # Every request would be printed otherwise
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") == "/stats":
+            with self.upstream.lock:
+                self.send_json(200, self.upstream.stats)
+        else:
+            self.send_json(404, {"error": {"message": f"Unknown path: {self.path}"}})
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        if self.path.endswith("/chat/completions"):
+            endpoint = "chat"
+        elif self.path.endswith("/audio/transcriptions"):
+            endpoint = "transcription"
+        elif self.path.endswith("/text/check.json"):
+            endpoint = "sightengine"
+        else:
+            self.send_json(404, {"error": {"message": f"Unknown path: {self.path}"}})
+            return
+
+        fault = self.upstream.choose_fault(endpoint)
+        if fault == "timed_out":
+            time.sleep(self.upstream.config[endpoint]["timeout_seconds"])
+            self.send_json(504, {"error": {"message": "Injected timeout.", "type": "timeout"}})
+            return
+
+        time.sleep(self.upstream.latency(endpoint))
+
+        if fault == "rate_limited":
+            self.send_json(429, {"error": {"message": "Injected rate limit.", "type": "requests", "code": "rate_limit_exceeded"}},
+                           headers={"Retry-After": "1"})
+        elif endpoint == "chat":
+            self.handle_chat(json.loads(body or b"{}"))
+        elif endpoint == "transcription":
+            self.handle_transcription(body)
+        else:
+            self.handle_sightengine(body)
+
+    def handle_chat(self, request: Dict[str, Any]) -> None:
+        messages = request.get("messages", [])
+        contents = [self.upstream.chat_response(messages) for _ in range(request.get("n") or 1)]
+        completion_id = f"chatcmpl-mock-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        model = request.get("model", "mock")
+
+        if not request.get("stream"):
+            self.send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {"index": i, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+                    for i, content in enumerate(contents)
+                ],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        def send_chunk(delta: Dict[str, Any], finish_reason: str | None = None) -> None:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        send_chunk({"role": "assistant", "content": ""})
+        for piece in re.findall(r"\S+\s*", contents[0]):
+            time.sleep(self.upstream.latency("chat", "stream_chunk_delay"))
+            send_chunk({"content": piece})
+        send_chunk({}, finish_reason="stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def handle_transcription(self, body: bytes) -> None:
+        transcript = self.upstream.transcript()
+        if RESPONSE_FORMAT_TEXT.search(body):
+            self.send_text(200, transcript + "\n")
+        else:
+            self.send_json(200, {"text": transcript})
+
+    def handle_sightengine(self, body: bytes) -> None:
+        text = parse_qs(body.decode("utf-8")).get("text", [""])[0]
+        self.send_json(200, {
+            "status": "success",
+            "request": {"id": f"req_mock_{uuid.uuid4().hex[:12]}", "timestamp": time.time(), "operations": 1},
+            "profanity": {"matches": self.upstream.profanity_matches(text)},
+        })
+
+    def send_json(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] | None = None) -> None:
+        self.send_text(status, json.dumps(payload), content_type="application/json", headers=headers)
+
+    def send_text(self, status: int, text: str, content_type: str = "text/plain", headers: Dict[str, str] | None = None) -> None:
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def create_server(host: str = "127.0.0.1", port: int = DEFAULT_PORT, config: Dict[str, Dict[str, Any]] | None = None,
+                  seed: int = 0) -> ThreadingHTTPServer:
+    """
+    Creates the mock server; call serve_forever (for example in a thread)
+    to start it.
+
+    Args:
+        host (str): The address to listen on. Defaults to 127.0.0.1.
+        port (int): The port to listen on (0 picks a free port). Defaults to
+            DEFAULT_PORT.
+        config (Dict[str, Dict[str, Any]] | None): The behavior per endpoint.
+            Defaults to DEFAULT_CONFIG.
+        seed (int): Seed for latencies and injected faults. Defaults to 0.
+
+    Returns:
+        ThreadingHTTPServer: The server; its upstream attribute holds the
+        scripted behavior and the request statistics.
+    """
+    server = ThreadingHTTPServer((host, port), MockUpstreamHandler)
+    server.daemon_threads = True
+    server.upstream = MockUpstream(config if config is not None else load_config(), seed)
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve mock OpenAI and Sightengine endpoints.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--config", help="JSON file with per-endpoint overrides of the default behavior.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rate-limit-rate", type=float, help="Fraction of requests answered with 429, for all endpoints.")
+    parser.add_argument("--timeout-rate", type=float, help="Fraction of requests that time out, for all endpoints.")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiplies all latencies.")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    for options in config.values():
+        if args.rate_limit_rate is not None:
+            options["rate_limit_rate"] = args.rate_limit_rate
+        if args.timeout_rate is not None:
+            options["timeout_rate"] = args.timeout_rate
+        for latency_key in ("latency", "stream_chunk_delay"):
+            if latency_key in options:
+                scale_latency(options[latency_key], args.latency_scale)
+
+    server = create_server(args.host, args.port, config, args.seed)
+    print(f"Mock upstream listening on http://{args.host}:{server.server_port}")
+    print(f"  OPENAI_BASE_URL=http://{args.host}:{server.server_port}/v1")
+    print(f"  SIGHTENGINE_URL=http://{args.host}:{server.server_port}/1.0/text/check.json")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("Requests:", json.dumps(server.upstream.stats, indent=4))
+
+
+if __name__ == "__main__":
+    main()
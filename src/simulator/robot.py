@@ -0,0 +1,115 @@
+"""
+File:     robot.py
+
+Description:
+    This module provides SimulatedRobotSession, an in-process stand-in for
+    the WAMP router and the Alpha Mini. Procedures are registered with
+    handlers, like on a router, and calls return Deferreds that fire after
+    the time the robot would need: speech takes as long as its words at the
+    measured speech rate, gestures as long as their frames, behaviors a fixed
+    time. It can be used wherever the Autobahn session is used, so the game
+    runs unchanged without a robot.
+"""
+
+from typing import Any, Callable, Dict, List
+from twisted.internet import reactor
+from twisted.internet.defer import Deferred, succeed
+from src.robot_movements.movement_generator import SPEECH_RATE_DUTCH, SPEECH_RATE_ENGLISH
+
+BEHAVIOR_SECONDS = {"BlocklyStand": 1.0, "BlocklyWaveRightArm": 3.0}
+DEFAULT_BEHAVIOR_SECONDS = 2.0
+SPEECH_START_SECONDS = 0.3  # Time the text-to-speech engine needs before the robot starts talking
+
+
+class SimulatedRobotSession:
+    """
+    Answers WAMP calls with simulated robot behavior.
+
+    Args:
+        time_scale (float): Multiplies all simulated durations; 1.0 is real
+            time, 0 finishes every call immediately. Defaults to 1.0.
+    """
+
+    def __init__(self, time_scale: float = 1.0):
+        self.time_scale = time_scale
+        self.state = {"language": "en", "native_voice": True}
+        self.spoken = []  # (language, text) of everything the robot said
+        self.call_counts = {}
+        self.unhandled_calls = {}
+        self.handlers: Dict[str, Callable[..., float]] = {}
+
+        self.register("rie.dialogue.say", self.say)
+        self.register("rie.dialogue.config.language", self.set_language)
+        self.register("rie.dialogue.config.native_voice", self.set_native_voice)
+        self.register("rom.optional.behavior.play", self.play_behavior)
+        self.register("rom.actuator.motor.write", self.write_motors)
+
+    def register(self, procedure: str, handler: Callable[..., float]) -> None:
+        """
+        Registers a procedure. The handler receives the call's arguments and
+        returns how many (unscaled) seconds the robot needs for it.
+        """
+        self.handlers[procedure] = handler
+
+    def call(self, procedure: str, *args, **kwargs) -> Deferred:
+        """
+        Calls a simulated procedure.
+
+        Args:
+            procedure (str): The WAMP procedure.
+            *args: Positional arguments of the call.
+            **kwargs: Keyword arguments of the call.
+
+        Returns:
+            Deferred: Fires with None once the simulated robot is done.
+            Unknown procedures fire immediately and are counted in
+            unhandled_calls.
+        """
+        self.call_counts[procedure] = self.call_counts.get(procedure, 0) + 1
+
+        handler = self.handlers.get(procedure)
+        if handler is None:
+            self.unhandled_calls[procedure] = self.unhandled_calls.get(procedure, 0) + 1
+            return succeed(None)
+
+        try:
+            seconds = handler(*args, **kwargs)
+        except Exception as e:
+            d = Deferred()
+            d.errback(e)
+            return d
+
+        d = Deferred()
+        reactor.callLater(seconds * self.time_scale, d.callback, None)
+        return d
+
+    def say(self, text: str = "", **_) -> float:
+        self.spoken.append((self.state["language"], text))
+        speech_rate = SPEECH_RATE_ENGLISH if self.state["language"] == "en" else SPEECH_RATE_DUTCH
+        return SPEECH_START_SECONDS + len(text.split()) * speech_rate
+
+    def set_language(self, lang: str = "en", **_) -> float:
+        if lang not in ("en", "nl"):
+            raise ValueError(f"Unsupported language: {lang}")
+        self.state["language"] = lang
+        return 0.0
+
+    def set_native_voice(self, use_native_voice: bool = True, **_) -> float:
+        self.state["native_voice"] = use_native_voice
+        return 0.0
+
+    def play_behavior(self, name: str = "", **_) -> float:
+        self.state["posture"] = name
+        return BEHAVIOR_SECONDS.get(name, DEFAULT_BEHAVIOR_SECONDS)
+
+    def write_motors(self, frames: List[Dict[str, Any]] | None = None, **_) -> float:
+        # The frame API used by perform_movement; frame times are in milliseconds
+        if not frames:
+            return 0.0
+        return max(frame["time"] for frame in frames) / 1000
+
+    def last_spoken(self) -> str:
+        return self.spoken[-1][1] if self.spoken else ""
+
+    def leave(self) -> None:
+        pass
@@ -0,0 +1,145 @@
+"""
+File:     run_simulation.py
+
+Description:
+    This module runs many rounds of the taboo game against the simulated
+    robot and child, without hardware, and reports the throughput and the
+    turn latency (from the latency trace, see src/tracing.py). LLM and
+    moderation requests are still made as configured in src/clients.py.
+
+        python -m src.simulator.run_simulation --rounds 200 --time-scale 0
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from typing import Any, Dict, Generator, List
+from twisted.internet import task
+from twisted.internet.defer import inlineCallbacks
+from src.robot_session import RobotSessionProxy
+from src.paths import WORDS_FILE
+from src.simulator.child import SimulatedChild, SimulatedChildBackend, SimulatedMicrophone
+from src.simulator.robot import SimulatedRobotSession
+from src.taboo_game.taboo_game import TabooGame
+from src.tracing import TRACE_FOLDER, summarize_trace, tracer
+
+TRACE_NAME = "simulation"
+# The simulated microphone has no background noise, so a fixed threshold is used instead of calibration
+SIMULATED_SILENCE_THRESHOLD = 1000
+
+
+@inlineCallbacks
+def run_simulation(
+    rounds: int = 10,
+    version: str = "experiment",
+    fused_turns: bool = False,
+    time_scale: float = 1.0,
+    seed: int = 0,
+    **child_options
+) -> Generator[None, None, Dict[str, Any]]:
+    """
+    Plays rounds of the game with a simulated robot and child.
+
+    Args:
+        rounds (int): The number of rounds to play. Defaults to 10.
+        version (str): The game version ('experiment' or 'control').
+            Defaults to 'experiment'.
+        fused_turns (bool): Whether to interpret turns with a single LLM
+            request. Defaults to False.
+        time_scale (float): Speed of the simulated robot and microphone;
+            1.0 is real time, 0 as fast as possible. Defaults to 1.0.
+        seed (int): Seed for the word order and the child. Defaults to 0.
+        **child_options: Options for SimulatedChild, e.g.
+            questions_per_guess or silence_probability.
+
+    Returns:
+        Generator[None, None, Dict[str, Any]]: A coroutine generator which,
+        when yielded, returns the results per round and the run statistics.
+    """
+    robot = SimulatedRobotSession(time_scale)
+    session = RobotSessionProxy(robot)
+    child = SimulatedChild(robot, seed=seed, **child_options)
+
+    game = TabooGame(session, version, fused_turns=fused_turns, stt_backend=SimulatedChildBackend(child))
+    processor = game.speech_recognition_session.processor
+    processor.audio_engine = SimulatedMicrophone(child, processor.sample_rate, processor.channels, processor.chunk_size, time_scale)
+    processor.silence_threshold = SIMULATED_SILENCE_THRESHOLD
+
+    with open(WORDS_FILE, "r") as f:
+        words = list(json.load(f))
+    word_order = random.Random(seed)
+
+    results: List[Dict[str, Any]] = []
+    start = time.time()
+
+    for i in range(rounds):
+        game.secret_word = word_order.choice(words)
+        child.start_round(game.secret_word)
+        round_start = time.time()
+        round_result = yield game.robot_is_host()
+        results.append({
+            "round": i + 1,
+            "target_word": game.secret_word,
+            "seconds": round(time.time() - round_start, 2),
+            "result": round_result,
+        })
+
+    elapsed = time.time() - start
+    return {
+        "rounds": results,
+        "stats": {
+            "rounds": rounds,
+            "utterances": child.utterances,
+            "seconds": round(elapsed, 1),
+            "rounds_per_hour": round(rounds / elapsed * 3600, 1) if elapsed else None,
+            "guessed": sum(result["result"]["guessed_word"] for result in results),
+            "robot_calls": robot.call_counts,
+            "unhandled_robot_calls": robot.unhandled_calls,
+        },
+    }
+
+
+@inlineCallbacks
+def main(reactor) -> Generator[None, None, None]:
+    parser = argparse.ArgumentParser(description="Play the taboo game against a simulated robot and child.")
+    parser.add_argument("--rounds", type=int, default=10, help="Number of rounds (default 10).")
+    parser.add_argument("--version", choices=["experiment", "control"], default="experiment")
+    parser.add_argument("--fused-turns", action="store_true", help="Interpret turns with a single LLM request.")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="1.0 is real time, 0 as fast as possible.")
+    parser.add_argument("--questions-per-guess", type=int, default=2)
+    parser.add_argument("--wrong-guesses", type=int, default=1)
+    parser.add_argument("--silence-probability", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results per round to this JSON file.")
+    args = parser.parse_args()
+
+    # Start every run with an empty trace, so the summary covers this run only
+    trace_path = os.path.join(TRACE_FOLDER, f"{TRACE_NAME}.jsonl")
+    if os.path.exists(trace_path):
+        os.remove(trace_path)
+    tracer.start_trace_file(TRACE_NAME)
+    report = yield run_simulation(
+        rounds=args.rounds,
+        version=args.version,
+        fused_turns=args.fused_turns,
+        time_scale=args.time_scale,
+        seed=args.seed,
+        questions_per_guess=args.questions_per_guess,
+        wrong_guesses=args.wrong_guesses,
+        silence_probability=args.silence_probability,
+    )
+    tracer.close()
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+
+    print("Simulation:", json.dumps(report["stats"], indent=4))
+    print("Latency per stage (s):", json.dumps(summarize_trace(trace_path), indent=4))
+
+
+if __name__ == "__main__":
+    task.react(main)
@@ -1,3 +1,23 @@
-from .speech_to_text import SpeechToText
-from .speech_session import SpeechRecognitionSession
-from .mic_util import MicUtil
+# The exports are imported on first use, so the standalone modules
+# (noise_calibration, audio_trim, audio_encoding) load without the rest
+import importlib
+
+_EXPORTS = {
+    "SpeechToText": ".speech_to_text",
+    "SpeechRecognitionSession": ".speech_session",
+    "MicUtil": ".mic_util",
+    "AudioEngine": ".audio_engine",
+    "get_audio_engine": ".audio_engine",
+    "NoiseFloorEstimator": ".noise_calibration",
+    "CloudBackend": ".stt_backends",
+    "LocalWhisperBackend": ".stt_backends",
+    "StubBackend": ".stt_backends",
+    "TranscriptionBackend": ".stt_backends",
+    "create_backend": ".stt_backends",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
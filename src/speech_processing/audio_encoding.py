@@ -0,0 +1,126 @@
+"""
+File:     audio_encoding.py
+
+Description:
+    This module provides the encoding stage between recording and
+    transcription. The captured audio is mixed down to mono, resampled to
+    16 kHz (all the speech model needs) and encoded in memory as FLAC, Opus
+    or WAV. FLAC and Opus are encoded by piping the samples through ffmpeg
+    (already needed for Whisper), so no temporary files are written.
+"""
+
+import io
+import subprocess
+import wave
+import numpy as np
+
+UPLOAD_CODECS = {
+    # codec: (ffmpeg arguments, file name used for the upload)
+    "flac": (["-c:a", "flac", "-f", "flac"], "speech.flac"),
+    "opus": (["-c:a", "libopus", "-application", "voip", "-f", "ogg"], "speech.ogg"),
+    "wav": (None, "speech.wav"),
+}
+
+
+def to_mono(samples: np.ndarray, channels: int) -> np.ndarray:
+    """
+    Mixes interleaved int16 samples down to a single channel.
+    """
+    if channels == 1:
+        return samples
+
+    frames = samples[:len(samples) - len(samples) % channels].reshape(-1, channels)
+    return frames.mean(axis=1).astype(np.int16)
+
+
+def lowpass_kernel(cutoff: float, num_taps: int = 63) -> np.ndarray:
+    """
+    Builds a Hamming-windowed sinc low-pass filter.
+
+    Args:
+        cutoff (float): Cutoff frequency as a fraction of the sample rate
+            (between 0 and 0.5).
+        num_taps (int): Number of filter taps (odd). Defaults to 63.
+
+    Returns:
+        np.ndarray: The normalized filter kernel.
+    """
+    n = np.arange(num_taps) - (num_taps - 1) / 2
+    kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(num_taps)
+    return kernel / kernel.sum()
+
+
+def resample(samples: np.ndarray, from_rate: int, to_rate: int) -> np.ndarray:
+    """
+    Resamples mono int16 audio. When downsampling, the audio is low-pass
+    filtered first to prevent aliasing, then linearly interpolated at the
+    new sample positions.
+
+    Args:
+        samples (np.ndarray): Mono int16 samples.
+        from_rate (int): The current sample rate.
+        to_rate (int): The target sample rate.
+
+    Returns:
+        np.ndarray: The resampled int16 samples.
+    """
+    if from_rate == to_rate or len(samples) == 0:
+        return samples
+
+    signal = samples.astype(np.float32)
+    if to_rate < from_rate:
+        signal = np.convolve(signal, lowpass_kernel(0.45 * to_rate / from_rate), mode="same")
+
+    num_output = int(len(signal) * to_rate / from_rate)
+    positions = np.arange(num_output) * (from_rate / to_rate)
+    resampled = np.interp(positions, np.arange(len(signal)), signal)
+    return np.clip(np.round(resampled), -32768, 32767).astype(np.int16)
+
+
+def encode_audio(samples: np.ndarray, sample_rate: int, codec: str = "flac", bitrate: str = "24k") -> io.BytesIO:
+    """
+    Encodes mono int16 samples into an in-memory file that can be uploaded.
+
+    Args:
+        samples (np.ndarray): Mono int16 samples.
+        sample_rate (int): The sample rate of the samples.
+        codec (str): One of 'flac', 'opus' or 'wav'. Defaults to 'flac'.
+        bitrate (str): The Opus bitrate (ignored by FLAC and WAV). Defaults
+            to '24k'.
+
+    Returns:
+        io.BytesIO: The encoded file, positioned at the start, with a name
+        whose extension tells the API the format.
+
+    Raises:
+        ValueError: If the codec is not supported.
+        RuntimeError: If ffmpeg fails to encode the audio.
+    """
+    if codec not in UPLOAD_CODECS:
+        raise ValueError(f"Unsupported codec: {codec}. Must be one of {list(UPLOAD_CODECS)}.")
+
+    ffmpeg_arguments, file_name = UPLOAD_CODECS[codec]
+
+    if ffmpeg_arguments is None:
+        encoded = io.BytesIO()
+        with wave.open(encoded, 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(sample_rate)
+            wf.writeframes(samples.tobytes())
+    else:
+        if codec == "opus":
+            ffmpeg_arguments = ffmpeg_arguments + ["-b:a", bitrate]
+
+        command = (
+            ["ffmpeg", "-hide_banner", "-loglevel", "error", "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0"]
+            + ffmpeg_arguments + ["pipe:1"]
+        )
+        process = subprocess.run(command, input=samples.astype("<i2").tobytes(), capture_output=True)
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed to encode {codec}: {process.stderr.decode(errors='replace')}")
+        encoded = io.BytesIO(process.stdout)
+
+    encoded.name = file_name
+    encoded.seek(0)
+    return encoded
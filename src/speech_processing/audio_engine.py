@@ -0,0 +1,145 @@
+"""
+File:     audio_engine.py
+
+Description:
+    This module provides a long-lived audio engine for recording. PortAudio
+    is initialized once per process, the microphone is resolved once and the
+    input stream stays open between turns; it is only paused while the robot
+    is speaking. If the device disappears, the engine re-initializes
+    PortAudio and resolves the microphone again on the next read.
+"""
+
+import threading
+from typing import Dict, Tuple
+import pyaudio
+from src.speech_processing.mic_util import MicUtil
+
+
+class AudioEngine:
+    """
+    Owns the PortAudio instance, the resolved microphone and a warm input
+    stream. Use get_audio_engine to share one engine per configuration.
+    """
+
+    def __init__(self, sample_rate: int = 44100, channels: int = 1, chunk_size: int = 1024, device_index: int | None = None):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.chunk_size = chunk_size
+        self.device_index = device_index
+        self.lock = threading.RLock()
+        self.audio_interface = pyaudio.PyAudio()
+        self.mic_util = MicUtil(self.audio_interface)
+        self.mic_info = None
+        self.stream = None
+
+    def resolve_device(self) -> Dict[str, int | str]:
+        """
+        Resolves the microphone once and caches it.
+
+        Returns:
+            Dict[str, int | str]: The microphone device info.
+        """
+        with self.lock:
+            if self.mic_info is None:
+                self.mic_info = self.mic_util.choose_mic_device(self.device_index)
+
+                if self.channels > self.mic_info['input_channels']:
+                    print(
+                        f"Requested {self.channels} channels, but the mic supports only {self.mic_info['input_channels']} channels. "
+                        f"Using {self.mic_info['input_channels']} channels instead."
+                    )
+                    self.channels = self.mic_info['input_channels']
+
+            return self.mic_info
+
+    def open_stream(self) -> pyaudio.Stream:
+        """
+        Opens the input stream on the resolved microphone (if it is not open
+        yet). The stream is opened in the stopped state.
+
+        Returns:
+            pyaudio.Stream: The input stream.
+        """
+        with self.lock:
+            if self.stream is None:
+                mic_info = self.resolve_device()
+                self.stream = self.audio_interface.open(
+                    format=pyaudio.paInt16, channels=self.channels, rate=self.sample_rate, input=True,
+                    input_device_index=mic_info['index'], frames_per_buffer=self.chunk_size, start=False
+                )
+            return self.stream
+
+    def resume(self) -> None:
+        """
+        Starts capturing. Opening the stream only happens on the first call
+        or after the device was lost.
+        """
+        with self.lock:
+            stream = self.open_stream()
+            if stream.is_stopped():
+                stream.start_stream()
+
+    def pause(self) -> None:
+        """
+        Stops capturing but keeps the stream open, so that audio is not
+        buffered while the robot speaks and resuming is instant.
+        """
+        with self.lock:
+            if self.stream is not None and not self.stream.is_stopped():
+                self.stream.stop_stream()
+
+    def read_chunk(self) -> bytes:
+        """
+        Reads one chunk from the input stream. If the read fails because the
+        device was lost, PortAudio is re-initialized, the microphone is
+        resolved again and the read is retried once.
+
+        Returns:
+            bytes: The raw int16 audio data of one chunk.
+        """
+        try:
+            return self.stream.read(self.chunk_size, exception_on_overflow=False)
+        except (IOError, OSError) as e:
+            print(f"Audio input failed ({e}). Re-resolving the microphone...")
+            self.reset()
+            self.resume()
+            return self.stream.read(self.chunk_size, exception_on_overflow=False)
+
+    def reset(self) -> None:
+        """
+        Closes the stream and re-initializes PortAudio, which is needed to see
+        devices that were (re)connected after start-up.
+        """
+        with self.lock:
+            self.close()
+            self.audio_interface = pyaudio.PyAudio()
+            self.mic_util = MicUtil(self.audio_interface)
+            self.mic_info = None
+
+    def close(self) -> None:
+        with self.lock:
+            if self.stream is not None:
+                try:
+                    self.stream.stop_stream()
+                    self.stream.close()
+                except (IOError, OSError):
+                    pass
+                self.stream = None
+            self.audio_interface.terminate()
+
+
+_engines: Dict[Tuple, AudioEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_audio_engine(sample_rate: int = 44100, channels: int = 1, chunk_size: int = 1024, device_index: int | None = None) -> AudioEngine:
+    """
+    Returns the process-wide audio engine for a configuration, creating it
+    on first use.
+    """
+    key = (sample_rate, channels, chunk_size, device_index)
+
+    with _engines_lock:
+        if key not in _engines:
+            _engines[key] = AudioEngine(sample_rate, channels, chunk_size, device_index)
+        return _engines[key]
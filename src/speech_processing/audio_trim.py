@@ -0,0 +1,111 @@
+"""
+File:     audio_trim.py
+
+Description:
+    This module trims leading and trailing silence from int16 recordings
+    with NumPy. It gives the same result as pydub's detect_nonsilent (a
+    500 ms window slid in 1 ms steps, silent when its RMS is at most
+    -40 dBFS), but computes the RMS of every window in one vectorized pass
+    over a cumulative sum of squares and returns a view on the samples
+    instead of decoding and re-exporting audio.
+"""
+
+from typing import Optional, Tuple
+import numpy as np
+
+MAX_AMPLITUDE = 32768  # Full scale of int16 audio, as used for dBFS by pydub
+
+
+def ms_to_frames(ms: np.ndarray | int, sample_rate: int) -> np.ndarray | int:
+    """
+    Converts milliseconds to frame positions the way pydub slices audio.
+    """
+    frames = np.asarray(ms) * (sample_rate / 1000.0)
+    return frames.astype(np.int64) if isinstance(frames, np.ndarray) and frames.ndim else int(frames)
+
+
+def find_speech_bounds(
+    samples: np.ndarray, sample_rate: int, channels: int = 1, silence_thresh: int = -40, min_silence_len: int = 500
+) -> Optional[Tuple[int, int]]:
+    """
+    Finds the start and end (in milliseconds) of the audio between the
+    leading and trailing silence.
+
+    Args:
+        samples (np.ndarray): The interleaved int16 samples.
+        sample_rate (int): The sample rate of the samples.
+        channels (int): The number of interleaved channels. Defaults to 1.
+        silence_thresh (int): The volume threshold (in dBFS) at or below
+            which a window is silent. Defaults to -40 dBFS.
+        min_silence_len (int): The window length (in milliseconds).
+            Defaults to 500 ms.
+
+    Returns:
+        Optional[Tuple[int, int]]: The start and end in milliseconds, or
+        None if the whole recording is silent.
+    """
+    num_frames = len(samples) // channels
+    duration_ms = round(1000 * num_frames / sample_rate)
+
+    if duration_ms < min_silence_len:
+        return 0, duration_ms
+
+    # Sum of squares of every window, from the cumulative sum over all samples
+    signal = samples[:num_frames * channels].astype(np.int64)
+    cumulative = np.zeros(len(signal) + 1, dtype=np.int64)
+    np.cumsum(signal * signal, out=cumulative[1:])
+
+    window_starts = np.arange(duration_ms - min_silence_len + 1)
+    start_frames = np.minimum(ms_to_frames(window_starts, sample_rate), num_frames)
+    end_frames = ms_to_frames(window_starts + min_silence_len, sample_rate)
+    # pydub pads a window that runs past the end (by rounding) with silence, which counts towards its RMS
+    counts = (end_frames - start_frames) * channels
+    sums = cumulative[np.minimum(end_frames, num_frames) * channels] - cumulative[start_frames * channels]
+
+    # The RMS is truncated to an integer, like audioop.rms (which pydub uses)
+    rms = np.floor(np.sqrt(sums / np.maximum(counts, 1)))
+    rms[counts == 0] = 0
+    silent_starts = np.flatnonzero(rms <= 10 ** (silence_thresh / 20) * MAX_AMPLITUDE)
+
+    if len(silent_starts) == 0:
+        return 0, duration_ms
+
+    # Silent windows belong to one silent range unless they are more than a window apart
+    breaks = np.flatnonzero(np.diff(silent_starts) > min_silence_len)
+    first_range = (silent_starts[0], silent_starts[breaks[0] if len(breaks) else -1] + min_silence_len)
+    last_range = (silent_starts[breaks[-1] + 1] if len(breaks) else silent_starts[0], silent_starts[-1] + min_silence_len)
+
+    if len(breaks) == 0 and first_range == (0, duration_ms):
+        return None
+
+    start_ms = int(first_range[1]) if first_range[0] == 0 else 0
+    end_ms = int(last_range[0]) if last_range[1] == duration_ms else duration_ms
+    return start_ms, end_ms
+
+
+def trim_silence(
+    samples: np.ndarray, sample_rate: int, channels: int = 1, silence_thresh: int = -40, min_silence_len: int = 500
+) -> Optional[np.ndarray]:
+    """
+    Removes the leading and trailing silence from a recording.
+
+    Args:
+        samples (np.ndarray): The interleaved int16 samples.
+        sample_rate (int): The sample rate of the samples.
+        channels (int): The number of interleaved channels. Defaults to 1.
+        silence_thresh (int): The volume threshold (in dBFS) at or below
+            which audio is silent. Defaults to -40 dBFS.
+        min_silence_len (int): The minimum duration (in milliseconds) of
+            silence to be trimmed. Defaults to 500 ms.
+
+    Returns:
+        Optional[np.ndarray]: A view on the samples without the leading and
+        trailing silence, or None if no speech is detected.
+    """
+    bounds = find_speech_bounds(samples, sample_rate, channels, silence_thresh, min_silence_len)
+    if bounds is None:
+        return None
+
+    start_frame = ms_to_frames(bounds[0], sample_rate)
+    end_frame = ms_to_frames(bounds[1], sample_rate)
+    return samples[start_frame * channels:end_frame * channels]
@@ -0,0 +1,122 @@
+"""
+File:     endpointing.py
+
+Description:
+    This module decides when a child has finished speaking. Instead of a
+    fixed 5 seconds of trailing silence, the hangover adapts to the
+    utterance: short after a brief answer such as "yes", longer once the
+    child has been speaking for a while and may be pausing mid-sentence.
+    Optionally, a partial transcript can end the recording early when the
+    caller's completeness check (e.g. the game's intent classifier) finds a
+    complete question or guess in it. A hard maximum length bounds every
+    recording.
+"""
+
+from typing import Callable, Optional
+
+NO_SPEECH_TIMEOUT = 5.0  # Seconds to wait for speech to start; kids might need time to think
+MIN_HANGOVER = 0.8  # Seconds of silence that end a brief answer
+MAX_HANGOVER = 2.5  # Seconds of silence that end a long utterance
+HANGOVER_GROWTH_PERIOD = 4.0  # Seconds of speech after which the hangover reaches its maximum
+MAX_UTTERANCE_SECONDS = 20.0
+
+
+class Endpointer:
+    """
+    Tracks speech and silence chunk by chunk and decides when to stop
+    recording. Time is measured in audio seconds (not wall-clock time), so
+    the decisions do not depend on how fast chunks are processed.
+
+    Args:
+        is_complete (Callable[[str], bool] | None): Checks whether a partial
+            transcript is a complete utterance. None disables early cuts.
+    """
+
+    def __init__(
+        self,
+        no_speech_timeout: float = NO_SPEECH_TIMEOUT,
+        min_hangover: float = MIN_HANGOVER,
+        max_hangover: float = MAX_HANGOVER,
+        max_utterance_seconds: float = MAX_UTTERANCE_SECONDS,
+        is_complete: Callable[[str], bool] | None = None
+    ):
+        self.no_speech_timeout = no_speech_timeout
+        self.min_hangover = min_hangover
+        self.max_hangover = max_hangover
+        self.max_utterance_seconds = max_utterance_seconds
+        self.is_complete = is_complete
+        self.elapsed = 0.0
+        self.speech_seconds = 0.0
+        self.silence_seconds = 0.0
+        self.partial_checked = False
+
+    @property
+    def speech_started(self) -> bool:
+        return self.speech_seconds > 0
+
+    def hangover(self) -> float:
+        """
+        Returns the silence needed to end the utterance, which grows from
+        min_hangover to max_hangover with the amount of speech so far.
+        """
+        growth = min(1.0, self.speech_seconds / HANGOVER_GROWTH_PERIOD)
+        return self.min_hangover + growth * (self.max_hangover - self.min_hangover)
+
+    def update(self, is_speech: bool, chunk_seconds: float) -> Optional[str]:
+        """
+        Processes one chunk.
+
+        Args:
+            is_speech (bool): Whether the chunk contains speech.
+            chunk_seconds (float): The duration of the chunk in seconds.
+
+        Returns:
+            Optional[str]: The reason to stop ('endpoint', 'no_speech' or
+            'max_length'), or None to keep recording.
+        """
+        self.elapsed += chunk_seconds
+
+        if is_speech:
+            self.speech_seconds += chunk_seconds
+            self.silence_seconds = 0.0
+            self.partial_checked = False
+        else:
+            self.silence_seconds += chunk_seconds
+
+        if self.elapsed >= self.max_utterance_seconds:
+            return "max_length"
+
+        if not self.speech_started:
+            return "no_speech" if self.elapsed >= self.no_speech_timeout else None
+
+        if self.silence_seconds >= self.hangover():
+            return "endpoint"
+
+        return None
+
+    def wants_partial_transcript(self) -> bool:
+        """
+        Returns True once per pause, when the silence is long enough that
+        the child may be done and checking a partial transcript could end
+        the recording before the full hangover.
+        """
+        return (
+            self.is_complete is not None
+            and self.speech_started
+            and not self.partial_checked
+            and self.silence_seconds >= self.min_hangover / 2
+        )
+
+    def check_partial_transcript(self, text: str) -> Optional[str]:
+        """
+        Ends the recording early if the partial transcript is complete.
+
+        Args:
+            text (str): The partial transcript.
+
+        Returns:
+            Optional[str]: 'early_cut' if the recording can stop, otherwise
+            None.
+        """
+        self.partial_checked = True
+        return "early_cut" if self.is_complete(text) else None
@@ -20,8 +20,9 @@ class MicUtil:
     microphone.
     """
 
-    def __init__(self):
-        self.p = pyaudio.PyAudio()
+    def __init__(self, audio_interface: pyaudio.PyAudio | None = None):
+        # Reuse an existing PortAudio instance if one is given
+        self.p = audio_interface if audio_interface is not None else pyaudio.PyAudio()
 
     def list_available_mics(self) -> List[Dict[str, int | str]]:
         """
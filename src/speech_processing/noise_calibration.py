@@ -0,0 +1,129 @@
+"""
+File:     noise_calibration.py
+
+Description:
+    This module adapts the speech detector to the room. A rolling estimator
+    tracks the ambient noise floor as a low percentile of recent chunk RMS
+    values, and the start and stop thresholds for speech are derived from it
+    (with hysteresis, so speech has to get clearly louder than the room to
+    start and only ends when it drops back towards it). The noise floor is
+    saved per microphone, so a new session starts from the last estimate.
+"""
+
+import json
+import os
+import time
+from collections import deque
+from typing import Optional
+import numpy as np
+from src.paths import DATA_FOLDER
+
+MIC_PROFILES_FILE = os.path.join(DATA_FOLDER, "mic_profiles.json")
+
+DEFAULT_NOISE_FLOOR = 300.0  # RMS of a quiet room (about -40 dBFS)
+NOISE_FLOOR_PERCENTILE = 20  # Low percentile, so words and robot speech barely move the estimate
+NOISE_WINDOW_CHUNKS = 400  # About 9 seconds of audio at 44.1 kHz with 1024-sample chunks
+START_RATIO = 3.0  # Speech starts about 10 dB above the noise floor
+STOP_RATIO = 2.0  # and stops again below about 6 dB above it
+MIN_START_THRESHOLD = 500.0
+MIN_STOP_THRESHOLD = 350.0
+
+
+def chunk_rms(samples: np.ndarray) -> float:
+    """
+    Computes the RMS of int16 samples in floating point (so -32768 cannot
+    overflow).
+    """
+    if len(samples) == 0:
+        return 0.0
+    signal = samples.astype(np.float64)
+    return float(np.sqrt(np.mean(signal * signal)))
+
+
+class NoiseFloorEstimator:
+    """
+    Tracks the noise floor over a rolling window of chunk RMS values and
+    derives the speech start and stop thresholds from it.
+    """
+
+    def __init__(self, initial_floor: float = DEFAULT_NOISE_FLOOR, window_chunks: int = NOISE_WINDOW_CHUNKS):
+        self.values = deque(maxlen=window_chunks)
+        self.initial_floor = initial_floor
+        self.cached_floor = initial_floor
+        self.updates_since_estimate = 0
+
+    def update(self, rms: float) -> None:
+        self.values.append(rms)
+        self.updates_since_estimate += 1
+
+    def noise_floor(self) -> float:
+        """
+        Returns the current noise floor estimate. The percentile is only
+        recomputed every few chunks, as the estimate changes slowly.
+        """
+        if not self.values:
+            return self.initial_floor
+
+        if self.updates_since_estimate >= 10 or self.cached_floor == self.initial_floor:
+            self.cached_floor = float(np.percentile(np.fromiter(self.values, dtype=np.float64), NOISE_FLOOR_PERCENTILE))
+            self.updates_since_estimate = 0
+
+        return self.cached_floor
+
+    def start_threshold(self) -> float:
+        return max(self.noise_floor() * START_RATIO, MIN_START_THRESHOLD)
+
+    def stop_threshold(self) -> float:
+        return max(self.noise_floor() * STOP_RATIO, MIN_STOP_THRESHOLD)
+
+    def is_speech(self, rms: float, in_speech: bool) -> bool:
+        """
+        Classifies a chunk as speech with hysteresis.
+
+        Args:
+            rms (float): The RMS of the chunk.
+            in_speech (bool): Whether the previous chunk was speech.
+
+        Returns:
+            bool: True if the chunk is speech.
+        """
+        return rms > (self.stop_threshold() if in_speech else self.start_threshold())
+
+
+def load_noise_floor(mic_name: str, path: str = MIC_PROFILES_FILE) -> Optional[float]:
+    """
+    Loads the saved noise floor of a microphone.
+
+    Args:
+        mic_name (str): The name of the microphone.
+        path (str): Path to the microphone profiles file.
+
+    Returns:
+        Optional[float]: The saved noise floor, or None if there is none.
+    """
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "r") as f:
+        profiles = json.load(f)
+
+    profile = profiles.get(mic_name)
+    return profile["noise_floor"] if profile else None
+
+
+def save_noise_floor(mic_name: str, noise_floor: float, path: str = MIC_PROFILES_FILE) -> None:
+    """
+    Saves the noise floor of a microphone to its profile.
+    """
+    profiles = {}
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            profiles = json.load(f)
+
+    profiles[mic_name] = {"noise_floor": noise_floor, "updated": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(profiles, f, indent=4)
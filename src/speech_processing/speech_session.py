@@ -9,14 +9,17 @@ Description:
     It ensures continuous prompting until valid speech is detected.
 """
 
-import os
-from typing import Generator, Optional
-from twisted.internet.defer import inlineCallbacks
+from typing import Callable, Generator, Optional
+from twisted.internet.defer import gatherResults, inlineCallbacks
+from twisted.internet.threads import deferToThread
+from src.clients import deferred_call
 from src.speech_processing.speech_to_text import SpeechToText
+from src.speech_processing.stt_backends import TranscriptionBackend
 from src.robot_movements.say_animated import say_animated
-from src.utils import generate_message_using_llm
+from src.utils import generate_message_deferred
 from src.language_feedback.language_assistant import LanguageAssistant
 from src.taboo_game.keywords_handler import KeywordsHandler
+from src.tracing import run_in_context, tracer
 
 
 class SpeechRecognitionSession:
@@ -25,25 +28,32 @@ class SpeechRecognitionSession:
     for input, detecting prolonged silence, and responding accordingly.
     """
 
-    def __init__(self, session, version):
+    def __init__(self, session, version, stt_backend: TranscriptionBackend | None = None,
+                 is_complete: Callable[[str], bool] | None = None):
         if version not in {"experiment", "control"}:
             raise ValueError(f"Invalid version: {version}. Must be 'experiment' or 'control'.")
 
         self.session = session
         self.version = version
         self.get_feedback = (self.version == "experiment")
-        self.processor = SpeechToText()
+        self.processor = SpeechToText(backend=stt_backend, is_complete=is_complete)
         self.keywords_handler = KeywordsHandler(session)
         self.praise_streak = 0
+        # Created once; the lexicon it uses is shared and memory-mapped
+        self.language_assistant = LanguageAssistant(self.session) if self.get_feedback else None
 
     @inlineCallbacks
     def validate_user_input(
         self, prompt_message: str, silence_message: str, language: str = "en"
     ) -> Generator[Optional[str], None, str]:
-        yield say_animated(self.session, prompt_message, language)
-
-        if self.get_feedback:
-            self.language_assistant = LanguageAssistant(self.session)
+        if self.processor.silence_threshold is None and prompt_message:
+            # The room is measured while the robot asks its question, so calibration adds no waiting time
+            yield gatherResults([
+                say_animated(self.session, prompt_message, language),
+                deferToThread(self.processor.calibrate_noise_floor)
+            ], consumeErrors=True)
+        else:
+            yield say_animated(self.session, prompt_message, language)
 
         while True:
             user_input = yield self.recognize_speech()
@@ -55,27 +65,29 @@ class SpeechRecognitionSession:
                         if self.praise_streak == 2:
                             self.praise_streak = 0
                         if self.praise_streak == 0:
-                            feedback_message = generate_message_using_llm(
+                            feedback_message = yield generate_message_deferred(
                                 "The child attempted to speak English."
                                 "The child is a 12-year-old Dutch speaker learning English. "
                                 "Since they are doing well, provide a short, positive praise message in English. "
-                                "Generate only one sentence."
+                                "Generate only one sentence.",
+                                emphasis=True
                             )
                             yield say_animated(self.session, feedback_message, language="en")
                         self.praise_streak += 1
                     else:
                         self.praise_streak = 0
                     
-                        feedback_message = generate_message_using_llm(
+                        feedback_message = yield generate_message_deferred(
                             "The child attempted to speak English, but there's room for improvement. "
                             "They are a 12-year-old Dutch speaker learning English. "
                             "Encourage them, let them know they can improve, and mention you will help them. "
                             "Keep your response short, simple, and supportive, in English."
-                            "Generate only one sentence."
+                            "Generate only one sentence.",
+                            emphasis=True
                         )
                         yield say_animated(self.session, feedback_message, language="en")
 
-                        example_sentence = self.language_assistant.get_example_phrase(user_input)
+                        example_sentence = yield deferred_call("openai", self.language_assistant.get_example_phrase, user_input)
                         user_input = yield self.validate_repeated_input(example_sentence)
 
                 return user_input
@@ -114,17 +126,16 @@ class SpeechRecognitionSession:
 
     @inlineCallbacks
     def recognize_speech(self) -> Generator[None, None, Optional[str]]:
-        recorded_audio_path = yield self.processor.record_audio()
-
-        if recorded_audio_path:
-            transcription_result = yield self.processor.process_audio(recorded_audio_path, self.version)
-            if transcription_result:
-                print("Transcription:", transcription_result)
-                if os.path.exists(recorded_audio_path):
-                    os.remove(recorded_audio_path)
-                return transcription_result
-            
-            if os.path.exists(recorded_audio_path):
-                os.remove(recorded_audio_path)
-
-        return None
+        with tracer.span("recognize_speech"):
+            # Recording and transcription block, so they run off the reactor thread
+            with tracer.span("stt.record"):
+                recorded_samples = yield deferToThread(run_in_context(self.processor.record_audio))
+
+            if recorded_samples is not None:
+                with tracer.span("stt.process"):
+                    transcription_result = yield deferred_call("transcription", self.processor.process_audio, recorded_samples, self.version)
+                if transcription_result:
+                    print("Transcription:", transcription_result)
+                    return transcription_result
+
+            return None
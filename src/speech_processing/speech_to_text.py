@@ -1,147 +1,203 @@
-import os
-import wave
 import time
-from typing import Any, Dict, Generator, Optional, Tuple
-import pyaudio
+from typing import Any, Callable, Dict, Optional
 import numpy as np
-from openai import OpenAI
-from pydub import AudioSegment
-from pydub.silence import detect_nonsilent
-from src.speech_processing.mic_util import MicUtil
-
-
-API_KEY = os.getenv("OPENAI_API_KEY")
-if not API_KEY:
-    raise ValueError("OPENAI_API_KEY is not set. Please set it in your environment variables.")
-
-client = OpenAI(api_key=API_KEY)
+from src.speech_processing.audio_engine import get_audio_engine
+from src.speech_processing.audio_encoding import to_mono
+from src.speech_processing.audio_trim import trim_silence
+from src.speech_processing.endpointing import MAX_UTTERANCE_SECONDS, Endpointer
+from src.speech_processing.noise_calibration import (
+    DEFAULT_NOISE_FLOOR, NoiseFloorEstimator, chunk_rms, load_noise_floor, save_noise_floor
+)
+from src.speech_processing.stt_backends import CloudBackend, TranscriptionBackend
+from src.tracing import SPEECH_END_EVENT, tracer
 
 
 class SpeechToText:
     def __init__(self,
-                 silence_threshold: int = 2500,
+                 silence_threshold: int | None = None,
                  sample_rate: int = 44100,
                  channels: int = 1,
                  chunk_size: int = 1024,
-                 device_index: int | None = None):
-        self.silence_threshold = silence_threshold  # Depends on how noisy the room is
+                 device_index: int | None = None,
+                 upload_codec: str = "flac",
+                 upload_sample_rate: int = 16000,
+                 upload_bitrate: str = "24k",
+                 max_utterance_seconds: float = MAX_UTTERANCE_SECONDS,
+                 partial_transcriber: Callable[[np.ndarray], str] | None = None,
+                 is_complete: Callable[[str], bool] | None = None,
+                 backend: TranscriptionBackend | None = None):
+        # A fixed peak amplitude threshold; None derives the thresholds from the measured noise floor
+        self.silence_threshold = silence_threshold
+        self.noise_estimator = None
         self.sample_rate = sample_rate
         self.channels = channels
         self.chunk_size = chunk_size
         self.device_index = device_index
-        self.mic_util = MicUtil()
+        # The upload settings only apply to the default cloud backend; set sample_rate to
+        # upload_sample_rate to capture natively at that rate
+        self.backend = backend if backend is not None else CloudBackend(
+            upload_codec=upload_codec, upload_sample_rate=upload_sample_rate, upload_bitrate=upload_bitrate
+        )
+        self.max_utterance_seconds = max_utterance_seconds
+        # Optional fast transcriber for partial audio; lets the recording stop as soon as
+        # the child has said a complete question or guess, as judged by is_complete
+        self.partial_transcriber = partial_transcriber
+        self.is_complete = is_complete
+        self.capture_buffer = None
+        # PortAudio, the microphone and the input stream are reused across turns
+        self.audio_engine = get_audio_engine(sample_rate, channels, chunk_size, device_index)
 
     def choose_mic(self) -> Dict[str, int | str]:
         """
-        Selects the microphone device based on the provided index.
+        Selects the microphone device based on the provided index. The device
+        is resolved once by the audio engine and cached.
 
         Returns:
             Dict[str, int | str]: The microphone device info.
         """
-        return self.mic_util.choose_mic_device(self.device_index)
+        return self.audio_engine.resolve_device()
+
+    def get_noise_estimator(self) -> NoiseFloorEstimator:
+        """
+        Returns the noise floor estimator, starting from the noise floor saved
+        for the chosen microphone (if any).
+        """
+        if self.noise_estimator is None:
+            saved_floor = load_noise_floor(self.choose_mic()['name'])
+            self.noise_estimator = NoiseFloorEstimator(saved_floor if saved_floor is not None else DEFAULT_NOISE_FLOOR)
+        return self.noise_estimator
+
+    def save_noise_profile(self) -> None:
+        if self.noise_estimator is not None:
+            save_noise_floor(self.choose_mic()['name'], self.noise_estimator.noise_floor())
 
-    def setup_audio_stream(self, mic_info: Dict[str, int | str]) -> Tuple[pyaudio.PyAudio, pyaudio.Stream]:
+    def is_speech_chunk(self, audio_data: np.ndarray, in_speech: bool) -> bool:
         """
-        Sets up the audio stream for recording.
+        Decides whether a chunk contains speech. Chunks that are not speech
+        keep the noise floor estimate up to date.
 
         Args:
-            mic_info (Dict[str, int | str]): Information about the selected
-            microphone.
+            audio_data (np.ndarray): The int16 samples of the chunk.
+            in_speech (bool): Whether the previous chunk was speech.
 
         Returns:
-            Tuple[pyaudio.PyAudio, pyaudio.Stream]: A tuple containing the
-            audio interface (PyAudio) and the audio stream for recording.
+            bool: True if the chunk contains speech.
         """
-        audio_interface = pyaudio.PyAudio()
+        if len(audio_data) == 0:
+            return False
 
-        if self.channels > mic_info['input_channels']:
-            print(
-                f"Requested {self.channels} channels, but the mic supports only {mic_info['input_channels']} channels. "
-                f"Using {mic_info['input_channels']} channels instead."
-            )
-            self.channels = mic_info['input_channels']
+        if self.silence_threshold is not None:
+            # int32 avoids the overflow of abs(-32768) in int16
+            return np.max(np.abs(audio_data.astype(np.int32))) > self.silence_threshold
 
-        stream = audio_interface.open(format=pyaudio.paInt16, channels=self.channels, rate=self.sample_rate, input=True,
-                                      input_device_index=mic_info['index'], frames_per_buffer=self.chunk_size)
-        return audio_interface, stream
+        estimator = self.get_noise_estimator()
+        rms = chunk_rms(audio_data)
+        is_speech = estimator.is_speech(rms, in_speech)
+        if not is_speech:
+            estimator.update(rms)
+        return is_speech
 
-    def save_audio(self, frames: list, output_filename: str) -> Optional[str]:
+    def calibrate_noise_floor(self, duration: float = 1.5) -> float:
         """
-        Saves the recorded frames to an audio file.
+        Measures the room while nobody is expected to talk (for example while
+        the robot speaks or between turns) and saves the noise floor to the
+        microphone profile. Blocks for the given duration, so call it off the
+        reactor thread.
 
         Args:
-            frames (list): The audio frames to be saved.
-            output_filename (str): The name of the output file to save the
-                audio.
+            duration (float): Seconds of audio to measure. Defaults to 1.5.
 
         Returns:
-            Optional[str]: The path to the saved audio file, or None if the
-            file is empty.
+            float: The updated noise floor.
         """
-        audio_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), output_filename)
-        with wave.open(audio_path, 'wb') as wf:
-            wf.setnchannels(self.channels)
-            wf.setsampwidth(pyaudio.PyAudio().get_sample_size(pyaudio.paInt16))
-            wf.setframerate(self.sample_rate)
-            wf.writeframes(b''.join(frames))
+        estimator = self.get_noise_estimator()
+        self.audio_engine.resume()
 
-        if os.path.getsize(audio_path) == 0:
-            print("No audio was recorded. Skipping transcription.")
-            return None
+        chunks = max(1, int(duration * self.sample_rate / self.chunk_size))
+        for _ in range(chunks):
+            estimator.update(chunk_rms(np.frombuffer(self.audio_engine.read_chunk(), dtype=np.int16)))
+
+        self.audio_engine.pause()
+        self.save_noise_profile()
 
-        print(f"Audio recorded and saved to {audio_path}")
-        return audio_path
+        noise_floor = estimator.noise_floor()
+        print(f"Noise floor: {noise_floor:.0f} RMS (speech starts above {estimator.start_threshold():.0f})")
+        return noise_floor
 
-    def record_audio(self, output_filename: str = "recorded_speech.wav") -> Optional[str]:
+    def get_capture_buffer(self) -> np.ndarray:
         """
-        Records audio from the microphone and saves it to a file.
+        Returns the capture buffer, allocated once for the maximum utterance
+        length so memory stays bounded however noisy the room is.
+        """
+        capacity = int(self.sample_rate * self.max_utterance_seconds) * self.channels + self.chunk_size * self.channels
+        if self.capture_buffer is None or len(self.capture_buffer) != capacity:
+            self.capture_buffer = np.empty(capacity, dtype=np.int16)
+        return self.capture_buffer
 
-        Args:
-            output_filename (str): The name of the output file to save the
-            audio.
+    def record_audio(self) -> Optional[np.ndarray]:
+        """
+        Records audio from the microphone into a preallocated buffer, without
+        writing anything to disk, until the endpointer decides the child has
+        finished speaking.
 
         Returns:
-            Optional[str]: The path to the saved audio file, or None if no
-            audio was recorded.
+            Optional[np.ndarray]: The recorded interleaved int16 samples (a
+            view on the capture buffer, valid until the next recording), or
+            None if no audio was recorded.
         """
-        mic_info = self.choose_mic()
-        audio_interface, stream = self.setup_audio_stream(mic_info)
+        self.choose_mic()
+        self.channels = self.audio_engine.channels
+        self.audio_engine.resume()
 
-        frames = []
-        start_time = time.time()
-        last_sound_time = start_time
+        buffer = self.get_capture_buffer()
+        length = 0
+        endpointer = Endpointer(max_utterance_seconds=self.max_utterance_seconds, is_complete=self.is_complete)
+        is_speech = False
 
         while True:
             print("I am recording")
-            data = stream.read(self.chunk_size)
-            frames.append(data)
+            data = self.audio_engine.read_chunk()
 
-            audio_data = np.frombuffer(data, dtype=np.int16)
-            amplitude = np.max(np.abs(audio_data))
+            audio_data = np.frombuffer(data, dtype=np.int16)[:len(buffer) - length]
+            buffer[length:length + len(audio_data)] = audio_data
+            length += len(audio_data)
 
-            if amplitude > self.silence_threshold:
+            is_speech = self.is_speech_chunk(audio_data, is_speech)
+            if is_speech:
                 print("Speech detected.")
-                last_sound_time = time.time()
-            elif time.time() - last_sound_time > 5:  # Kids might speak slower, especially when trying to speak English
-                print("No speech detected, stopping recording.")
+
+            chunk_seconds = len(audio_data) / (self.sample_rate * self.channels)
+            stop_reason = endpointer.update(is_speech, chunk_seconds)
+
+            if stop_reason is None and self.partial_transcriber is not None and endpointer.wants_partial_transcript():
+                stop_reason = endpointer.check_partial_transcript(self.partial_transcriber(buffer[:length]))
+
+            if stop_reason is not None or length == len(buffer):
+                print(f"Stopping recording ({stop_reason or 'max_length'}).")
                 break
 
-        stream.stop_stream()
-        stream.close()
-        audio_interface.terminate()
+        self.audio_engine.pause()
+        self.save_noise_profile()
+
+        if endpointer.speech_started:
+            # The child stopped speaking when the trailing silence began
+            tracer.event(SPEECH_END_EVENT, timestamp=time.time() - endpointer.silence_seconds, stop_reason=stop_reason)
+
+        if length == 0:
+            print("No audio was recorded. Skipping transcription.")
+            return None
 
-        audio_path = self.save_audio(frames, output_filename)
-        return audio_path
+        print(f"Audio recorded: {length / (self.sample_rate * self.channels):.1f} seconds")
+        return buffer[:length]
 
-    def trim_silence(self, audio_path: str, silence_thresh: int = -40, min_silence_len: int = 500) -> Optional[str]:
+    def trim_silence(self, samples: np.ndarray, silence_thresh: int = -40, min_silence_len: int = 500) -> Optional[np.ndarray]:
         """
-        Removes silent segments from the beginning and end of an audio file.
-        Without this function, the Whisper transcription transcribes random
-        words to silence.
+        Removes silent segments from the beginning and end of the recorded
+        audio. Without this function, the Whisper transcription transcribes
+        random words to silence.
 
         Args:
-            audio_path (str): Path to the WAV audio file that needs silence
-                trimming.
+            samples (np.ndarray): The interleaved int16 samples to trim.
             silence_thresh (int, optional): The volume threshold (in dBFS)
                 below which audio is considered silence. Defaults to -40 dBFS.
             min_silence_len (int, optional): The minimum duration
@@ -149,39 +205,34 @@ class SpeechToText:
                 Defaults to 500 ms.
 
         Returns:
-            Optional[str]: The path to the trimmed audio file if successful,
-            otherwise None if no speech is detected.
+            Optional[np.ndarray]: A view on the samples without the leading
+            and trailing silence, or None if no speech is detected.
         """
-        audio = AudioSegment.from_wav(audio_path)
-        non_silent_chunks = detect_nonsilent(audio, min_silence_len=min_silence_len, silence_thresh=silence_thresh)
+        return trim_silence(samples, self.sample_rate, self.channels, silence_thresh, min_silence_len)
 
-        if not non_silent_chunks:
-            return None
-
-        start_trim = non_silent_chunks[0][0]
-        end_trim = non_silent_chunks[-1][1]
+    def process_audio(self, samples: np.ndarray, version: str) -> Dict[str, Any] | str:
+        """
+        Trims the recorded audio and transcribes it with the configured
+        backend.
 
-        trimmed_audio = audio[start_trim:end_trim]
-        trimmed_audio.export(audio_path, format="wav")
-        return audio_path
+        Args:
+            samples (np.ndarray): The recorded interleaved int16 samples.
+            version (str): The game version ('experiment' or 'control').
 
-    def process_audio(self, audio_path: str, version: str) -> Generator[Dict[str, Any], None, Dict[str, Any]]:
-        trimmed_audio_path = self.trim_silence(audio_path)
+        Returns:
+            Dict[str, Any] | str: The transcription, or an empty dictionary
+            if there was no speech or the transcription failed.
+        """
+        with tracer.span("stt.trim"):
+            trimmed_samples = self.trim_silence(samples)
         result = {}
 
-        if trimmed_audio_path is None:
+        if trimmed_samples is None:
             return result
 
         try:
-            with open(audio_path, "rb") as audio_file:
-                transcript = client.audio.transcriptions.create(
-                    model="gpt-4o-transcribe",
-                    file=audio_file,
-                    response_format="text",
-                    prompt = (
-                        "The following conversation is of a 12 year old Dutch child trying to learn English."
-                    )
-                )
+            with tracer.span("stt.transcribe", backend=type(self.backend).__name__):
+                transcript = self.backend.transcribe(to_mono(trimmed_samples, self.channels), self.sample_rate)
 
             if transcript:
                 result = transcript
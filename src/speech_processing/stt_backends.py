@@ -0,0 +1,213 @@
+"""
+File:     stt_backends.py
+
+Description:
+    This module provides interchangeable speech-to-text backends for
+    SpeechToText: the OpenAI transcription API, a local Whisper model of a
+    configurable size (for fully offline sessions) and a stub that returns
+    scripted transcripts. Backends that need a model load it in a background
+    thread at start-up, so the first turn does not wait for it unless the
+    model is still loading. Use create_backend to select one by name.
+"""
+
+import threading
+import time
+from itertools import cycle
+from typing import Any, Dict, Iterable
+import numpy as np
+from src.speech_processing.audio_encoding import encode_audio, resample
+
+TRANSCRIPTION_PROMPT = "The following conversation is of a 12 year old Dutch child trying to learn English."
+WHISPER_SAMPLE_RATE = 16000
+
+
+class TranscriptionBackend:
+    """
+    The interface of a speech-to-text backend. Subclasses implement
+    transcribe and, if they need a model, load.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self.ready = threading.Event()
+        self.load_lock = threading.Lock()
+        self.load_error = None
+
+    def load(self) -> None:
+        """
+        Loads whatever the backend needs before it can transcribe. Called once,
+        from a background thread if preload is used.
+        """
+
+    def preload(self) -> None:
+        """
+        Starts loading the backend in a background thread and returns
+        immediately.
+        """
+        threading.Thread(target=self.ensure_loaded, name=f"{self.name}-stt-loader", daemon=True).start()
+
+    def ensure_loaded(self) -> None:
+        """
+        Loads the backend if that has not happened yet, or waits until the
+        background load has finished.
+
+        Raises:
+            RuntimeError: If loading the backend failed.
+        """
+        with self.load_lock:
+            if not self.ready.is_set():
+                try:
+                    self.load()
+                except Exception as e:
+                    self.load_error = e
+                    print(f"Loading the {self.name} speech-to-text backend failed: {e}")
+                self.ready.set()
+
+        if self.load_error is not None:
+            raise RuntimeError(f"The {self.name} speech-to-text backend is unavailable.") from self.load_error
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> str:
+        """
+        Transcribes mono int16 audio.
+
+        Args:
+            samples (np.ndarray): The mono int16 samples.
+            sample_rate (int): The sample rate of the samples.
+
+        Returns:
+            str: The transcript, or an empty string if nothing was recognized.
+        """
+        raise NotImplementedError
+
+
+class CloudBackend(TranscriptionBackend):
+    """
+    Transcribes with the OpenAI transcription API, uploading compact
+    FLAC/Opus audio straight from memory.
+    """
+
+    name = "cloud"
+
+    def __init__(self, model: str = "gpt-4o-transcribe", upload_codec: str = "flac",
+                 upload_sample_rate: int = 16000, upload_bitrate: str = "24k"):
+        super().__init__()
+        self.model = model
+        self.upload_codec = upload_codec  # 'flac', 'opus' or 'wav'
+        self.upload_sample_rate = upload_sample_rate
+        self.upload_bitrate = upload_bitrate  # Only used for Opus
+        self.upload_stats = []
+
+    def load(self) -> None:
+        # Imported here, so the offline backends load without the OpenAI client and API key
+        from src.clients import get_openai_client
+
+        get_openai_client()
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> str:
+        from src.clients import OPENAI_REQUEST_TIMEOUT, get_openai_client, get_request_timeout
+
+        resampled = resample(samples, sample_rate, self.upload_sample_rate)
+        upload_file = encode_audio(resampled, self.upload_sample_rate, codec=self.upload_codec, bitrate=self.upload_bitrate)
+        upload_start = time.time()
+
+        transcript = get_openai_client().audio.transcriptions.create(
+            model=self.model,
+            file=upload_file,
+            timeout=get_request_timeout(OPENAI_REQUEST_TIMEOUT),
+            response_format="text",
+            prompt=TRANSCRIPTION_PROMPT
+        )
+
+        stats = {
+            "codec": self.upload_codec,
+            "sample_rate": self.upload_sample_rate,
+            "raw_bytes": samples.nbytes,
+            "bytes_sent": upload_file.getbuffer().nbytes,
+            "upload_seconds": time.time() - upload_start,  # Includes the transcription itself
+        }
+        self.upload_stats.append(stats)
+        print(
+            f"Uploaded {stats['bytes_sent'] / 1000:.1f} kB ({stats['codec']}, {stats['sample_rate']} Hz, "
+            f"raw {stats['raw_bytes'] / 1000:.1f} kB) in {stats['upload_seconds']:.2f} s"
+        )
+
+        return transcript or ""
+
+
+class LocalWhisperBackend(TranscriptionBackend):
+    """
+    Transcribes offline with a local Whisper model. Models are shared per
+    size across instances, so each is only loaded once per process.
+    """
+
+    name = "local_whisper"
+    _shared_models: Dict[str, Any] = {}
+
+    def __init__(self, model_size: str = "base", language: str | None = None):
+        super().__init__()
+        self.model_size = model_size  # 'tiny', 'base', 'small', 'medium' or 'large'
+        self.language = language  # None lets Whisper detect the language
+        self.model = None
+
+    def load(self) -> None:
+        if self.model_size not in LocalWhisperBackend._shared_models:
+            import whisper  # Only needed offline; importing it pulls in torch
+
+            print(f"Whisper model '{self.model_size}' loading...")
+            LocalWhisperBackend._shared_models[self.model_size] = whisper.load_model(self.model_size)
+            print(f"Whisper model '{self.model_size}' loaded successfully!")
+
+        self.model = LocalWhisperBackend._shared_models[self.model_size]
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> str:
+        self.ensure_loaded()
+
+        # Whisper takes float32 audio in [-1, 1] at 16 kHz
+        audio = resample(samples, sample_rate, WHISPER_SAMPLE_RATE).astype(np.float32) / 32768.0
+        result = self.model.transcribe(audio, language=self.language)
+        return result.get("text", "").strip()
+
+
+class StubBackend(TranscriptionBackend):
+    """
+    Returns scripted transcripts in turn without looking at the audio, for
+    running the game without a microphone model or network.
+    """
+
+    name = "stub"
+
+    def __init__(self, transcripts: Iterable[str] = ("yes",)):
+        super().__init__()
+        self.transcripts = cycle(list(transcripts))
+        self.ready.set()
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> str:
+        return next(self.transcripts)
+
+
+STT_BACKENDS = {
+    CloudBackend.name: CloudBackend,
+    LocalWhisperBackend.name: LocalWhisperBackend,
+    StubBackend.name: StubBackend,
+}
+
+
+def create_backend(name: str = "cloud", **options) -> TranscriptionBackend:
+    """
+    Creates a speech-to-text backend by name.
+
+    Args:
+        name (str): One of 'cloud', 'local_whisper' or 'stub'. Defaults to
+            'cloud'.
+        **options: Keyword arguments for the backend's constructor.
+
+    Returns:
+        TranscriptionBackend: The backend.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    if name not in STT_BACKENDS:
+        raise ValueError(f"Invalid speech-to-text backend: {name}. Must be one of {list(STT_BACKENDS)}.")
+    return STT_BACKENDS[name](**options)
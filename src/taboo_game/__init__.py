@@ -1,3 +1,4 @@
 from .keywords_handler import KeywordsHandler
 from .taboo_game import TabooGame
 from .llm_interface import LLMGameHelper
+from .intent_classifier import IntentClassifier
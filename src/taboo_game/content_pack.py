@@ -0,0 +1,206 @@
+"""
+File:     content_pack.py
+
+Description:
+    This module provides a precomputed content pack for the taboo game. The
+    target words in words.json are fixed, so the hints, explanations and
+    answers to common questions about them can be generated and moderated
+    once, offline, instead of live in every round. LLMGameHelper serves from
+    the pack and only falls back to live generation when the pack has no
+    entry. A pack built for a different words.json is ignored.
+
+    Build the pack (requires OPENAI_API_KEY) with:
+        python -m src.taboo_game.content_pack [--words words.json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Dict, List, Optional
+from src.paths import WORDS_FILE
+
+CONTENT_PACK_FORMAT_VERSION = 1
+DEFAULT_CONTENT_PACK_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), "content_pack.json")
+
+HINTS_PER_WORD = 5
+EXPLANATIONS_PER_WORD = 2
+
+# Yes/no questions children commonly ask about classroom objects
+COMMON_QUESTIONS = [
+    "Is it big?", "Is it small?", "Is it heavy?", "Is it soft?", "Is it sharp?", "Is it round?",
+    "Is it colorful?", "Is it alive?", "Is it an animal?", "Is it food?", "Can you eat it?",
+    "Is it made of wood?", "Is it made of plastic?", "Is it made of metal?", "Is it made of paper?",
+    "Can you write with it?", "Can you draw with it?", "Can you cut with it?", "Can you sit on it?",
+    "Can you carry it?", "Can you hold it in your hand?", "Does it fit in a bag?", "Is it used in school?",
+    "Can you find it in a classroom?", "Is it found at home?", "Is it a tool?", "Is it furniture?",
+    "Does it use electricity?", "Does it have buttons?", "Does it have legs?", "Does it make noise?",
+    "Is it used for math?", "Is it used for art?", "Does every student have one?", "Do you put things in it?"
+]
+
+# Words that do not change the meaning of a question about the secret word
+QUESTION_FILLER_WORDS = {"a", "an", "the", "it", "this", "that", "secret", "word", "thing", "object", "please", "um", "uh"}
+QUESTION_TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+
+def normalize_question(question: str) -> str:
+    """
+    Normalizes a question for lookup, so that e.g. "Is it big?" and "is the
+    secret word big" map to the same key.
+    """
+    tokens = QUESTION_TOKEN_PATTERN.findall(question.lower().replace("’", "'"))
+    return " ".join(token for token in tokens if token not in QUESTION_FILLER_WORDS)
+
+
+def hash_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class ContentPack:
+    """
+    Serves precomputed hints, explanations and answers per secret word.
+    Hints and explanations are handed out in rotation, so repeated requests
+    in one session do not repeat the same text.
+    """
+
+    def __init__(self, data: Dict):
+        self.data = data
+        self.words = data.get("words", {})
+        self.rotation = {}
+        self.answer_polarities = {
+            entry["answer"]: entry["polarity"]
+            for word_entry in self.words.values()
+            for entry in word_entry.get("answers", {}).values()
+        }
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_CONTENT_PACK_PATH, words_file: str = WORDS_FILE) -> Optional["ContentPack"]:
+        """
+        Loads a content pack from disk.
+
+        Args:
+            path (str): Path to the content pack JSON file.
+            words_file (str): The words file the pack must have been built
+                from. Defaults to the project's words.json.
+
+        Returns:
+            Optional[ContentPack]: The content pack, or None if the file does
+            not exist, was built in an incompatible format or for a different
+            words file.
+        """
+        if not os.path.exists(path):
+            return None
+
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        if data.get("format_version") != CONTENT_PACK_FORMAT_VERSION:
+            print(f"Ignoring content pack {path}: format version {data.get('format_version')} is not supported.")
+            return None
+
+        if data.get("words_file_sha256") != hash_file(words_file):
+            print(f"Ignoring content pack {path}: it was built for a different {os.path.basename(words_file)}. "
+                  "Rebuild it with python -m src.taboo_game.content_pack.")
+            return None
+
+        print(f"Content pack loaded: version {data.get('version')} with {len(data.get('words', {}))} words.")
+        return cls(data)
+
+    def next_item(self, secret_word: str, kind: str) -> Optional[str]:
+        items = self.words.get(secret_word.lower(), {}).get(kind, [])
+        if not items:
+            return None
+
+        index = self.rotation.get((secret_word.lower(), kind), 0)
+        self.rotation[(secret_word.lower(), kind)] = index + 1
+        return items[index % len(items)]
+
+    def get_hint(self, secret_word: str) -> Optional[str]:
+        return self.next_item(secret_word, "hints")
+
+    def get_explanation(self, secret_word: str) -> Optional[str]:
+        return self.next_item(secret_word, "explanations")
+
+    def get_answer(self, secret_word: str, question: str) -> Optional[Dict[str, str]]:
+        """
+        Looks up the precomputed answer to a question about the secret word.
+
+        Args:
+            secret_word (str): Secret word in the game.
+            question (str): User's question.
+
+        Returns:
+            Optional[Dict[str, str]]: The 'answer' and its 'polarity' ('yes'
+            or 'no'), or None if the question is not in the pack.
+        """
+        answers = self.words.get(secret_word.lower(), {}).get("answers", {})
+        return answers.get(normalize_question(question))
+
+    def get_answer_polarity(self, answer: str) -> Optional[str]:
+        return self.answer_polarities.get(answer)
+
+
+def build_content_pack(words_file: str, output_path: str, version: str) -> Dict:
+    """
+    Generates and moderates the content for every word in the words file and
+    writes the content pack. All text goes through generate_message_using_llm,
+    so it passes the same profanity screening as live responses.
+
+    Args:
+        words_file (str): Path to words.json.
+        output_path (str): Path of the content pack to write.
+        version (str): Version label stored in the pack.
+
+    Returns:
+        Dict: The content pack data.
+    """
+    from src.taboo_game.llm_interface import LLMGameHelper
+
+    game_helper = LLMGameHelper(use_content_pack=False)
+
+    with open(words_file, encoding="utf-8") as f:
+        words = json.load(f)
+
+    pack = {
+        "format_version": CONTENT_PACK_FORMAT_VERSION,
+        "version": version,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "words_file_sha256": hash_file(words_file),
+        "words": {}
+    }
+
+    for secret_word in words:
+        print(f"Generating content for '{secret_word}'...")
+        hints = unique([game_helper.generate_hint(secret_word) for _ in range(HINTS_PER_WORD)])
+        explanations = unique([game_helper.generate_secret_word_explanation(secret_word) for _ in range(EXPLANATIONS_PER_WORD)])
+
+        answers = {}
+        for question in COMMON_QUESTIONS:
+            answer = game_helper.process_user_question(secret_word, question)
+            polarity = game_helper.recognize_yes_or_no(answer)
+            answers[normalize_question(question)] = {"question": question, "answer": answer, "polarity": polarity}
+
+        pack["words"][secret_word.lower()] = {"hints": hints, "explanations": explanations, "answers": answers}
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(pack, f, indent=4, ensure_ascii=False)
+
+    print(f"Content pack with {len(pack['words'])} words written to {output_path}")
+    return pack
+
+
+def unique(items: List[str]) -> List[str]:
+    return list(dict.fromkeys(items))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the content pack for the words in words.json.")
+    parser.add_argument("--words", default=WORDS_FILE, help="Path to the words file.")
+    parser.add_argument("--output", default=DEFAULT_CONTENT_PACK_PATH, help="Path of the content pack to write.")
+    parser.add_argument("--version", default=time.strftime("%Y%m%d"), help="Version label of the content pack.")
+    args = parser.parse_args()
+
+    build_content_pack(args.words, args.output, args.version)
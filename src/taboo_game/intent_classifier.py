@@ -0,0 +1,299 @@
+"""
+File:     intent_classifier.py
+
+Description:
+    This module provides a local fast-path intent classifier for the taboo
+    game. It decides whether an utterance means 'yes' or 'no', whether the
+    child is asking for a hint, and whether an utterance is a question or a
+    guess. It combines English/Dutch token rules with a small hand-weighted
+    logistic model, and only answers when its confidence is above a
+    threshold so that unclear inputs can still be sent to the LLM.
+"""
+
+import json
+import math
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.paths import WORDS_FILE
+
+FAST_PATH_CONFIDENCE_THRESHOLD = 0.8  # Below this confidence, the LLM is asked instead
+COMPLETE_UTTERANCE_CONFIDENCE = 0.9  # Cutting a child off is worse than waiting, so early cuts need more
+
+YES_WORDS = {
+    "yes", "yeah", "yea", "yep", "yup", "sure", "okay", "ok", "alright", "please", "definitely", "absolutely",
+    "correct", "true", "ja", "jawel", "jazeker", "jep", "graag", "tuurlijk", "natuurlijk", "oké",
+    "prima", "goed", "zeker", "klopt", "inderdaad"
+}
+NO_WORDS = {
+    "no", "nope", "nah", "not", "never", "don't", "doesn't", "isn't", "aren't", "can't", "won't", "wrong",
+    "false", "nee", "neen", "niet", "nooit", "geen"
+}
+
+HINT_WORDS = {"hint", "hints", "clue", "clues", "tip", "tips", "aanwijzing", "aanwijzingen"}
+HELP_WORDS = {"help", "stuck", "hulp", "helpen", "vast"}  # Weaker cues, e.g. "does it help you write?"
+HINT_PHRASES = [
+    "i don't know", "i do not know", "no idea", "give me a", "can you help", "ik weet het niet",
+    "weet ik niet", "geen idee", "kun je me helpen", "kan je me helpen"
+]
+
+QUESTION_START_WORDS = {
+    # English auxiliary verbs and question words
+    "is", "are", "am", "was", "were", "can", "could", "do", "does", "did", "has", "have", "had", "will",
+    "would", "should", "may", "might", "what", "where", "how", "why", "who", "which", "when",
+    # Dutch auxiliary verbs and question words
+    "zijn", "kan", "kun", "kunnen", "heeft", "hebben", "doe", "doet", "wordt", "mag", "moet", "gebruik",
+    "gebruiken", "waar", "wat", "hoe", "waarom", "wie", "welke", "wanneer", "ben", "zit"
+}
+GUESS_PHRASES = [
+    "i think", "i guess", "my guess", "the word is", "the answer is", "it's a", "it is a", "it's an",
+    "it is an", "ik denk", "ik gok", "het woord is", "het is een"
+]
+ARTICLES = {"a", "an", "the", "een", "de", "het"}
+# "is it a tool?" is a yes/no question, "is it a pencil?" a guess; only the noun tells them apart
+NAMED_OBJECT_SCORE = 5.0
+UNKNOWN_OBJECT_CONFIDENCE = 0.6  # Below the threshold, so the LLM decides
+
+TOKEN_PATTERN = re.compile(r"[a-zà-ÿ]+(?:'[a-z]+)?")
+
+
+def sigmoid(score: float) -> float:
+    return 1 / (1 + math.exp(-score))
+
+
+def load_known_words(path: str = WORDS_FILE) -> List[str]:
+    """
+    Loads the target words of the game, or an empty list if the words file
+    does not exist.
+    """
+    if not os.path.exists(path):
+        return []
+
+    with open(path, encoding="utf-8") as f:
+        return list(json.load(f))
+
+
+class IntentClassifier:
+    """
+    Classifies short child utterances locally. Each prediction returns a
+    label together with a confidence; `predict` only returns the label when
+    the confidence reaches the threshold and keeps count of how often the
+    fast path could answer.
+
+    Args:
+        confidence_threshold (float): The minimum confidence for a label to
+            be returned. Defaults to FAST_PATH_CONFIDENCE_THRESHOLD.
+        known_words (Iterable[str] | None): Words the child may guess, used
+            to tell "is it a <word>?" guesses from yes/no questions.
+            Defaults to the words in words.json.
+    """
+
+    def __init__(self,
+                 confidence_threshold: float = FAST_PATH_CONFIDENCE_THRESHOLD,
+                 known_words: Iterable[str] | None = None):
+        self.confidence_threshold = confidence_threshold
+        self.known_words = {word.lower() for word in (known_words if known_words is not None else load_known_words())}
+        self.counts = {}
+
+    def tokenize(self, text: str) -> List[str]:
+        return TOKEN_PATTERN.findall(text.lower().replace("’", "'"))
+
+    def names_known_word(self, noun: str, secret_word: str | None = None) -> bool:
+        """
+        Checks whether a noun phrase such as "pencil" or "red pencil" names
+        the secret word or one of the known words.
+        """
+        words = self.known_words | ({secret_word.lower()} if secret_word else set())
+        return any(noun == word or noun.endswith(" " + word) for word in words)
+
+    def classify_yes_or_no(self, text: str) -> Tuple[Optional[str], float]:
+        """
+        Scores an utterance as 'yes' or 'no' based on polarity words. The
+        first word weighs most, since answers such as "no, it is not round"
+        or "yes, you can write with it" carry their polarity up front.
+
+        Args:
+            text (str): The utterance to classify.
+
+        Returns:
+            Tuple[Optional[str], float]: The label ('yes' or 'no') and its
+            confidence, or (None, 0.0) if no polarity word was found.
+        """
+        tokens = self.tokenize(text)
+        if not tokens:
+            return None, 0.0
+
+        score = 0.0
+        found = False
+        for position, token in enumerate(tokens):
+            weight = 3.0 if position == 0 else 1.2 / (1 + 0.3 * position)
+            if token in YES_WORDS:
+                score += weight
+                found = True
+            elif token in NO_WORDS:
+                score -= weight
+                found = True
+
+        if not found:
+            return None, 0.0
+
+        probability_yes = sigmoid(score)
+        label = "yes" if probability_yes >= 0.5 else "no"
+        return label, max(probability_yes, 1 - probability_yes)
+
+    def classify_hint_request(self, text: str) -> Tuple[Optional[str], float]:
+        """
+        Detects whether the child is asking for a hint using English and
+        Dutch hint keywords and phrases.
+
+        Args:
+            text (str): The utterance to classify.
+
+        Returns:
+            Tuple[Optional[str], float]: 'yes' if a hint is requested,
+            otherwise 'no', together with the confidence.
+        """
+        tokens = self.tokenize(text)
+        if not tokens:
+            return None, 0.0
+
+        lowered = " ".join(tokens)
+        hint_word_count = sum(1 for token in tokens if token in HINT_WORDS)
+        help_word_count = sum(1 for token in tokens if token in HELP_WORDS)
+        phrase_count = sum(1 for phrase in HINT_PHRASES if phrase in lowered)
+
+        score = -2.0 + 4.5 * hint_word_count + 2.5 * help_word_count + 3.5 * phrase_count
+
+        if help_word_count and len(tokens) <= 3:
+            score += 1.5  # "help", "help me please"
+        elif tokens[0] in QUESTION_START_WORDS and not hint_word_count and not phrase_count:
+            score -= 1.5  # A question about the word that happens to mention helping
+
+        probability_hint = sigmoid(score)
+        label = "yes" if probability_hint >= 0.5 else "no"
+        return label, max(probability_hint, 1 - probability_hint)
+
+    def classify_question_or_guess(self, text: str, secret_word: str | None = None) -> Tuple[Optional[str], float]:
+        """
+        Decides whether an utterance is a yes/no question about the secret
+        word or a guess of the secret word.
+
+        Args:
+            text (str): The utterance to classify.
+            secret_word (str | None): The secret word. Mentioning it makes a
+                guess more likely.
+
+        Returns:
+            Tuple[Optional[str], float]: 'question' or 'guess' together with
+            the confidence. Short "is it a ...?" utterances about an object
+            that is not a known word get a confidence below the threshold.
+        """
+        tokens = self.tokenize(text)
+        if not tokens:
+            return None, 0.0
+
+        lowered = " ".join(tokens)
+        score = 0.0  # Positive means guess, negative means question
+
+        if any(lowered.startswith(phrase) for phrase in GUESS_PHRASES):
+            score += 3.0
+        elif any(phrase in lowered for phrase in GUESS_PHRASES):
+            score += 1.5
+
+        if secret_word and secret_word.lower() in lowered:
+            score += 3.0
+
+        # "is it a pencil?" names a single object and counts as a guess, "is it a tool?" asks about a category
+        named_object = None
+        if 4 <= len(tokens) <= 5 and tokens[:2] in (["is", "it"], ["is", "het"]) and tokens[2] in ARTICLES:
+            named_object = self.names_known_word(" ".join(tokens[3:]), secret_word)
+            if named_object:
+                score += NAMED_OBJECT_SCORE
+
+        if tokens[0] in QUESTION_START_WORDS:
+            score -= 2.0
+        if text.strip().endswith("?"):
+            score -= 1.0
+        if len(tokens) > 5:
+            score -= 1.0
+
+        # Bare noun phrases ("pencil", "a ruler") are guesses
+        if len(tokens) <= 3 and tokens[0] not in QUESTION_START_WORDS and not text.strip().endswith("?"):
+            score += 2.5
+
+        probability_guess = sigmoid(score)
+        label = "guess" if probability_guess >= 0.5 else "question"
+        confidence = max(probability_guess, 1 - probability_guess)
+        if named_object is False:
+            confidence = min(confidence, UNKNOWN_OBJECT_CONFIDENCE)
+        return label, confidence
+
+    def is_complete_utterance(self, text: str) -> bool:
+        """
+        Checks whether a partial transcript already forms a complete
+        question, guess or yes/no answer, so the recording can stop early
+        (see the speech endpointing).
+
+        Args:
+            text (str): The partial transcript.
+
+        Returns:
+            bool: True if the recording can stop.
+        """
+        text = text.strip()
+        if not text:
+            return False
+
+        if text.endswith("?"):
+            return True
+
+        label, confidence = self.classify_question_or_guess(text)
+        if label is not None and confidence >= COMPLETE_UTTERANCE_CONFIDENCE:
+            return True
+
+        label, confidence = self.classify_yes_or_no(text)
+        return label is not None and confidence >= COMPLETE_UTTERANCE_CONFIDENCE and len(text.split()) <= 3
+
+    def predict(self, task: str, text: str, **kwargs) -> Optional[str]:
+        """
+        Runs one of the classification tasks and returns its label if the
+        classifier is confident enough.
+
+        Args:
+            task (str): One of 'yes_no', 'hint_request' or
+                'question_or_guess'.
+            text (str): The utterance to classify.
+            **kwargs: Extra arguments for the task (e.g. secret_word).
+
+        Returns:
+            Optional[str]: The label, or None if the LLM should decide.
+        """
+        classifiers = {
+            "yes_no": self.classify_yes_or_no,
+            "hint_request": self.classify_hint_request,
+            "question_or_guess": self.classify_question_or_guess,
+        }
+        if task not in classifiers:
+            raise ValueError(f"Unknown task: {task}. Must be one of {list(classifiers)}.")
+
+        label, confidence = classifiers[task](text, **kwargs)
+        answered = label is not None and confidence >= self.confidence_threshold
+
+        task_counts = self.counts.setdefault(task, {"fast_path": 0, "fallback": 0})
+        task_counts["fast_path" if answered else "fallback"] += 1
+
+        return label if answered else None
+
+    def get_report(self) -> Dict[str, Dict[str, int | float]]:
+        """
+        Reports how often the fast path answered per task.
+
+        Returns:
+            Dict[str, Dict[str, int | float]]: For each task the number of
+            fast-path answers, LLM fallbacks and the fast-path rate.
+        """
+        report = {}
+        for task, task_counts in self.counts.items():
+            total = task_counts["fast_path"] + task_counts["fallback"]
+            report[task] = dict(task_counts, fast_path_rate=task_counts["fast_path"] / total if total else 0.0)
+        return report
@@ -1,15 +1,16 @@
 from typing import Generator, Optional
 from twisted.internet.defer import inlineCallbacks
-from src.robot_movements.say_animated import say_animated
-from src.utils import generate_message_using_llm
+from src.robot_scripts import HINT_INTRO
+from src.robot_movements.say_animated import say_animated, say_animated_streamed
+from src.utils import generate_message_deferred
 from src.taboo_game.llm_interface import LLMGameHelper
 
 
 class KeywordsHandler:
 
-    def __init__(self, session):
+    def __init__(self, session, game_helper: LLMGameHelper | None = None):
         self.session = session
-        self.game_helper = LLMGameHelper()
+        self.game_helper = game_helper if game_helper is not None else LLMGameHelper()
 
     @inlineCallbacks
     def check_hint_keywords(self, user_input: str, secret_word: str) -> Generator[Optional[str], None, None]:
@@ -24,16 +25,18 @@ class KeywordsHandler:
             Generator[Optional[str], None, None]: Handles interactions related
             to hint requests.
         """
-        prompt = (
-            f"The user said: '{user_input}'. Determine if they are asking for a hint "
-            "by recognizing 'hint', 'help', et cetera. Respond with only 'yes' or 'no'."
-        )
-        response = generate_message_using_llm(prompt)
+        response = self.game_helper.intent_classifier.predict("hint_request", user_input)
+
+        if response is None:
+            prompt = (
+                f"The user said: '{user_input}'. Determine if they are asking for a hint "
+                "by recognizing 'hint', 'help', et cetera. Respond with only 'yes' or 'no'."
+            )
+            response = yield generate_message_deferred(prompt, prompt_kind="classifier")
 
         if response == "yes":
-            message = "I will give you a hint!"
+            message = HINT_INTRO
             yield say_animated(self.session, message, language="en")
-            hint = self.game_helper.generate_hint(secret_word)
-            yield say_animated(self.session, hint, language="en")
+            yield say_animated_streamed(self.session, self.game_helper.generate_hint(secret_word, stream=True), language="en")
 
         return response
@@ -1,8 +1,16 @@
-from src.utils import generate_message_using_llm
+import json
+from typing import Any, Dict, Iterator, Optional
+from src.utils import generate_message_using_llm, stream_message_using_llm
+from src.taboo_game.intent_classifier import IntentClassifier
+from src.taboo_game.content_pack import ContentPack
 
 
 class LLMGameHelper:
-    def __init__(self):
+    def __init__(self, intent_classifier: IntentClassifier | None = None, use_content_pack: bool = True):
+        # Confident local classifications skip the LLM round trip
+        self.intent_classifier = intent_classifier if intent_classifier is not None else IntentClassifier()
+        # Precomputed hints, explanations and answers skip live generation
+        self.content_pack = ContentPack.load() if use_content_pack else None
         self.standard_prompt_addition = (
             "Use simple and clear language that a 12-year-old native Dutch speaker "
             "learning English as a second language can understand. "
@@ -19,14 +27,23 @@ class LLMGameHelper:
         Returns:
             str: Either 'yes' or 'no' based on the input.
         """
+        if self.content_pack is not None:
+            polarity = self.content_pack.get_answer_polarity(user_input)
+            if polarity is not None:
+                return polarity
+
+        label = self.intent_classifier.predict("yes_no", user_input)
+        if label is not None:
+            return label
+
         prompt = (
             f"The user has said the following: '{user_input}'. Your task is to determine whether "
             "they said 'yes' or 'no'. Respond with only 'yes' or 'no' based on the input. "
             "If unclear, return the most likely option."
         )
-        return generate_message_using_llm(prompt)
+        return generate_message_using_llm(prompt, prompt_kind="classifier")
 
-    def process_user_question(self, secret_word: str, question: str) -> str:
+    def process_user_question(self, secret_word: str, question: str, emphasis: bool = False) -> str:
         """
         Processes the user's question and returns a short answer, explaining
         whether the question is related to the secret word without revealing
@@ -35,11 +52,18 @@ class LLMGameHelper:
         Args:
             secret_word (str): Secret word in the game.
             question (str): User's question.
+            emphasis (bool): If True, the words to emphasize with gestures are
+                marked as *word*. Defaults to False.
 
         Returns:
             str: Short answer explaining if the question is related to the secret
             word without revealing it.
         """
+        if self.content_pack is not None:
+            entry = self.content_pack.get_answer(secret_word, question)
+            if entry is not None:
+                return entry["answer"]
+
         prompt = (
             f"The user has asked the following question: '{question}' about the secret word: '{secret_word}'. "
             "Answer to their question with a short response. "
@@ -48,15 +72,35 @@ class LLMGameHelper:
             "Generate max 15 words."
         )
         # Even though we specified to not mention the secret word, the LLM might still do it in some cases
-        return generate_message_using_llm(prompt + " " + self.standard_prompt_addition)
+        return generate_message_using_llm(prompt + " " + self.standard_prompt_addition, emphasis=emphasis)
+
+    def generate_hint(self, secret_word: str, stream: bool = False) -> str | Iterator[str]:
+        """
+        Generates a hint for the secret word.
+
+        Args:
+            secret_word (str): Secret word in the game.
+            stream (bool): If True, the hint is streamed sentence by sentence
+                (see say_animated_streamed). Defaults to False.
+
+        Returns:
+            str | Iterator[str]: The hint, or an iterator over its sentences
+            when streaming.
+        """
+        if self.content_pack is not None:
+            hint = self.content_pack.get_hint(secret_word)
+            if hint is not None:
+                return iter([hint]) if stream else hint
 
-    def generate_hint(self, secret_word: str) -> str:
         prompt = (
             f"The user is struggling to guess the secret word, which is {secret_word}. "
             "Generate a helpful hint without revealing the secret word, "
             "including abbreviations or any part of the word. "
             "Keep the hint to one or two sentences and in English."
         )
+        if stream:
+            # Streamed text is spoken directly, so the gestures can follow its emphasis markers
+            return stream_message_using_llm(prompt + " " + self.standard_prompt_addition, emphasis=True)
         return generate_message_using_llm(prompt + " " + self.standard_prompt_addition)
 
     def determine_question_or_guess(self, user_input: str, secret_word: str) -> str:
@@ -71,12 +115,16 @@ class LLMGameHelper:
         Returns:
             str: 'question' or 'guess' based on the user's input.
         """
+        label = self.intent_classifier.predict("question_or_guess", user_input, secret_word=secret_word)
+        if label is not None:
+            return label
+
         prompt = (
             f"The user has said: '{user_input}'. Determine if this is a yes/no question about the secret word "
             f"or a guess of the secret word: {secret_word}. A guess could start with 'I think...', 'The word is...' "
             "A question usually starts with a verb. Respond with only 'question' or 'guess'."
         )
-        return generate_message_using_llm(prompt)
+        return generate_message_using_llm(prompt, prompt_kind="classifier")
 
     def check_if_correct_guess(self, secret_word: str, guess: str) -> str:
         """
@@ -94,13 +142,95 @@ class LLMGameHelper:
             f"The user guessed: '{guess}'. The correct secret word is: '{secret_word}'. "
             "Respond with only 'correct' or 'incorrect'."
         )
-        return generate_message_using_llm(prompt)
+        return generate_message_using_llm(prompt, prompt_kind="classifier")
 
-    def generate_secret_word_explanation(self, secret_word: str) -> str:
+    def generate_secret_word_explanation(self, secret_word: str, stream: bool = False) -> str | Iterator[str]:
         """
-        Generates a short one-sentence explanation of the secret word.
+        Generates a short one-sentence explanation of the secret word. If
+        stream is True, an iterator over the sentences is returned instead.
         """
+        if self.content_pack is not None:
+            explanation = self.content_pack.get_explanation(secret_word)
+            if explanation is not None:
+                return iter([explanation]) if stream else explanation
+
         prompt = (
             f"Explain the word '{secret_word}' in one short sentence."
         )
+        if stream:
+            return stream_message_using_llm(prompt + " " + self.standard_prompt_addition, emphasis=True)
         return generate_message_using_llm(prompt + " " + self.standard_prompt_addition)
+
+    def interpret_turn(self, user_input: str, secret_word: str, allow_hints: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Interprets one user utterance and generates the robot's answer in a
+        single structured (JSON) request, replacing the separate hint check,
+        question/guess classification, guess check or question answering, and
+        yes/no recognition of the answer.
+
+        Args:
+            user_input (str): User's input.
+            secret_word (str): Secret word in the game.
+            allow_hints (bool): Whether the user can ask for hints. If False,
+                'hint_requested' is always False. Defaults to True.
+
+        Returns:
+            Optional[Dict[str, Any]]: A dictionary with the keys 'intent'
+            ('question' or 'guess'), 'hint_requested' (bool), 'correct_guess'
+            (bool), 'answer' (the hint or the answer to the question) and
+            'answer_polarity' ('yes' or 'no'), or None if the response could
+            not be parsed and the separate requests should be used instead.
+        """
+        if self.content_pack is not None:
+            entry = self.content_pack.get_answer(secret_word, user_input)
+            wants_hint = allow_hints and self.intent_classifier.predict("hint_request", user_input) != "no"
+            if entry is not None and not wants_hint:
+                return {
+                    "intent": "question",
+                    "hint_requested": False,
+                    "correct_guess": False,
+                    "answer": entry["answer"],
+                    "answer_polarity": entry["polarity"],
+                }
+
+        hint_instruction = (
+            "\"hint_requested\": true if they are asking for a hint or help (e.g. 'hint', 'help', 'I don't know'), otherwise false. "
+            if allow_hints else "\"hint_requested\": always false. "
+        )
+        prompt = (
+            f"You are hosting a word guessing game. The secret word is: '{secret_word}'. The user said: '{user_input}'. "
+            "Respond with only a JSON object with these keys: "
+            "\"intent\": 'question' if this is a yes/no question about the secret word, or 'guess' if it is a guess of the "
+            "secret word (a guess could start with 'I think...', 'The word is...'; a question usually starts with a verb). "
+            f"{hint_instruction}"
+            "\"correct_guess\": true only if the intent is 'guess' and the guess matches the secret word, otherwise false. "
+            "\"answer\": if a hint is requested, a helpful hint of one or two sentences; if the intent is 'question', "
+            "a short answer to the question of max 15 words; otherwise an empty string. "
+            "The answer must not mention the secret word, including any abbreviations or parts of the word. "
+            "\"answer_polarity\": 'yes' or 'no', whether the answer to the question is yes or no. "
+            + self.standard_prompt_addition
+        )
+        response = generate_message_using_llm(prompt, json_mode=True)
+
+        try:
+            result = json.loads(response)
+        except json.JSONDecodeError:
+            print(f"Could not parse the interpreted turn: {response}")
+            return None
+
+        if not isinstance(result, dict) or result.get("intent") not in ("question", "guess"):
+            print(f"Unexpected interpreted turn: {response}")
+            return None
+
+        turn = {
+            "intent": result["intent"],
+            "hint_requested": allow_hints and bool(result.get("hint_requested")),
+            "correct_guess": result["intent"] == "guess" and bool(result.get("correct_guess")),
+            "answer": str(result.get("answer") or "").strip(),
+            "answer_polarity": "no" if result.get("answer_polarity") == "no" else "yes",
+        }
+
+        if (turn["hint_requested"] or turn["intent"] == "question") and not turn["answer"]:
+            return None
+
+        return turn
@@ -1,19 +1,32 @@
 import time
+from itertools import chain
 from typing import Generator, Optional
-from twisted.internet.defer import inlineCallbacks, returnValue
-from src.robot_movements.say_animated import say_animated
+from twisted.internet.defer import Deferred, inlineCallbacks, returnValue, succeed
+from src.clients import deferred_call
+from src.robot_movements.say_animated import say_animated, say_animated_streamed
+from src.robot_movements.stress_word_analyzer import parse_emphasis_markers
+from src.robot_scripts import (
+    ASK_AGAIN, CORRECT_GUESS, GUESS_WITH_HINT, HINT_INTRO, HINT_OFFER, HINT_OFFER_REPEAT, REVEAL_OFFER,
+    REVEAL_OFFER_REPEAT, ROUND_START, WRONG_GUESS
+)
 from src.speech_processing.speech_session import SpeechRecognitionSession
+from src.speech_processing.stt_backends import TranscriptionBackend
 from src.taboo_game.keywords_handler import KeywordsHandler
 from src.taboo_game.llm_interface import LLMGameHelper
+from src.tracing import tracer
 
 
 class TabooGame:
-    def __init__(self, session, version):
+    def __init__(self, session, version, fused_turns: bool = False, stt_backend: TranscriptionBackend | None = None):
         self.session = session
         self.version = version
-        self.keywords_handler = KeywordsHandler(session)
+        self.fused_turns = fused_turns  # Interpret and answer each utterance with a single LLM request
         self.game_helper = LLMGameHelper()
-        self.speech_recognition_session = SpeechRecognitionSession(self.session, self.version)
+        self.keywords_handler = KeywordsHandler(session, self.game_helper)
+        # Partial transcripts that already form a question or guess can end the recording early
+        self.speech_recognition_session = SpeechRecognitionSession(
+            self.session, self.version, stt_backend, is_complete=self.game_helper.intent_classifier.is_complete_utterance
+        )
         self.secret_word = None
 
     @inlineCallbacks
@@ -21,14 +34,36 @@ class TabooGame:
         if self.version != "experiment":
             return
 
-        message = "Would you like a hint?"
-        repeat_message = "Would you like a hint? Respond with only 'yes' or 'no'."
+        message = HINT_OFFER
+        repeat_message = HINT_OFFER_REPEAT
         answer = yield self.speech_recognition_session.validate_user_input(message, repeat_message, language="en")
 
-        if self.game_helper.recognize_yes_or_no(answer) == "yes":
+        answer_polarity = yield deferred_call("openai", self.game_helper.recognize_yes_or_no, answer)
+
+        if answer_polarity == "yes":
             self.round_data["hints_given"] += 1
-            hint = self.game_helper.generate_hint(self.secret_word)
-            yield say_animated(self.session, hint, language="en")
+            yield say_animated_streamed(self.session, self.game_helper.generate_hint(self.secret_word, stream=True), language="en")
+
+    def interpret_turn(self, user_input: str) -> Deferred:
+        """
+        Interprets the user's input with a single LLM request when fused turns
+        are enabled.
+
+        Args:
+            user_input (str): User's input.
+
+        Returns:
+            Deferred: Fires with the interpreted turn, or with None if fused
+            turns are disabled or the response could not be used, in which
+            case the separate LLM requests are made instead.
+        """
+        if not self.fused_turns:
+            return succeed(None)
+
+        return deferred_call(
+            "openai", self.game_helper.interpret_turn, user_input, self.secret_word,
+            allow_hints=(self.version == "experiment")
+        )
 
     @inlineCallbacks
     def robot_is_host(
@@ -39,7 +74,7 @@ class TabooGame:
         questions_answered_no = 0
         incorrect_guesses = 0
 
-        message = "I have thought of a word. Try to guess it."
+        message = ROUND_START
         repeat_message = message
 
         start_time = time.time()
@@ -55,32 +90,68 @@ class TabooGame:
             "gave_up": False
         }
 
+        # The loop body is too long for with blocks, so the round and turn spans are ended explicitly
+        round_span = tracer.start_span("round", secret_word=self.secret_word, version=self.version)
+        turn_span = None
+        turn_number = 0
+
         while True:
+            if turn_span is not None:
+                turn_span.end()
+            turn_number += 1
+            turn_span = tracer.start_span("turn", number=turn_number)
+
             if time.time() - start_time >= time_limit_seconds:
-                word_explanation = self.game_helper.generate_secret_word_explanation(self.secret_word)
-                message = f"Time's up! The secret word is {self.secret_word}. {word_explanation}"
-                yield say_animated(self.session, message, language="en")
+                message = f"Time's up! The secret word is {self.secret_word}."
+                word_explanation = self.game_helper.generate_secret_word_explanation(self.secret_word, stream=True)
+                yield say_animated_streamed(self.session, chain([message], word_explanation), language="en")
                 break
 
             user_input = yield self.speech_recognition_session.validate_user_input(message, repeat_message, language="en")
 
+            with tracer.span("game.interpret_turn"):
+                turn = yield self.interpret_turn(user_input)
+
             if self.version == "experiment":
-                hint_given = yield self.keywords_handler.check_hint_keywords(user_input, self.secret_word)
-                while hint_given == "yes":
-                    self.round_data["hints_given"] += 1
-                    message = "Try to guess the word using the hint I gave you."
-                    user_input = yield self.speech_recognition_session.validate_user_input("", message, language="en")
+                if turn is not None:
+                    while turn is not None and turn["hint_requested"]:
+                        self.round_data["hints_given"] += 1
+                        yield say_animated(self.session, HINT_INTRO, language="en")
+                        yield say_animated(self.session, turn["answer"], language="en")
+                        message = GUESS_WITH_HINT
+                        user_input = yield self.speech_recognition_session.validate_user_input("", message, language="en")
+                        turn = yield self.interpret_turn(user_input)
+                else:
                     hint_given = yield self.keywords_handler.check_hint_keywords(user_input, self.secret_word)
-
-            input_type = self.game_helper.determine_question_or_guess(user_input, self.secret_word)
+                    while hint_given == "yes":
+                        self.round_data["hints_given"] += 1
+                        message = GUESS_WITH_HINT
+                        user_input = yield self.speech_recognition_session.validate_user_input("", message, language="en")
+                        hint_given = yield self.keywords_handler.check_hint_keywords(user_input, self.secret_word)
+
+            if turn is not None:
+                input_type = turn["intent"]
+            else:
+                input_type = yield deferred_call("openai", self.game_helper.determine_question_or_guess, user_input, self.secret_word)
 
             if input_type == "question":
                 self.round_data["questions"] += 1
-                response = self.game_helper.process_user_question(self.secret_word, user_input)
+                if turn is not None:
+                    response = turn["answer"]
+                else:
+                    response = yield deferred_call(
+                        "openai", self.game_helper.process_user_question, self.secret_word, user_input, emphasis=True
+                    )
                 yield say_animated(self.session, response, language="en")
+                response, _ = parse_emphasis_markers(response)
 
                 if self.version == "experiment":
-                    if self.game_helper.recognize_yes_or_no(response) == "no":
+                    if turn is not None:
+                        answer_polarity = turn["answer_polarity"]
+                    else:
+                        answer_polarity = yield deferred_call("openai", self.game_helper.recognize_yes_or_no, response)
+
+                    if answer_polarity == "no":
                         self.round_data["questions_answered_no"] += 1
                         questions_answered_no += 1
 
@@ -91,11 +162,14 @@ class TabooGame:
             else:
                 # Input type is a guess
                 self.round_data["guesses"] += 1
-                result = self.game_helper.check_if_correct_guess(self.secret_word, user_input)
+                if turn is not None:
+                    result = "correct" if turn["correct_guess"] else "incorrect"
+                else:
+                    result = yield deferred_call("openai", self.game_helper.check_if_correct_guess, self.secret_word, user_input)
 
                 if result == "correct":
                     self.round_data["guessed_word"] = True
-                    message = "You got it! Well done!"
+                    message = CORRECT_GUESS
                     yield say_animated(self.session, message, language="en")
                     break
 
@@ -108,22 +182,26 @@ class TabooGame:
                         incorrect_guesses = 0
 
                 elif incorrect_guesses == 4:
-                    message = "Do you want me to tell you the secret word?"
-                    repeat_message = "Do you want me to tell you the secret word? Say 'yes' or 'no'."
+                    message = REVEAL_OFFER
+                    repeat_message = REVEAL_OFFER_REPEAT
                     tell_secret_word = yield self.speech_recognition_session.validate_user_input(message, repeat_message, language="en")
 
-                    if self.game_helper.recognize_yes_or_no(tell_secret_word) == "yes":
+                    wants_secret_word = yield deferred_call("openai", self.game_helper.recognize_yes_or_no, tell_secret_word)
+
+                    if wants_secret_word == "yes":
                         self.round_data["gave_up"] = True
-                        word_explanation = self.game_helper.generate_secret_word_explanation(self.secret_word)
-                        message = f"The secret word is {self.secret_word}. {word_explanation}"
-                        yield say_animated(self.session, message, language="en")
+                        message = f"The secret word is {self.secret_word}."
+                        word_explanation = self.game_helper.generate_secret_word_explanation(self.secret_word, stream=True)
+                        yield say_animated_streamed(self.session, chain([message], word_explanation), language="en")
                         break
 
                 else:
-                    message = "Not quite! Keep guessing."
+                    message = WRONG_GUESS
                     yield say_animated(self.session, message, language="en")
 
             message = ""
-            repeat_message = "Ask me a question or guess the word."
+            repeat_message = ASK_AGAIN
 
+        turn_span.end()
+        round_span.end(**self.round_data)
         returnValue(self.round_data)
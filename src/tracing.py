@@ -0,0 +1,282 @@
+"""
+File:     tracing.py
+
+Description:
+    This module provides lightweight latency tracing. Code marks stages with
+    nested spans (a round contains turns, a turn contains recording,
+    transcription, LLM requests, moderation, gesture planning and robot
+    calls) and instant events such as the end of the child's speech. Spans
+    are written as JSON lines to one trace file per participant. The
+    current span is kept in a context variable, so spans nest correctly in
+    Twisted inlineCallbacks and in worker threads started with
+    run_in_context. The trace files can be exported to the Chrome/Perfetto
+    trace format and summarized per stage:
+
+        python -m src.tracing summary data/traces/01.jsonl
+        python -m src.tracing chrome data/traces/01.jsonl trace.json
+"""
+
+import argparse
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List
+import numpy as np
+from src.paths import DATA_FOLDER
+
+TRACE_FOLDER = os.path.join(DATA_FOLDER, "traces")
+SPEECH_END_EVENT = "speech_end"
+REPLY_START_EVENT = "reply_start"
+REPLY_LATENCY_STAGE = "speech_end_to_reply_start"
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """
+    A timed stage. Use it as a context manager, or call start and end
+    explicitly when the stage does not fit in one block.
+    """
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.span_id = next(_span_ids)
+        self.parent = None
+        self.start_time = None
+        self.start_counter = None
+        self.ended = False
+
+    def start(self) -> "Span":
+        self.parent = _current_span.get()
+        self.start_time = time.time()
+        self.start_counter = time.perf_counter()
+        _current_span.set(self)
+        return self
+
+    def end(self, **attributes) -> None:
+        if self.ended:
+            return
+        self.ended = True
+        self.attributes.update(attributes)
+        duration = time.perf_counter() - self.start_counter
+
+        if _current_span.get() is self:
+            _current_span.set(self.parent)
+
+        self.tracer.write({
+            "type": "span",
+            "name": self.name,
+            "id": self.span_id,
+            "parent": self.parent.span_id if self.parent is not None else None,
+            "start": self.start_time,
+            "duration": duration,
+            "thread": threading.get_ident(),
+            "attributes": self.attributes,
+        })
+
+    def __enter__(self) -> "Span":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.end(**({"error": exc_type.__name__} if exc_type is not None else {}))
+
+
+class Tracer:
+    """
+    Collects spans and events and appends them to the trace file. Without a
+    trace file, nothing is written.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.file = None
+        self.path = None
+
+    def start_trace_file(self, participant: str, folder: str = TRACE_FOLDER) -> str:
+        """
+        Starts writing to the trace file of a participant (appending if it
+        exists).
+
+        Returns:
+            str: The path of the trace file.
+        """
+        os.makedirs(folder, exist_ok=True)
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+            self.path = os.path.join(folder, f"{participant}.jsonl")
+            self.file = open(self.path, "a", encoding="utf-8")
+        return self.path
+
+    def close(self) -> None:
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    def write(self, record: Dict[str, Any]) -> None:
+        with self.lock:
+            if self.file is not None:
+                self.file.write(json.dumps(record, default=str) + "\n")
+                self.file.flush()
+
+    def span(self, name: str, **attributes) -> Span:
+        return Span(self, name, attributes)
+
+    def start_span(self, name: str, **attributes) -> Span:
+        return Span(self, name, attributes).start()
+
+    def event(self, name: str, timestamp: float | None = None, **attributes) -> None:
+        """
+        Records an instant event, e.g. the end of the child's speech.
+
+        Args:
+            name (str): The event name.
+            timestamp (float | None): When it happened (time.time()).
+                Defaults to now.
+            **attributes: Extra data to store with the event.
+        """
+        current = _current_span.get()
+        self.write({
+            "type": "event",
+            "name": name,
+            "parent": current.span_id if current is not None else None,
+            "start": timestamp if timestamp is not None else time.time(),
+            "thread": threading.get_ident(),
+            "attributes": attributes,
+        })
+
+
+tracer = Tracer()
+
+
+def traced(name: str) -> Callable:
+    """
+    Decorates a function so every call is recorded as a span.
+    """
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def run_in_context(function: Callable) -> Callable:
+    """
+    Binds a function to a copy of the current context, so spans it starts
+    in a worker thread nest under the current span.
+    """
+    context = contextvars.copy_context()
+    return functools.partial(context.run, function)
+
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def export_chrome_trace(trace_path: str, output_path: str) -> None:
+    """
+    Converts a trace file to the Chrome trace event format, which can be
+    opened in chrome://tracing or https://ui.perfetto.dev.
+    """
+    trace_events = []
+    for record in load_trace(trace_path):
+        event = {
+            "name": record["name"],
+            "ts": record["start"] * 1e6,
+            "pid": 1,
+            "tid": record["thread"],
+            "args": record["attributes"],
+        }
+        if record["type"] == "span":
+            event.update({"ph": "X", "dur": record["duration"] * 1e6})
+        else:
+            event.update({"ph": "i", "s": "g"})
+        trace_events.append(event)
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+
+
+def get_reply_latencies(records: List[Dict[str, Any]]) -> List[float]:
+    """
+    Pairs every end of the child's speech with the next start of a robot
+    reply and returns the time between them in seconds.
+    """
+    events = sorted((r for r in records if r["type"] == "event"), key=lambda r: r["start"])
+    latencies = []
+    speech_end = None
+
+    for event in events:
+        if event["name"] == SPEECH_END_EVENT:
+            speech_end = event["start"]
+        elif event["name"] == REPLY_START_EVENT and speech_end is not None:
+            latencies.append(event["start"] - speech_end)
+            speech_end = None
+
+    return latencies
+
+
+def summarize_trace(trace_path: str) -> Dict[str, Dict[str, float]]:
+    """
+    Summarizes the time per stage.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Per span name (and for
+        'speech_end_to_reply_start'), the count and the p50 and p95 in
+        seconds.
+    """
+    records = load_trace(trace_path)
+    durations = {}
+    for record in records:
+        if record["type"] == "span":
+            durations.setdefault(record["name"], []).append(record["duration"])
+
+    latencies = get_reply_latencies(records)
+    if latencies:
+        durations[REPLY_LATENCY_STAGE] = latencies
+
+    return {
+        name: {
+            "count": len(values),
+            "p50": float(np.percentile(values, 50)),
+            "p95": float(np.percentile(values, 95)),
+        }
+        for name, values in durations.items()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Summarize or export latency traces.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    summary_parser = subparsers.add_parser("summary", help="Print p50/p95 time per stage.")
+    summary_parser.add_argument("trace", help="Path to a trace file (.jsonl).")
+    chrome_parser = subparsers.add_parser("chrome", help="Export to the Chrome/Perfetto trace format.")
+    chrome_parser.add_argument("trace", help="Path to a trace file (.jsonl).")
+    chrome_parser.add_argument("output", help="Path of the exported .json file.")
+    args = parser.parse_args()
+
+    if args.command == "chrome":
+        export_chrome_trace(args.trace, args.output)
+        print(f"Exported to {args.output}.")
+        return
+
+    summary = summarize_trace(args.trace)
+    print(f"{'stage':<40} {'count':>6} {'p50 (s)':>9} {'p95 (s)':>9}")
+    for name in sorted(summary, key=lambda n: (n != REPLY_LATENCY_STAGE, n)):
+        stats = summary[name]
+        print(f"{name:<40} {stats['count']:>6} {stats['p50']:>9.3f} {stats['p95']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
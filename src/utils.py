@@ -7,25 +7,129 @@ Description:
     This module provides functionality to generate messages using OpenAI's
     GPT-3.5. It takes a prompt as input and returns a generated response in
     lowercase, ensuring that no inappropriate or offensive content is included.
-    The script checks for profanity using Sightengine and regenerates the
-    response if needed. The API key must be set in the environment variables
-    for the script to work.
+    The script checks for profanity (locally first, then using Sightengine)
+    and regenerates the response if needed, within a bounded retry and time
+    budget. The requests go through the shared clients in clients.py, and
+    generate_message_deferred runs a generation off the reactor thread.
+    Responses to deterministic prompt kinds (such as classifier prompts) are
+    cached in memory and on disk. The API key must be set in the environment
+    variables for the script to work.
 """
 
-import os
+import re
 import json
-import openai
+import time
+import hashlib
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from typing import Iterator
 from langdetect import detect
+from twisted.internet.defer import Deferred
+from src.cache import PersistentLRUCache, get_cache
+from src.profanity_filter import screen_locally
+from src.clients import (
+    API_KEY, OPENAI_REQUEST_TIMEOUT, SIGHTENGINE_URL, deferred_call, get_http_session, get_openai_client, get_request_timeout
+)
+from src.tracing import run_in_context, traced
 
-API_KEY = os.getenv("OPENAI_API_KEY")
-if not API_KEY:
-    raise ValueError("OPENAI_API_KEY is not set. Please set it in your environment variables.")
+LLM_MODEL = "gpt-3.5-turbo"
+SYSTEM_PROMPT = (
+    "You are a friendly, educational robot speaking to children aged 12. "
+    "Keep your language fun, safe, simple, and never use any inappropriate or scary content."
+)
 
-client = openai.Client(api_key=API_KEY)
+# Only deterministic prompt kinds are cached; creative generations (hints,
+# explanations, feedback) should vary between rounds and are never cached
+CACHEABLE_PROMPT_KINDS = {"classifier"}
+LLM_CACHE_NAME = "llm_responses"
+LLM_CACHE_OPTIONS = {"max_memory_entries": 2048, "max_disk_entries": 50000, "ttl_seconds": 30 * 24 * 60 * 60}
 
 
+# When a response is flagged, REGENERATION_CANDIDATES candidates are requested
+# in one call and screened concurrently, for at most MAX_REGENERATION_ROUNDS
+# rounds and REGENERATION_TIME_BUDGET seconds in total
+REGENERATION_CANDIDATES = 3
+MAX_REGENERATION_ROUNDS = 2
+REGENERATION_TIME_BUDGET = 20
+SAFE_FALLBACK_RESPONSE = "let's keep playing! you are doing great."
+SAFE_FALLBACK_JSON = "{}"  # Parsed as an unusable turn, so the separate requests are made instead
+moderation_executor = ThreadPoolExecutor(max_workers=REGENERATION_CANDIDATES * 2)
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+# Lets the robot's gestures follow the generation itself, instead of a second LLM request for stress words
+EMPHASIS_INSTRUCTION = (
+    " Wrap the words that should be emphasized with a small arm or head movement in asterisks, like *word*. "
+    "Mark at most 1 word per 9 words, only words that carry key meaning or emotion, and never function words."
+)
+
+
+MODERATION_CACHE_NAME = "moderation_verdicts"
+MODERATION_CACHE_OPTIONS = {"max_memory_entries": 4096, "max_disk_entries": 100000, "ttl_seconds": 30 * 24 * 60 * 60}
+
+
+def get_llm_cache() -> PersistentLRUCache:
+    return get_cache(LLM_CACHE_NAME, **LLM_CACHE_OPTIONS)
+
+
+def get_moderation_cache() -> PersistentLRUCache:
+    return get_cache(MODERATION_CACHE_NAME, **MODERATION_CACHE_OPTIONS)
+
+
+def make_llm_cache_key(prompt: str, system_prompt: str, model: str) -> str:
+    """
+    Builds a cache key from the normalized prompt, system prompt and model.
+    Prompts are normalized by lowercasing and collapsing whitespace, since
+    the responses are lowercased anyway.
+
+    Args:
+        prompt (str): The user prompt.
+        system_prompt (str): The system prompt.
+        model (str): The model name.
+
+    Returns:
+        str: A SHA-256 hex digest identifying the request.
+    """
+    normalized_prompt = re.sub(r"\s+", " ", prompt).strip().lower()
+    payload = json.dumps([model, system_prompt, normalized_prompt])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@traced("moderation.check_profanity")
 def check_profanity(text: str, lang: str, timeout: int = 10) -> dict:
+    """
+    Checks the given text for profanity in two tiers. The local stage clears
+    closed-vocabulary classifier outputs and flags terms from the offensive
+    lexicon without any network call. Only text it cannot clear is sent to
+    Sightengine, and those verdicts are cached by text hash.
+
+    Args:
+        text (str): The text to check for profanity.
+        lang (str): The language of the text.
+        timeout (int): Timeout for the remote request in seconds. Default is
+            10 seconds.
+
+    Returns:
+        dict: A response in the Sightengine format, containing information
+        on detected profanity (empty if the text was cleared or the request
+        failed).
+    """
+    local_result = screen_locally(text)
+    if local_result is not None:
+        return local_result
+
+    cache_key = hashlib.sha256(f"{lang}\0{text}".encode("utf-8")).hexdigest()
+    cached_result = get_moderation_cache().get(cache_key)
+    if cached_result is not None:
+        return cached_result
+
+    result = request_profanity_check(text, lang, timeout=timeout)
+    if result.get("status") == "success":
+        get_moderation_cache().set(cache_key, result)
+    return result
+
+
+def request_profanity_check(text: str, lang: str, timeout: int = 10) -> dict:
     """
     Checks the given text for profanity using the Sightengine API.
     This approach is based on the Sightengine Profanity Detection API, which
@@ -49,21 +153,129 @@ def check_profanity(text: str, lang: str, timeout: int = 10) -> dict:
     headers = {'Authorization': API_KEY}
 
     try:
-        r = requests.post('https://api.sightengine.com/1.0/text/check.json', data=data, headers=headers, timeout=timeout)
+        r = get_http_session().post(SIGHTENGINE_URL, data=data, headers=headers, timeout=get_request_timeout(timeout))
         return json.loads(r.text)
     except (requests.exceptions.Timeout, requests.exceptions.RequestException) as e:
         print(f"Request failed: {e}")
         return {}
 
 
-def generate_message_using_llm(original_prompt: str) -> str:
+def detect_moderation_language(text: str) -> str:
+    """
+    Detects the language of a text for the profanity check, falling back to
+    English for text without letters and for unsupported languages.
+    """
+    if text and any(char.isalpha() for char in text):
+        language = detect(text)
+    else:
+        language = "en"
+
+    return language if language in ["en", "nl"] else "en"
+
+
+def get_profanity_matches(text: str) -> list:
+    """
+    Checks a text for profanity and returns the matched words (empty if the
+    text is clean).
+    """
+    profanity = check_profanity(text, lang=detect_moderation_language(text))
+    if profanity and profanity.get("profanity", {}).get("matches"):
+        return [match["match"] for match in profanity["profanity"]["matches"]]
+    return []
+
+
+def request_completions(prompt: str, n: int = 1, json_mode: bool = False) -> list:
+    """
+    Requests one or more completions for a prompt in a single call.
+
+    Args:
+        prompt (str): The prompt to send to the OpenAI API.
+        n (int): The number of candidate completions. Defaults to 1.
+        json_mode (bool): Whether to request a JSON object. Defaults to False.
+
+    Returns:
+        list: The stripped completion texts.
+
+    Raises:
+        RuntimeError: If the LLM response is empty.
+    """
+    request_options = {"response_format": {"type": "json_object"}} if json_mode else {}
+    if n > 1:
+        request_options["n"] = n
+
+    completion = get_openai_client().chat.completions.create(
+        model=LLM_MODEL,
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        timeout=get_request_timeout(OPENAI_REQUEST_TIMEOUT),
+        **request_options
+    )
+
+    if not completion.choices:
+        raise RuntimeError("LLM response is empty.")
+
+    return [(choice.message.content or "").strip() for choice in completion.choices]
+
+
+def screen_candidates(candidates: list, deadline: float) -> tuple:
+    """
+    Checks several candidate responses for profanity concurrently and picks
+    the first one that comes back clean.
+
+    Args:
+        candidates (list): The candidate responses.
+        deadline (float): time.monotonic() value after which to stop waiting.
+
+    Returns:
+        tuple: The first clean candidate (or None) and the list of matched
+        words of the flagged candidates that were checked.
+    """
+    futures = [moderation_executor.submit(run_in_context(get_profanity_matches), candidate) for candidate in candidates]
+    candidate_by_future = dict(zip(futures, candidates))
+    matched_words = []
+
+    try:
+        for future in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+            matches = future.result()
+            if not matches:
+                return candidate_by_future[future], matched_words
+            matched_words.extend(matches)
+    except FuturesTimeoutError:
+        print("Profanity screening ran out of time.")
+
+    return None, matched_words
+
+
+@traced("llm.generate")
+def generate_message_using_llm(
+    original_prompt: str,
+    prompt_kind: str = "generation",
+    json_mode: bool = False,
+    emphasis: bool = False
+) -> str:
     """
     Generates a message based on a given prompt using OpenAI's GPT-3.5 and
     ensures no profanity is included. Also ensures the language is safe
     and appropriate for children.
 
+    If the first response is flagged, several candidates are requested in
+    one call (avoiding the flagged words) and screened concurrently. This is
+    repeated at most MAX_REGENERATION_ROUNDS times within
+    REGENERATION_TIME_BUDGET seconds, after which a safe fallback response
+    is returned.
+
     Args:
         original_prompt (str): The initial prompt to send to the OpenAI API.
+        prompt_kind (str): The kind of prompt, e.g. 'classifier' or
+            'generation'. Responses are only cached for kinds listed in
+            CACHEABLE_PROMPT_KINDS. Defaults to 'generation'.
+        json_mode (bool): If True, the model is asked to return a single JSON
+            object (the prompt itself must mention JSON). Defaults to False.
+        emphasis (bool): If True, the words to emphasize with gestures are
+            marked in the response as *word* (see say_animated). Defaults to
+            False.
 
     Returns:
         str: A generated response from the OpenAI API, in lowercase, with no
@@ -72,42 +284,119 @@ def generate_message_using_llm(original_prompt: str) -> str:
     Raises:
         RuntimeError: If the LLM response is empty.
     """
-    prompt = original_prompt
-    avoided_words = []
-    system_prompt = (
-        "You are a friendly, educational robot speaking to children aged 12. "
-        "Keep your language fun, safe, simple, and never use any inappropriate or scary content."
+    if emphasis:
+        original_prompt += EMPHASIS_INSTRUCTION
+
+    cache_key = None
+    if prompt_kind in CACHEABLE_PROMPT_KINDS:
+        cache_key = make_llm_cache_key(original_prompt, SYSTEM_PROMPT, LLM_MODEL)
+        cached_response = get_llm_cache().get(cache_key)
+        if cached_response is not None:
+            return cached_response
+
+    deadline = time.monotonic() + REGENERATION_TIME_BUDGET
+    response = request_completions(original_prompt, json_mode=json_mode)[0]
+    avoided_words = get_profanity_matches(response)
+
+    regeneration_round = 0
+    while avoided_words:
+        if regeneration_round == MAX_REGENERATION_ROUNDS or time.monotonic() >= deadline:
+            print(f"No clean response within the regeneration budget. Avoided word(s): {avoided_words}")
+            return SAFE_FALLBACK_JSON if json_mode else SAFE_FALLBACK_RESPONSE
+
+        regeneration_round += 1
+        avoided_words_str = ", ".join(avoided_words)
+        prompt = original_prompt + f" Do not use the word(s): '{avoided_words_str}'."
+        candidates = request_completions(prompt, n=REGENERATION_CANDIDATES, json_mode=json_mode)
+
+        clean_response, matched_words = screen_candidates(candidates, deadline)
+        if clean_response is not None:
+            response = clean_response
+            break
+
+        avoided_words.extend(word for word in matched_words if word not in avoided_words)
+
+    response = response.lower()
+    if cache_key is not None:
+        get_llm_cache().set(cache_key, response)
+    return response
+
+
+def stream_message_using_llm(prompt: str, emphasis: bool = False) -> Iterator[str]:
+    """
+    Streams a message from OpenAI's GPT-3.5 sentence by sentence, so the
+    robot can start speaking the first sentence while the rest is still
+    being generated. Every sentence is checked for profanity on its own;
+    flagged sentences are left out, since earlier sentences may already have
+    been spoken.
+
+    Args:
+        prompt (str): The prompt to send to the OpenAI API.
+        emphasis (bool): If True, the words to emphasize with gestures are
+            marked as *word*. Defaults to False.
+
+    Yields:
+        Iterator[str]: Complete sentences of the response, in lowercase.
+
+    Raises:
+        RuntimeError: If the LLM response is empty.
+    """
+    if emphasis:
+        prompt += EMPHASIS_INSTRUCTION
+
+    stream = get_openai_client().chat.completions.create(
+        model=LLM_MODEL,
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        timeout=get_request_timeout(OPENAI_REQUEST_TIMEOUT),
+        stream=True
     )
 
-    while True:
-        completion = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ]
-        )
+    buffer = ""
+    received_content = False
+
+    def moderated(sentence: str) -> str | None:
+        if get_profanity_matches(sentence):
+            print(f"Left out a flagged sentence: {sentence}")
+            return None
+        return sentence.lower()
 
-        if not completion.choices:
-            raise RuntimeError("LLM response is empty.")
+    for chunk in stream:
+        if not chunk.choices:
+            continue
 
-        response = completion.choices[0].message.content.strip()
+        content = chunk.choices[0].delta.content or ""
+        received_content = received_content or bool(content)
+        buffer += content
+        *sentences, buffer = SENTENCE_BOUNDARY.split(buffer)
 
-        if response and any(char.isalpha() for char in response):
-            language = detect(response)
-        else:
-            language = "en"
+        for sentence in sentences:
+            sentence = moderated(sentence.strip()) if sentence.strip() else None
+            if sentence:
+                yield sentence
 
-        profanity = check_profanity(response, lang=language if language in ["en", "nl"] else "en")
+    if not received_content:
+        raise RuntimeError("LLM response is empty.")
 
-        if profanity and profanity.get("profanity", {}).get("matches"):
-            matches = profanity["profanity"]["matches"]
-            new_words = [match["match"] for match in matches if match["match"] not in avoided_words]
+    if buffer.strip():
+        sentence = moderated(buffer.strip())
+        if sentence:
+            yield sentence
 
-            if new_words:
-                avoided_words.extend(new_words)
-                avoided_words_str = ", ".join(avoided_words)
-                prompt = original_prompt + f" Do not use the word(s): '{avoided_words_str}'."
 
-        else:
-            return response.lower()
+def generate_message_deferred(
+    original_prompt: str, prompt_kind: str = "generation", json_mode: bool = False, emphasis: bool = False
+) -> Deferred:
+    """
+    Runs generate_message_using_llm in the thread pool so the Twisted reactor
+    (WAMP session, animations and timers) keeps running while waiting for
+    the response.
+
+    Returns:
+        Deferred: Fires with the generated message.
+    """
+    return deferred_call(
+        "openai", generate_message_using_llm, original_prompt, prompt_kind=prompt_kind, json_mode=json_mode, emphasis=emphasis
+    )
@@ -0,0 +1,20 @@
+import os
+import sys
+import pytest
+
+# Tests import the game modules as the src package, like main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# src.clients refuses to load without a key; the tests never reach the API
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from src.cache import set_cache_folder  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def cache_folder(tmp_path):
+    # Keep the caches of the code under test out of the real data/cache
+    folder = tmp_path / "cache"
+    set_cache_folder(str(folder))
+    yield folder
+    set_cache_folder(None)
@@ -0,0 +1,90 @@
+import pytest
+from src import cache
+from src.cache import PersistentLRUCache, get_cache, set_cache_folder
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock)
+    return clock
+
+
+def test_values_persist_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    PersistentLRUCache(path=path).set("key", {"answer": "question"})
+
+    reopened = PersistentLRUCache(path=path)
+
+    assert reopened.get("key") == {"answer": "question"}
+    assert reopened.get_stats()["disk_hits"] == 1
+    assert reopened.get("key") == {"answer": "question"}
+    assert reopened.get_stats()["memory_hits"] == 1
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite")
+    memory_and_disk = PersistentLRUCache(path=path, ttl_seconds=60)
+    memory_and_disk.set("key", "value")
+
+    clock.now += 59
+    assert memory_and_disk.get("key") == "value"
+
+    clock.now += 2
+    assert memory_and_disk.get("key") is None
+    assert PersistentLRUCache(path=path, ttl_seconds=60).get("key") is None
+
+
+def test_memory_tier_evicts_least_recently_used():
+    memory_only = PersistentLRUCache(max_memory_entries=2)
+    memory_only.set("a", 1)
+    memory_only.set("b", 2)
+    memory_only.get("a")
+    memory_only.set("c", 3)
+
+    assert memory_only.get("b") is None
+    assert memory_only.get("a") == 1
+    assert memory_only.get("c") == 3
+
+
+def test_disk_tier_evicts_least_recently_accessed(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite")
+    disk = PersistentLRUCache(path=path, max_memory_entries=1, max_disk_entries=2)
+    disk.set("a", 1)
+    clock.now += 1
+    disk.set("b", 2)
+    clock.now += 1
+    assert disk.get("a") == 1  # Read from disk, which marks it as recently accessed
+    clock.now += 1
+    disk.set("c", 3)
+
+    reopened = PersistentLRUCache(path=path)
+    assert reopened.get("b") is None
+    assert reopened.get("a") == 1
+    assert reopened.get("c") == 3
+
+
+def test_get_cache_is_created_lazily_in_the_cache_folder(cache_folder):
+    assert not cache_folder.exists()
+
+    shared = get_cache("answers", max_memory_entries=8)
+    shared.set("key", "value")
+
+    assert get_cache("answers") is shared
+    assert (cache_folder / "answers.sqlite").exists()
+
+
+def test_set_cache_folder_none_keeps_caches_in_memory(cache_folder):
+    set_cache_folder(None)
+    get_cache("answers").set("key", "value")
+
+    assert get_cache("answers").path is None
+    assert not cache_folder.exists()
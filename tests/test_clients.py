@@ -0,0 +1,25 @@
+import time
+import pytest
+from src import clients
+
+
+def test_request_timeout_outside_a_deferred_call_is_the_default():
+    assert clients.get_request_timeout(30) == 30
+
+
+def test_request_timeout_is_capped_by_the_deferred_call_deadline():
+    token = clients._request_deadline.set(time.monotonic() + 5)
+    try:
+        assert 4 < clients.get_request_timeout(30) <= 5
+        assert clients.get_request_timeout(2) == 2
+    finally:
+        clients._request_deadline.reset(token)
+
+
+def test_request_after_the_deadline_is_not_made():
+    token = clients._request_deadline.set(time.monotonic() - 1)
+    try:
+        with pytest.raises(TimeoutError):
+            clients.get_request_timeout(30)
+    finally:
+        clients._request_deadline.reset(token)
@@ -0,0 +1,71 @@
+import json
+import pytest
+from src.taboo_game.content_pack import CONTENT_PACK_FORMAT_VERSION, ContentPack, hash_file, normalize_question
+
+RULER_ANSWERS = {
+    "is big": {"question": "Is it big?", "answer": "No, it is quite small.", "polarity": "no"},
+    "can you write with": {"question": "Can you write with it?", "answer": "Not really!", "polarity": "no"},
+    "is made of plastic": {"question": "Is it made of plastic?", "answer": "Yes, often!", "polarity": "yes"},
+}
+
+
+@pytest.fixture
+def words_file(tmp_path):
+    path = tmp_path / "words.json"
+    path.write_text(json.dumps({"ruler": {}, "pencil": {}}), encoding="utf-8")
+    return path
+
+
+def write_pack(tmp_path, words_file, **overrides):
+    data = {
+        "format_version": CONTENT_PACK_FORMAT_VERSION,
+        "version": "test",
+        "words_file_sha256": hash_file(str(words_file)),
+        "words": {"ruler": {"hints": ["hint 1", "hint 2"], "explanations": [], "answers": RULER_ANSWERS}},
+    }
+    data.update(overrides)
+    path = tmp_path / "content_pack.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("question, key", [
+    ("Is it big?", "is big"),
+    ("is the secret word BIG", "is big"),
+    ("Um, can you write with it?", "can you write with"),
+    ("Is it made of plastic", "is made of plastic"),
+])
+def test_normalize_question(question, key):
+    assert normalize_question(question) == key
+
+
+def test_get_answer_and_polarity(tmp_path, words_file):
+    pack = ContentPack.load(write_pack(tmp_path, words_file), words_file=str(words_file))
+
+    answer = pack.get_answer("Ruler", "Is the object made of plastic?")
+    assert answer["answer"] == "Yes, often!"
+    assert pack.get_answer_polarity(answer["answer"]) == "yes"
+    assert pack.get_answer_polarity("Something else.") is None
+    assert pack.get_answer("ruler", "Is it alive?") is None
+    assert pack.get_answer("pencil", "Is it big?") is None
+
+
+def test_hints_are_handed_out_in_rotation(tmp_path, words_file):
+    pack = ContentPack.load(write_pack(tmp_path, words_file), words_file=str(words_file))
+
+    assert [pack.get_hint("ruler") for _ in range(3)] == ["hint 1", "hint 2", "hint 1"]
+    assert pack.get_explanation("ruler") is None
+
+
+def test_pack_for_other_words_file_is_ignored(tmp_path, words_file):
+    path = write_pack(tmp_path, words_file)
+    words_file.write_text(json.dumps({"ruler": {}, "globe": {}}), encoding="utf-8")
+
+    assert ContentPack.load(path, words_file=str(words_file)) is None
+
+
+def test_missing_or_incompatible_pack_is_ignored(tmp_path, words_file):
+    assert ContentPack.load(str(tmp_path / "missing.json"), words_file=str(words_file)) is None
+
+    path = write_pack(tmp_path, words_file, format_version=CONTENT_PACK_FORMAT_VERSION + 1)
+    assert ContentPack.load(path, words_file=str(words_file)) is None
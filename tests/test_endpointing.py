@@ -0,0 +1,28 @@
+from src.speech_processing.endpointing import Endpointer
+
+CHUNK = 0.1
+
+
+def speak_then_pause(endpointer: Endpointer, speech_seconds: float, silence_seconds: float) -> None:
+    for _ in range(round(speech_seconds / CHUNK)):
+        endpointer.update(True, CHUNK)
+    for _ in range(round(silence_seconds / CHUNK)):
+        endpointer.update(False, CHUNK)
+
+
+def test_without_completeness_check_there_are_no_early_cuts():
+    endpointer = Endpointer()
+    speak_then_pause(endpointer, 1.0, 0.5)
+
+    assert not endpointer.wants_partial_transcript()
+
+
+def test_injected_completeness_check_ends_the_recording_early():
+    checked = []
+    endpointer = Endpointer(is_complete=lambda text: checked.append(text) or text.endswith("?"))
+    speak_then_pause(endpointer, 1.0, 0.5)
+
+    assert endpointer.wants_partial_transcript()
+    assert endpointer.check_partial_transcript("is it a ruler?") == "early_cut"
+    assert checked == ["is it a ruler?"]
+    assert not endpointer.wants_partial_transcript()  # Checked once per pause
@@ -0,0 +1,38 @@
+import pytest
+from src.taboo_game.intent_classifier import IntentClassifier
+
+
+@pytest.fixture
+def classifier():
+    return IntentClassifier(known_words=["ruler", "pencil", "trash bin"])
+
+
+@pytest.mark.parametrize("question", ["is it a tool?", "Is it an object?", "Is it an animal?", "is it a big thing?"])
+def test_yes_no_question_about_a_category_is_not_a_guess(classifier, question):
+    label, confidence = classifier.classify_question_or_guess(question, secret_word="ruler")
+
+    assert label != "guess" or confidence < classifier.confidence_threshold
+    assert classifier.predict("question_or_guess", question, secret_word="ruler") != "guess"
+
+
+@pytest.mark.parametrize("guess", ["is it a pencil?", "Is it a ruler?", "is it the trash bin", "is it a red pencil?"])
+def test_naming_a_known_word_is_a_guess(classifier, guess):
+    assert classifier.predict("question_or_guess", guess, secret_word="ruler") == "guess"
+
+
+def test_naming_the_secret_word_is_a_guess():
+    classifier = IntentClassifier(known_words=[])
+
+    assert classifier.predict("question_or_guess", "is het een liniaal?", secret_word="liniaal") == "guess"
+
+
+def test_questions_and_guess_phrases(classifier):
+    assert classifier.predict("question_or_guess", "Is it something you can find in a classroom?") == "question"
+    assert classifier.predict("question_or_guess", "I think it is a ruler", secret_word="ruler") == "guess"
+
+
+def test_complete_utterances(classifier):
+    assert classifier.is_complete_utterance("can you write with it?")
+    assert classifier.is_complete_utterance("yes")
+    assert not classifier.is_complete_utterance("is it something that")
+    assert not classifier.is_complete_utterance("  ")
@@ -0,0 +1,27 @@
+import pytest
+from src.language_feedback import lexicon
+from src.language_feedback.language_assistant import LanguageAssistant
+
+
+@pytest.fixture
+def assistant(tmp_path, monkeypatch):
+    monkeypatch.setattr(lexicon, "LEXICON_CACHE_FOLDER", str(tmp_path / "cache"))
+    words = tmp_path / "words.txt"
+    words.write_text("is\nit\na\nruler\nthe\n", encoding="utf-8")
+    lexicon.clear_lexicons()
+    yield LanguageAssistant(None, english_word_files=[str(words)])
+    lexicon.clear_lexicons()
+
+
+def test_language_usage_batch_matches_single_texts(assistant):
+    texts = ["Is it a ruler?", "Is het een liniaal?", "", "ruler, ruler!"]
+
+    usage = assistant.calculate_language_usage_batch(texts)
+
+    assert usage == [100.0, 25.0, 0, 100.0]
+    assert usage == [assistant.calculate_language_usage(text) for text in texts]
+
+
+def test_missing_word_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        LanguageAssistant(None, english_word_files=[str(tmp_path / "missing.txt")])
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from src.language_feedback import lexicon
+from src.language_feedback.lexicon import Lexicon, clear_lexicons, get_lexicon, hash_word
+
+
+@pytest.fixture
+def word_files(tmp_path):
+    first = tmp_path / "first.txt"
+    second = tmp_path / "second.txt"
+    first.write_text("ruler\npencil\nglue\n", encoding="utf-8")
+    second.write_text("pencil\nglobe\n", encoding="utf-8")
+    return [str(first), str(second)]
+
+
+@pytest.fixture(autouse=True)
+def lexicon_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(lexicon, "LEXICON_CACHE_FOLDER", str(tmp_path / "cache"))
+    clear_lexicons()
+    yield
+    clear_lexicons()
+
+
+def test_words_are_hashed_stably():
+    assert hash_word("ruler") == hash_word("ruler")
+    assert hash_word("ruler") != hash_word("rulers")
+    assert 0 <= hash_word("ruler") < 2 ** 64
+
+
+def test_compiled_lexicon_is_a_sorted_unique_hash_array(tmp_path, word_files):
+    path = str(tmp_path / "lexicon.npy")
+    Lexicon.compile(word_files, path)
+
+    hashes = np.load(path)
+    assert hashes.dtype == np.uint64
+    assert len(hashes) == 4
+    assert np.all(hashes[:-1] < hashes[1:])
+
+
+def test_loaded_lexicon_is_memory_mapped(tmp_path, word_files):
+    path = str(tmp_path / "lexicon.npy")
+    Lexicon.compile(word_files, path)
+
+    loaded = Lexicon.load(path)
+
+    assert isinstance(loaded.hashes, np.memmap)
+    assert "globe" in loaded and "eraser" not in loaded
+
+
+def test_contains_many_looks_up_a_batch():
+    words = Lexicon(np.sort(np.array([hash_word(word) for word in ["ruler", "glue"]], dtype=np.uint64)))
+
+    assert words.contains_many(["glue", "lijm", "ruler", ""]).tolist() == [True, False, True, False]
+    assert words.contains_many([]).tolist() == []
+    assert Lexicon(np.empty(0, dtype=np.uint64)).contains_many(["glue"]).tolist() == [False]
+
+
+def test_get_lexicon_compiles_once_and_shares_the_lexicon(word_files, tmp_path):
+    first = get_lexicon(word_files)
+
+    assert get_lexicon(word_files) is first
+    assert len(list((tmp_path / "cache").glob("english_lexicon_*.npy"))) == 1
+
+    clear_lexicons()
+    assert get_lexicon(word_files) is not first
+    assert len(list((tmp_path / "cache").glob("english_lexicon_*.npy"))) == 1
+
+
+def test_missing_word_file_raises(word_files, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        get_lexicon(word_files + [str(tmp_path / "missing.txt")])
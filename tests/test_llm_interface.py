@@ -0,0 +1,92 @@
+import json
+import pytest
+from src.taboo_game import llm_interface
+from src.taboo_game.intent_classifier import IntentClassifier
+from src.taboo_game.llm_interface import LLMGameHelper
+
+
+class FakeContentPack:
+    def get_answer(self, secret_word, question):
+        if "made of wood" in question:
+            return {"answer": "Sometimes it is!", "polarity": "yes"}
+        return None
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    responses = []
+    prompts = []
+
+    def generate_message_using_llm(prompt, prompt_kind="generation", json_mode=False, emphasis=False):
+        prompts.append(prompt)
+        return responses.pop(0)
+
+    monkeypatch.setattr(llm_interface, "generate_message_using_llm", generate_message_using_llm)
+    responses.prompts = prompts
+    return responses
+
+
+@pytest.fixture
+def helper():
+    return LLMGameHelper(intent_classifier=IntentClassifier(known_words=["ruler"]), use_content_pack=False)
+
+
+def test_missing_fields_get_defaults(helper, responses):
+    responses.append(json.dumps({"intent": "question", "answer": " No, it is not round. "}))
+
+    turn = helper.interpret_turn("Is it round?", "ruler")
+
+    assert turn == {
+        "intent": "question",
+        "hint_requested": False,
+        "correct_guess": False,
+        "answer": "No, it is not round.",
+        "answer_polarity": "yes",
+    }
+
+
+def test_correct_guess_and_hints_follow_the_rules(helper, responses):
+    responses.append(json.dumps({"intent": "question", "correct_guess": True, "answer": "Yes!", "answer_polarity": "no"}))
+    responses.append(json.dumps({"intent": "guess", "hint_requested": True, "correct_guess": True, "answer": "A hint."}))
+
+    question = helper.interpret_turn("Is it long?", "ruler")
+    guess = helper.interpret_turn("Is it a ruler?", "ruler", allow_hints=False)
+
+    assert question["correct_guess"] is False
+    assert question["answer_polarity"] == "no"
+    assert guess["correct_guess"] is True
+    assert guess["hint_requested"] is False
+
+
+def test_content_pack_answers_without_a_request(helper, responses):
+    helper.content_pack = FakeContentPack()
+
+    turn = helper.interpret_turn("Is it made of wood?", "ruler")
+
+    assert turn["answer"] == "Sometimes it is!"
+    assert turn["answer_polarity"] == "yes"
+    assert responses.prompts == []
+
+
+def test_content_pack_is_skipped_when_a_hint_is_requested(helper, responses):
+    helper.content_pack = FakeContentPack()
+    responses.append(json.dumps({"intent": "question", "hint_requested": True, "answer": "It is long and thin."}))
+
+    turn = helper.interpret_turn("Is it made of wood? Can I get a hint?", "ruler")
+
+    assert turn["hint_requested"] is True
+    assert len(responses.prompts) == 1
+
+
+@pytest.mark.parametrize("response", [
+    "not json",
+    "[\"question\"]",
+    json.dumps({"answer": "Yes."}),
+    json.dumps({"intent": "statement", "answer": "Yes."}),
+    json.dumps({"intent": "question"}),
+    json.dumps({"intent": "guess", "hint_requested": True, "answer": ""}),
+])
+def test_unusable_responses_fall_back_to_separate_requests(helper, responses, response):
+    responses.append(response)
+
+    assert helper.interpret_turn("Is it round?", "ruler") is None
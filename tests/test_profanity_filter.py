@@ -0,0 +1,41 @@
+import pytest
+from src.profanity_filter import AhoCorasickMatcher, is_closed_vocabulary, screen_locally
+
+
+def test_matcher_finds_overlapping_terms_in_one_pass():
+    matcher = AhoCorasickMatcher(["he", "she", "hers"])
+
+    assert matcher.find_all("she said hers") == [(0, 3, "she"), (9, 13, "hers")]
+
+
+def test_matcher_only_matches_whole_words():
+    matcher = AhoCorasickMatcher(["ass"])
+
+    assert matcher.find_all("pass the class, you ass!") == [(20, 23, "ass")]
+
+
+@pytest.mark.parametrize("text", ["Pass me the glass.", "The classroom assistant", "Scunthorpe"])
+def test_words_containing_a_term_are_not_flagged(text):
+    assert screen_locally(text) is None
+
+
+def test_multi_word_entries_are_matched_as_phrases():
+    result = screen_locally("Never say Kill Yourself to anyone.")
+
+    assert result["source"] == "local"
+    assert [match["match"] for match in result["profanity"]["matches"]] == ["Kill Yourself"]
+    assert screen_locally("The bloody nose will heal.") is None
+    assert screen_locally("You can kill time by reading it yourself.") is None
+
+
+@pytest.mark.parametrize("text", ["yes", "Correct!", "guess", "1, 6, 12", "[2, 4]"])
+def test_closed_vocabulary_is_cleared_without_matching(text, monkeypatch):
+    monkeypatch.setattr("src.profanity_filter.get_matcher", lambda: pytest.fail("the matcher was used"))
+
+    assert is_closed_vocabulary(text)
+    assert screen_locally(text) == {}
+
+
+def test_free_form_text_is_left_for_the_remote_check():
+    assert not is_closed_vocabulary("yes, it is a ruler")
+    assert screen_locally("yes, it is a ruler") is None
@@ -0,0 +1,81 @@
+import pytest
+from twisted.internet.defer import Deferred
+from src.robot_session import RobotSessionProxy
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+
+    def call(self, procedure, *args, **kwargs):
+        d = Deferred()
+        self.calls.append((procedure, kwargs, d))
+        return d
+
+    def sent(self):
+        return [(procedure, kwargs) for procedure, kwargs, _ in self.calls]
+
+
+@pytest.fixture
+def session():
+    return FakeSession()
+
+
+@pytest.fixture
+def proxy(session):
+    return RobotSessionProxy(session)
+
+
+def test_repeated_language_call_is_skipped(proxy, session):
+    proxy.call("rie.dialogue.config.language", lang="en")
+    session.calls[0][2].callback(None)
+    dropped = proxy.call("rie.dialogue.config.language", lang="en")
+
+    assert session.sent() == [("rie.dialogue.config.language", {"lang": "en"})]
+    assert dropped.called
+    assert proxy.dropped_calls == {"rie.dialogue.config.language": 1}
+
+
+def test_dropped_call_waits_for_the_call_that_set_the_state(proxy, session):
+    proxy.call("rie.dialogue.config.language", lang="nl")
+    dropped = proxy.call("rie.dialogue.config.language", lang="nl")
+
+    assert not dropped.called
+    session.calls[0][2].callback(None)
+    assert dropped.called
+    assert len(session.calls) == 1
+
+
+def test_changed_language_is_sent(proxy, session):
+    proxy.call("rie.dialogue.config.language", lang="en")
+    proxy.call("rie.dialogue.config.language", lang="nl")
+    proxy.call("rie.dialogue.config.native_voice", use_native_voice=True)
+
+    assert session.sent() == [
+        ("rie.dialogue.config.language", {"lang": "en"}),
+        ("rie.dialogue.config.language", {"lang": "nl"}),
+        ("rie.dialogue.config.native_voice", {"use_native_voice": True}),
+    ]
+
+
+def test_failed_call_does_not_cache_the_state(proxy, session):
+    failed = proxy.call("rie.dialogue.config.language", lang="en")
+    failed.addErrback(lambda failure: None)
+    session.calls[0][2].errback(RuntimeError("router unavailable"))
+
+    proxy.call("rie.dialogue.config.language", lang="en")
+
+    assert len(session.calls) == 2
+    assert "language" in proxy.state
+
+
+def test_posture_is_forgotten_after_a_movement(proxy, session):
+    proxy.call("rom.optional.behavior.play", name="BlocklyStand")
+    proxy.call("rom.optional.behavior.play", name="BlocklyStand")
+    proxy.call("rie.dialogue.say", text="Hello!")
+    proxy.call("rom.actuator.motor.write", frames=[])
+    proxy.call("rom.optional.behavior.play", name="BlocklyStand")
+
+    assert [procedure for procedure, _ in session.sent()] == [
+        "rom.optional.behavior.play", "rie.dialogue.say", "rom.actuator.motor.write", "rom.optional.behavior.play"
+    ]
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+import pytest
+from src import utils
+
+
+class FakeCompletions:
+    def __init__(self, response: str):
+        self.response = response
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        message = SimpleNamespace(content=self.response)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    completions = FakeCompletions("It is *long* and thin.")
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr(utils, "get_openai_client", lambda: client)
+    monkeypatch.setattr(utils, "get_profanity_matches", lambda text: [])
+    return completions
+
+
+def sent_prompt(completions: FakeCompletions) -> str:
+    return completions.requests[-1]["messages"][-1]["content"]
+
+
+def test_generate_message_without_emphasis(completions):
+    response = utils.generate_message_using_llm("Give a hint for 'ruler'.")
+
+    assert response == "it is *long* and thin."
+    assert sent_prompt(completions) == "Give a hint for 'ruler'."
+
+
+def test_generate_message_with_emphasis(completions):
+    utils.generate_message_using_llm("Give a hint for 'ruler'.", emphasis=True)
+
+    assert sent_prompt(completions) == "Give a hint for 'ruler'." + utils.EMPHASIS_INSTRUCTION
+
+
+def test_llm_cache_key_normalizes_the_prompt():
+    key = utils.make_llm_cache_key("Is it  a RULER?", "system", "model")
+
+    assert key == utils.make_llm_cache_key("is it a ruler?\n", "system", "model")
+    assert key != utils.make_llm_cache_key("is it a ruler?", "other system", "model")
+    assert key != utils.make_llm_cache_key("is it a ruler?", "system", "other model")
+
+
+def test_only_classifier_responses_are_cached(completions):
+    utils.generate_message_using_llm("Is this a question?", prompt_kind="classifier")
+    utils.generate_message_using_llm("Is this a question?", prompt_kind="classifier")
+    assert len(completions.requests) == 1
+
+    utils.generate_message_using_llm("Give a hint.")
+    utils.generate_message_using_llm("Give a hint.")
+    assert len(completions.requests) == 3
+
+
+def test_profanity_verdicts_are_cached_per_language_and_text(monkeypatch):
+    requests = []
+
+    def request_profanity_check(text, lang, timeout=10):
+        requests.append((lang, text))
+        return {"status": "success", "profanity": {"matches": []}}
+
+    monkeypatch.setattr(utils, "request_profanity_check", request_profanity_check)
+
+    utils.check_profanity("The ruler is long.", lang="en")
+    utils.check_profanity("The ruler is long.", lang="en")
+    utils.check_profanity("The ruler is long.", lang="nl")
+    utils.check_profanity("The pencil is long.", lang="en")
+
+    assert requests == [("en", "The ruler is long."), ("nl", "The ruler is long."), ("en", "The pencil is long.")]
+
+
+def test_failed_profanity_checks_are_not_cached(monkeypatch):
+    requests = []
+    monkeypatch.setattr(utils, "request_profanity_check", lambda text, lang, timeout=10: requests.append(text) or {})
+
+    utils.check_profanity("The ruler is long.", lang="en")
+    utils.check_profanity("The ruler is long.", lang="en")
+
+    assert len(requests) == 2
+
+
+def test_closed_vocabulary_skips_the_remote_check(monkeypatch):
+    monkeypatch.setattr(utils, "request_profanity_check", lambda *args, **kwargs: pytest.fail("remote check made"))
+
+    assert utils.check_profanity("question", lang="en") == {}
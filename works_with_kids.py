@@ -3,12 +3,15 @@ import wave
 import time
 from typing import Any, Dict, Generator, Optional, Tuple
 import pyaudio
-import whisper  # From https://github.com/openai/whisper
 import numpy as np
-from pydub import AudioSegment
-from pydub.silence import detect_nonsilent
 from twisted.internet.threads import deferToThread
 from twisted.internet.defer import inlineCallbacks, DeferredList
+from src.speech_processing.audio_encoding import to_mono
+from src.speech_processing.audio_trim import trim_silence
+from src.speech_processing.stt_backends import LocalWhisperBackend
+from src.speech_processing.noise_calibration import (
+    DEFAULT_NOISE_FLOOR, NoiseFloorEstimator, chunk_rms, load_noise_floor, save_noise_floor
+)
 # from src.speech_processing.mic_util import MicUtil
 from typing import Dict, List
 import pyaudio
@@ -92,26 +95,23 @@ class SpeechToText:
     model. It records audio from the microphone, processes the audio, and
     returns transcriptions.
     """
-    _shared_model = None
 
     def __init__(
-            self, silence_threshold: int = 4000,
+            self, silence_threshold: int | None = None,
             model_size: str = "large", sample_rate: int = 44100,
             channels: int = 1, chunk_size: int = 1024,
             device_index: int | None = None
     ):
-        self.silence_threshold = silence_threshold  # Depends on how noisy the room is
+        # A fixed peak amplitude threshold; None derives the thresholds from the measured noise floor
+        self.silence_threshold = silence_threshold
         self.sample_rate = sample_rate
         self.channels = channels
         self.chunk_size = chunk_size
         self.device_index = device_index
 
-        if SpeechToText._shared_model is None:
-            print("Whisper model loading...")
-            SpeechToText._shared_model = whisper.load_model(model_size)
-            print("Whisper model loaded successfully!")
-
-        self.model = SpeechToText._shared_model
+        # The model loads in the background; the first transcription waits for it if needed
+        self.backend = LocalWhisperBackend(model_size)
+        self.backend.preload()
         self.mic_util = MicUtil()
 
     def choose_mic(self) -> Dict[str, int | str]:
@@ -163,6 +163,10 @@ class SpeechToText:
         mic_info = self.choose_mic()
         audio_interface, stream = self.setup_audio_stream(mic_info)
 
+        saved_floor = load_noise_floor(mic_info['name'])
+        estimator = NoiseFloorEstimator(saved_floor if saved_floor is not None else DEFAULT_NOISE_FLOOR)
+        is_speech = False
+
         frames = []
         start_time = time.time()
         last_sound_time = start_time
@@ -173,9 +177,16 @@ class SpeechToText:
             frames.append(data)
 
             audio_data = np.frombuffer(data, dtype=np.int16)
-            amplitude = np.max(np.abs(audio_data))
+            if self.silence_threshold is not None:
+                # int32 avoids the overflow of abs(-32768) in int16
+                is_speech = np.max(np.abs(audio_data.astype(np.int32))) > self.silence_threshold
+            else:
+                rms = chunk_rms(audio_data)
+                is_speech = estimator.is_speech(rms, is_speech)
+                if not is_speech:
+                    estimator.update(rms)
 
-            if amplitude > self.silence_threshold:
+            if is_speech:
                 print("Speech detected.")
                 last_sound_time = time.time()
             elif time.time() - last_sound_time > 5:  # Kids might speak slower, especially when trying to speak English
@@ -185,6 +196,7 @@ class SpeechToText:
         stream.stop_stream()
         stream.close()
         audio_interface.terminate()
+        save_noise_floor(mic_info['name'], estimator.noise_floor())
 
         audio_path = self.save_audio(frames, output_filename)
         return audio_path
@@ -235,19 +247,37 @@ class SpeechToText:
             Optional[str]: The path to the trimmed audio file if successful,
             otherwise None if no speech is detected.
         """
-        audio = AudioSegment.from_wav(audio_path)
-        non_silent_chunks = detect_nonsilent(audio, min_silence_len=min_silence_len, silence_thresh=silence_thresh)
+        with wave.open(audio_path, 'rb') as wf:
+            params = wf.getparams()
+            samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
 
-        if not non_silent_chunks:
+        trimmed_samples = trim_silence(samples, params.framerate, params.nchannels, silence_thresh, min_silence_len)
+        if trimmed_samples is None:
             return None
 
-        start_trim = non_silent_chunks[0][0]
-        end_trim = non_silent_chunks[-1][1]
-
-        trimmed_audio = audio[start_trim:end_trim]
-        trimmed_audio.export(audio_path, format="wav")
+        with wave.open(audio_path, 'wb') as wf:
+            wf.setparams(params)
+            wf.writeframes(trimmed_samples.tobytes())
         return audio_path
 
+    def transcribe_file(self, audio_path: str) -> Dict[str, Any]:
+        """
+        Transcribes a WAV file with the local Whisper backend.
+
+        Args:
+            audio_path (str): The path to the WAV file.
+
+        Returns:
+            Dict[str, Any]: The transcription result, with the text under
+            'text'.
+        """
+        with wave.open(audio_path, 'rb') as wf:
+            channels = wf.getnchannels()
+            sample_rate = wf.getframerate()
+            samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+
+        return {"text": self.backend.transcribe(to_mono(samples, channels), sample_rate)}
+
     def process_audio(self, audio_path: str) -> Dict[str, Any]:
         """
         Processes the recorded audio and transcribes it using the Whisper model.
@@ -267,7 +297,7 @@ class SpeechToText:
 
         try:
             print("Transcribing...")
-            result = self.model.transcribe(trimmed_audio_path)
+            result = self.transcribe_file(trimmed_audio_path)
         except Exception as e:
             print("Error during transcription:", e)
 
@@ -282,7 +312,7 @@ if __name__ == "__main__":
             trimmed_audio_path = stt.trim_silence(audio_path)
             if trimmed_audio_path:
                 print("Transcribing...")
-                result = stt.model.transcribe(trimmed_audio_path)
+                result = stt.transcribe_file(trimmed_audio_path)
                 print("Transcription:")
                 print(result.get('text', '[No transcription found]'))
             else: